@@ -1,9 +1,9 @@
 from abc import ABC, abstractmethod
 from enum import Enum, auto
-from data_structures.observer import Observable, Observer
+from data_structures.observer import NotifyType, Observable, Observer
 from command_creation.command_type import CommandType
 from common.image_manager import ImageID
-from entity_base.image.image_state import ImageState
+from entity_base.image.image_state import ImageState, SerializedImageState
 from serialization.serializable import Serializable, SerializedState
 from utility.pretty_printer import PrettyPrinter
 
@@ -58,11 +58,13 @@ legalAttributesForType: dict[CommandType, list[PathAttributeID]] = {
 }
 
 class AdapterState(SerializedState, PrettyPrinter):
-    def __init__(self, type: CommandType, iconImageStates: list[ImageState] | ImageState):
+
+    # the image states may already be serialized, ie. when loaded from a .pgpath file
+    def __init__(self, type: CommandType, iconImageStates: list[ImageState | SerializedImageState] | ImageState):
         self.type = type
         if not isinstance(iconImageStates, list):
             iconImageStates = [iconImageStates]
-        self.iconImageStates = [image.serialize() for image in iconImageStates]
+        self.iconImageStates = [image if isinstance(image, SerializedImageState) else image.serialize() for image in iconImageStates]
 
     def _deserialize(self) -> 'PathAdapter':
         raise NotImplementedError
@@ -109,7 +111,9 @@ class PathAdapter(ABC, Observable, Observer, Serializable):
         return self._dict
     
     def modify(self):
-        self._queueModify = True
+        if not self._queueModify:
+            self._queueModify = True
+            self.notify(NotifyType.ADAPTER_MODIFIED)
 
     def wasModified(self) -> bool:
         return self._queueModify
@@ -124,10 +128,17 @@ class PathAdapter(ABC, Observable, Observer, Serializable):
         if attribute not in self._dictValue:
             return
 
-        self._dictValue[attribute] = round(value, 3)
+        value = round(value, 3)
+        changed = self._dictValue[attribute] != value
+
+        self._dictValue[attribute] = value
         self._dictStr[attribute] = string
         self.modify()
 
+        # only tell observers like the command's generated code when the value itself changed
+        if changed:
+            self.notify(NotifyType.VALUE_CHANGED)
+
     def getValue(self, attribute: Enum) -> float:
         if attribute in self._dictValue:
             return self._dictValue[attribute]
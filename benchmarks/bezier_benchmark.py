@@ -0,0 +1,80 @@
+import numpy as np
+import random, time
+from scipy.integrate import quad
+from scipy.optimize import brentq
+
+from utility.bezier_functions_2 import cubic_bezier_point, cubic_bezier_derivative, normalized_points_cubic_bezier
+
+"""
+Checks normalized_points_cubic_bezier against the previous implementation, which found
+each point by numerically integrating arc length (quad) inside a root finder (brentq),
+and compares their speed.
+Run from the repository root with: python -m benchmarks.bezier_benchmark
+"""
+
+NUM_CURVES = 20
+SEGMENT_LENGTH = 0.5 # same as BezierSegmentState.SLOW_RESOLUTION_INCHES
+
+# maximum allowed distance in inches between matching points of the two implementations
+TOLERANCE = 1e-3
+
+def referenceArcLength(t, p0, p1, p2, p3):
+    return quad(lambda t: np.linalg.norm(cubic_bezier_derivative(t, p0, p1, p2, p3)), 0, t)[0]
+
+def referenceNormalizedPoints(segment_length, p0, p1, p2, p3):
+
+    end = p3
+    p0, p1, p2, p3 = map(np.array, [p0, p1, p2, p3])
+
+    points = [p0]
+    t = 0
+
+    while True:
+        target = referenceArcLength(t, p0, p1, p2, p3) + segment_length
+        try:
+            t = brentq(lambda t: referenceArcLength(t, p0, p1, p2, p3) - target, 0, 1)
+        except ValueError:
+            t = 1.0
+
+        if t >= 1:
+            points.append(end)
+            return points
+
+        points.append(cubic_bezier_point(t, p0, p1, p2, p3).tolist())
+
+# random curves on the 144 inch field
+def randomCurves() -> list[tuple]:
+    random.seed(0)
+    return [tuple((random.uniform(0, 144), random.uniform(0, 144)) for i in range(4)) for j in range(NUM_CURVES)]
+
+def timeAll(function, curves) -> float:
+    start = time.perf_counter()
+    for curve in curves:
+        function(SEGMENT_LENGTH, *curve)
+    return (time.perf_counter() - start) / len(curves) * 1000
+
+def main():
+    curves = randomCurves()
+
+    worst = 0
+    for curve in curves:
+        expected = referenceNormalizedPoints(SEGMENT_LENGTH, *curve)
+        actual = normalized_points_cubic_bezier(SEGMENT_LENGTH, *curve)
+
+        # a point landing almost exactly at the end can be included by one and not the other
+        assert abs(len(expected) - len(actual)) <= 1, (len(expected), len(actual))
+        n = min(len(expected), len(actual)) - 1
+        error = np.max(np.linalg.norm(np.array(expected[:n]) - np.array(actual[:n]), axis = 1))
+        assert error < TOLERANCE, error
+        worst = max(worst, error)
+
+    print(f"{NUM_CURVES} curves, max point error {worst:.2e} inches")
+
+    before = timeAll(referenceNormalizedPoints, curves)
+    after = timeAll(normalized_points_cubic_bezier, curves)
+    print(f"quad + brentq: {before:.2f} ms per curve")
+    print(f"vectorized: {after:.3f} ms per curve")
+    print(f"speedup: {before / after:.0f}x")
+
+if __name__ == "__main__":
+    main()
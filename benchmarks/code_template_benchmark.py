@@ -0,0 +1,79 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from adapter.path_adapter import PathAttributeID
+from adapter.straight_adapter import StraightAdapter
+from models.command_models.command_model import CommandModel
+from services.code_generation_service import CodeGenerationService, CompiledTemplate
+import time
+
+"""
+Compares rendering a precompiled code template against the previous renderer, which
+rescanned the template and rebuilt the string for every substitution.
+Run from the repository root with: python -m benchmarks.code_template_benchmark
+"""
+
+LINES = 200
+ITERATIONS = 200
+
+# the previous CodeGenerationService.generateCode(), kept as the reference
+def generateCodeReference(service: CodeGenerationService, codeTemplate: str) -> str:
+
+    code = codeTemplate
+    start = 0
+    while True:
+        start = code.find('$', start)
+        if start == -1:
+            break
+        end = code.find('$', start + 1)
+        if end == -1:
+            break
+
+        variableName = code[start + 1:end]
+        variableValue = service.getVariableValue(variableName)
+
+        if variableValue is not None:
+            code = code[:start] + variableValue + code[end + 1:]
+        else:
+            start = end
+
+    return code
+
+def benchmark(name: str, function) -> float:
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        function()
+    elapsed = (time.perf_counter() - start) / ITERATIONS * 1000
+    print(f"{name}: {elapsed:.3f} ms per call")
+    return elapsed
+
+def main():
+
+    adapter = StraightAdapter([])
+    for attribute in PathAttributeID:
+        adapter.set(attribute, attribute.value * 1.5, "")
+
+    command = CommandModel(adapter)
+    command.setDefinitionID("GO_FORWARD")
+
+    # edge cases: unknown variables, stray and unclosed '$'
+    for template in ["", "$", "$$", "a$X1$b", "$Speed $X1$ $ $Mode$ $NOPE$$", "$X1$$X1$ $Y1$$", "$$Speed$"]:
+        command.templateText = template
+        service = CodeGenerationService(command.getCompiledTemplate(), adapter, command.getParameters())
+        assert service.generateCode() == generateCodeReference(service, template), template
+
+    line = "goForward($DISTANCE$, $Speed$, \"$Mode$\", $THETA1$); // from ($X1$, $Y1$) costs $5\n"
+    template = line * LINES
+    command.templateText = template
+    service = CodeGenerationService(command.getCompiledTemplate(), adapter, command.getParameters())
+    assert service.generateCode() == generateCodeReference(service, template)
+    print(f"{LINES} line template, {template.count('$')} '$'")
+
+    before = benchmark("rescanning renderer", lambda: generateCodeReference(service, template))
+    after = benchmark("compiled renderer", lambda: service.generateCode())
+    print(f"speedup: {before / after:.1f}x")
+
+    benchmark("compiling", lambda: CompiledTemplate(template, command.getDefinition()))
+
+if __name__ == "__main__":
+    main()
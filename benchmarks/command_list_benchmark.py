@@ -0,0 +1,191 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from common.window import Window
+from entities.root_container.main_window_container import MainWindowContainer
+from entities.root_container.panel_container.command_block.command_block_entity import CommandBlockEntity
+from entity_ui.scrollbar.scrolling_container import ScrollingContainer
+from entity_ui.selector_menu.selector_menu_manager import SelectorMenuManager
+from command_creation.command_definition_database import CommandDefinitionDatabase
+from common.reference_frame import initReferenceframe
+from entity_handler.entity_traversal import TraversalOrder
+from models.command_models.abstract_model import AbstractModel
+from models.command_models.command_model import CommandModel
+from models.path_models.path_node_model import SerializedPathNodeState
+from models.project_history_interface import ProjectHistoryInterface
+from models.project_history_model import ProjectHistoryModel
+from models.project_model import ProjectModel
+from models.ui_model import UIModel
+from serialization.edit_journal import EditJournal
+from benchmarks.pgpath_format_benchmark import buildState
+from services.autosave_service import AutosaveService
+import random, tempfile, time
+
+"""
+Compares frame times of the command list with 1,000+ command blocks when the
+ScrollingContainer is virtualized, which only keeps the command blocks near the visible
+area in the entity tree, against keeping every command block in the tree.
+A frame is ticking, hit testing and redrawing what changed, after scrolling or while
+expanding a command. Checks that the visible command blocks are laid out the same in both.
+Run from the repository root with: python -m benchmarks.command_list_benchmark
+"""
+
+SCROLL_STEPS = 20
+
+# set up the window and project the same way main() does, but saving to a temporary directory
+def buildProject(directory: str) -> tuple[Window, ScrollingContainer, ProjectModel, ProjectHistoryModel]:
+
+    history = ProjectHistoryModel(
+        autosave = AutosaveService(os.path.join(directory, "save.pgpath")),
+        journal = EditJournal(os.path.join(directory, "history.pgjournal"))
+    )
+    ProjectHistoryInterface.initInstance(history)
+
+    projectModel = ProjectModel.getInstance()
+    uiModel = UIModel.getInstance()
+
+    window = Window(0.8, 0.8, 0, 0)
+    windowContainer = MainWindowContainer(window.getRootContainer(), projectModel, lambda isProcessDone: None)
+    uiModel.initRootContainer(windowContainer)
+
+    fieldContainer = windowContainer.FIELD_CONTAINER
+    initReferenceframe(window.dimensions, fieldContainer.fieldEntity)
+    projectModel.initFieldEntity(fieldContainer.fieldEntity)
+
+    window.interactor.initInteractor(SelectorMenuManager(fieldContainer.fieldEntity), fieldContainer.fieldEntity)
+
+    CommandDefinitionDatabase()
+
+    scrollingContainer = ScrollingContainer(windowContainer.PANEL_CONTAINER, virtualized = True)
+    projectModel.initCommandParentEntity(scrollingContainer.getContainer())
+    projectModel.commandsModel.initParentUI(scrollingContainer.getContainer())
+    window.getRootContainer().recomputeEntity()
+
+    # load a project with 1,000 nodes, which has a command for each node and segment
+    projectModel.pathModel.initFirstNode((20, 20))
+    random.seed(0)
+    state = buildState()
+
+    # as saved by the program: with random positions, only the turns at both ends are disabled
+    nodes = [element for element in state.path.pathList if isinstance(element, SerializedPathNodeState)]
+    for i, node in enumerate(nodes):
+        node.turnEnabled = 0 < i < len(nodes) - 1
+
+    projectModel.loadSerializedState(state)
+
+    # only the command list is measured, so the 1,000 node path is not drawn
+    fieldContainer.setInvisible()
+    window.getRootContainer().recomputeEntity()
+
+    # as Window.run() does once the window is set up
+    window.entities.layout.setDeferred(True)
+
+    return window, scrollingContainer, projectModel, history
+
+# what Window.run() does each frame
+def frame(window: Window, mouse: tuple):
+    entities = window.entities
+    entities.tick()
+    entities.runLayoutPass()
+    entities.getEntityAtPosition(mouse)
+    if entities.isRedrawThisTick():
+        entities.drawEntities(window.interactor, window.screen, mouse, window.dimensions)
+        entities.resetFlagAfterDrawingEverything()
+
+# run frames until nothing is animating or waiting to be laid out
+def settle(window: Window, mouse: tuple):
+    for i in range(120):
+        if not window.entities.hasActiveTicks() and not window.entities.layout.hasPendingRecomputes():
+            return
+        frame(window, mouse)
+
+def getCommands(model: AbstractModel) -> list[CommandModel]:
+    commands = [model] if isinstance(model, CommandModel) else []
+    for child in model.children:
+        commands += getCommands(child)
+    return commands
+
+# rect of every command block in the tree that intersects the scrolling container
+def visibleRects(window: Window, scrollingContainer: ScrollingContainer, projectModel: ProjectModel) -> dict[CommandModel, tuple]:
+    tree = set(window.entities.getTraversal(TraversalOrder.DRAW))
+    rects = {}
+    for model in getCommands(projectModel.commandsModel):
+        ui: CommandBlockEntity = model.ui
+        if ui in tree and ui.isVisible() and ui.BOTTOM_Y >= scrollingContainer.TOP_Y and ui.TOP_Y <= scrollingContainer.BOTTOM_Y:
+            rects[model] = (round(ui.LEFT_X, 6), round(ui.TOP_Y, 6), round(ui.WIDTH, 6), round(ui.HEIGHT, 6))
+    return rects
+
+def timeFrames(name: str, window: Window, scrollingContainer: ScrollingContainer, projectModel: ProjectModel, virtualized: bool) -> list:
+
+    scrollingContainer.virtualized = virtualized
+    scrollingContainer.setYOffset(0)
+    mouse = (scrollingContainer.CENTER_X, scrollingContainer.CENTER_Y)
+    settle(window, mouse)
+    print(f"{name}: {len(window.entities.getTraversal(TraversalOrder.DRAW))} entities in the tree, ", end = "")
+
+    maxOffset = max(0, scrollingContainer.getContentHeight() - scrollingContainer.HEIGHT)
+    offsets = [scrollingContainer._inverse_aheight(maxOffset * i / (SCROLL_STEPS - 1)) for i in range(SCROLL_STEPS)]
+
+    layouts = []
+    scrollTimes = []
+    for offset in offsets:
+        start = time.perf_counter()
+        scrollingContainer.setYOffset(offset)
+        frame(window, mouse)
+        scrollTimes.append(time.perf_counter() - start)
+        layouts.append(visibleRects(window, scrollingContainer, projectModel))
+
+    # collapse and expand a command in the middle of the list, or the other way around,
+    # and animate it. The command ends as it started, so that the next run starts from the same layout
+    scrollingContainer.setYOffset(offsets[SCROLL_STEPS // 2])
+    frame(window, mouse)
+    command = next(iter(layouts[SCROLL_STEPS // 2]))
+    toggles = [command.collapseUI, command.expandUI] if command.uiState.expanded else [command.expandUI, command.collapseUI]
+    editTimes = []
+    for toggle in toggles:
+        toggle()
+
+        # the toggle only marks the command dirty. Its animation starts in this frame's layout pass
+        start = time.perf_counter()
+        frame(window, mouse)
+        editTimes.append(time.perf_counter() - start)
+
+        while not command.ui.animatedExpansion.isDone():
+            start = time.perf_counter()
+            frame(window, mouse)
+            editTimes.append(time.perf_counter() - start)
+
+        # changes that follow the animation, like hiding the widgets of a collapsed command
+        settle(window, mouse)
+        layouts.append(visibleRects(window, scrollingContainer, projectModel))
+    assert len(editTimes) > 2, "expanding and collapsing the command did not animate"
+
+    # the animation stops within its threshold of the end height. Lay the command out at exactly
+    # that height, as it was before the edit, so that the next run starts from the same layout
+    command.ui.recomputeEntity()
+    settle(window, mouse)
+
+    layout = window.entities.layout
+    print(f"{layout.requested} recomputes requested, {layout.getAvoidedCount()} avoided by the layout pass, ", end = "")
+    layout.resetCounters()
+
+    scrollTime = sum(scrollTimes) / len(scrollTimes) * 1000
+    editTime = sum(editTimes) / len(editTimes) * 1000
+    print(f"{scrollTime:.1f} ms per scrolled frame, {editTime:.1f} ms per frame while editing")
+    return layouts
+
+def main():
+
+    with tempfile.TemporaryDirectory() as directory:
+
+        window, scrollingContainer, projectModel, history = buildProject(directory)
+        print(f"{len(getCommands(projectModel.commandsModel))} commands")
+
+        expected = timeFrames("every command block", window, scrollingContainer, projectModel, False)
+        assert timeFrames("virtualized", window, scrollingContainer, projectModel, True) == expected
+
+        history.journal.stop()
+        history.autosave.stop()
+
+if __name__ == "__main__":
+    main()
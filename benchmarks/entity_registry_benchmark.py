@@ -0,0 +1,128 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from data_structures.observer import Observer
+from entity_base.entity import Entity, initEntityClass, setRootContainer
+from entity_base.container_entity import Container
+from entity_base.listeners.click_listener import ClickLambda
+from entity_handler.entity_manager import EntityManager
+from common.dimensions import Dimensions
+import pygame, time
+
+"""
+Creates and deletes 5,000 entities, comparing the dict-backed EntityManager registry
+and removeSubtree() against the previous list-backed registry, which removed entities
+one at a time with list.remove().
+Run from the repository root with: python -m benchmarks.entity_registry_benchmark
+"""
+
+NUM_GROUPS = 50
+NUM_LEAVES = 99 # per group, so 5,000 entities with the groups
+
+# the previous registry, kept as the reference
+class ListEntityManager(EntityManager):
+
+    def __init__(self):
+        super().__init__()
+        self.entities = []
+        self.keyEntities = []
+        self.clickEntities = []
+        self.outsideEntites = []
+
+    def _addEntity(self, entity: Entity):
+
+        self.entities.append(entity)
+        self.invalidateTraversalOrder()
+
+        if not entity.drawOrderRecursive:
+            self.outsideEntites.append(entity)
+
+        if entity.key is not None:
+            self.keyEntities.append(entity)
+        if entity.click is not None:
+            self.clickEntities.append(entity)
+
+    def removeEntity(self, entity: Entity, excludeChildrenIf = lambda child : False):
+
+        if entity.isVisible() and "RECT" in entity.__dict__:
+            self.redrawRects([entity.defineDrawBounds()])
+
+        i = 0
+        while i < len(entity._children):
+            child = entity._children[i]
+
+            if not excludeChildrenIf(child):
+                self.removeEntity(child)
+                continue
+            i += 1
+
+        if entity._parent is not None and entity in entity._parent._children:
+            entity._parent._children.remove(entity)
+
+        if entity in self.entities:
+            self.entities.remove(entity)
+        self.invalidateTraversalOrder()
+        self.spatialIndex.remove(entity)
+
+        if entity in self.outsideEntites:
+            self.outsideEntites.remove(entity)
+        if entity in self.keyEntities:
+            self.keyEntities.remove(entity)
+        if entity in self.clickEntities:
+            self.clickEntities.remove(entity)
+
+        if isinstance(entity, Observer):
+            entity.unsubscribeAll()
+
+class Leaf(Entity):
+
+    def __init__(self, parent, i: int):
+        self.i = i
+        super().__init__(parent, click = ClickLambda(self))
+
+    def defineTopLeft(self) -> tuple:
+        return self._px(0), self._py(self.i / NUM_LEAVES)
+
+    def defineHeight(self) -> float:
+        return self._pheight(1 / NUM_LEAVES)
+
+def run(manager: EntityManager) -> tuple[float, float]:
+
+    dimensions = Dimensions(0.8, 0.8)
+    dimensions.resizeScreen(900, 700)
+    initEntityClass(manager, None, None, None, dimensions)
+    root = manager.initRootContainer()
+    setRootContainer(root)
+    numEntities = len(manager.entities)
+
+    start = time.perf_counter()
+    groups = []
+    for g in range(NUM_GROUPS):
+        group = Container(root)
+        for l in range(NUM_LEAVES):
+            Leaf(group, l)
+        groups.append(group)
+    root.recomputeEntity()
+    created = time.perf_counter() - start
+    assert len(manager.entities) == numEntities + NUM_GROUPS * (NUM_LEAVES + 1)
+
+    # delete the newest group repeatedly, like deleting the last path nodes one by one
+    start = time.perf_counter()
+    for group in reversed(groups):
+        group.deleteEntity()
+    deleted = time.perf_counter() - start
+
+    assert len(manager.entities) == numEntities
+    assert len(manager.clickEntities) == 0
+    assert len(root._children) == 0
+    return created, deleted
+
+def main():
+    pygame.init()
+
+    for name, manager in [("list registry", ListEntityManager()), ("dict registry", EntityManager())]:
+        created, deleted = run(manager)
+        print(f"{name}: create 5,000 entities {created * 1000:.1f} ms, delete {deleted * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from entity_base.entity import Entity, initEntityClass, setRootContainer
+from entity_base.container_entity import Container
+from entity_handler.entity_manager import EntityManager
+from entity_handler.entity_traversal import traverseEntities, TraversalOrder
+from common.dimensions import Dimensions
+import pygame, time
+
+"""
+Compares the cached, flattened traversal order in EntityManager against
+re-sorting every entity's children on each traversal, for a 2,000-entity tree.
+Run from the repository root with: python -m benchmarks.entity_traversal_benchmark
+"""
+
+NUM_GROUPS = 20
+NUM_ROWS = 10
+NUM_LEAVES = 9
+ITERATIONS = 100
+
+class Row(Container):
+
+    def __init__(self, parent, i: int):
+        self.i = i
+        super().__init__(parent)
+
+    def defineTopLeft(self) -> tuple:
+        return self._px(0), self._py(self.i / NUM_ROWS)
+
+    def defineHeight(self) -> float:
+        return self._pheight(1 / NUM_ROWS)
+
+    # same tiebreaker style as VariableContainer
+    def drawOrderTiebreaker(self) -> float:
+        return -self.TOP_Y
+
+class Leaf(Entity):
+
+    def __init__(self, parent, i: int):
+        self.i = i
+        super().__init__(parent)
+
+    def defineTopLeft(self) -> tuple:
+        return self._px(self.i / NUM_LEAVES), self._py(0)
+
+    def defineWidth(self) -> float:
+        return self._pwidth(1 / NUM_LEAVES)
+
+def buildTree() -> EntityManager:
+    pygame.init()
+    dimensions = Dimensions(0.8, 0.8)
+    dimensions.resizeScreen(900, 700)
+
+    manager = EntityManager()
+    initEntityClass(manager, None, None, None, dimensions)
+    root = manager.initRootContainer()
+    setRootContainer(root)
+
+    for g in range(NUM_GROUPS):
+        group = Container(root)
+        for r in range(NUM_ROWS):
+            row = Row(group, r)
+            for l in range(NUM_LEAVES):
+                Leaf(row, l)
+
+    root.recomputeEntity()
+    return manager
+
+def benchmark(name: str, function) -> float:
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        function()
+    elapsed = (time.perf_counter() - start) / ITERATIONS * 1000
+    print(f"{name}: {elapsed:.3f} ms per traversal")
+    return elapsed
+
+def main():
+    manager = buildTree()
+    print(f"{len(manager.entities)} entities")
+
+    for order in TraversalOrder:
+        assert list(traverseEntities(manager, order)) == manager.getTraversal(order)
+
+    def uncached(order):
+        for entity in traverseEntities(manager, order):
+            entity.isVisible()
+
+    def cached(order):
+        for entity in manager.getTraversal(order):
+            entity.isVisible()
+
+    for order in TraversalOrder:
+        before = benchmark(f"{order.name} sorted() traversal", lambda: uncached(order))
+        after = benchmark(f"{order.name} cached traversal", lambda: cached(order))
+        print(f"{order.name} speedup: {before / after:.1f}x")
+
+    benchmark("getEntityAtPosition", lambda: manager.getEntityAtPosition((450, 350)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+from data_structures.fenwick_tree import FenwickTree
+import bisect, itertools, random, time
+
+"""
+Lays out a list of container sizes like a VariableGroupContainer with a long command list,
+where one command animates its height each tick. Compares summing every size again each
+tick against updating the size in a FenwickTree and querying the position of the command
+after it and the command at some y position.
+Also checks prefixSum() and search() against summing the sizes directly.
+Run from the repository root with: python -m benchmarks.fenwick_tree_benchmark
+"""
+
+NUM_CONTAINERS = 2000
+NUM_TICKS = 2000
+
+def layoutBySumming(sizes: list[float], index: int, y: float) -> tuple[float, int]:
+    position = 0
+    found = len(sizes)
+    for i, size in enumerate(sizes):
+        if found == len(sizes) and position + size > y:
+            found = i
+        if i == index + 1:
+            nextPosition = position
+        position += size
+    return nextPosition, found
+
+def main():
+
+    random.seed(0)
+    sizes = [random.choice([0, 30, 30, 30, 120]) for i in range(NUM_CONTAINERS)]
+    tree = FenwickTree(sizes)
+
+    index = NUM_CONTAINERS // 2
+    y = sum(sizes) * 0.75
+    heights = [30 + 90 * i / NUM_TICKS for i in range(NUM_TICKS)]
+
+    start = time.perf_counter()
+    for height in heights:
+        sizes[index] = height
+        before = layoutBySumming(sizes, index, y)
+    summing = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for height in heights:
+        tree.set(index, height)
+        after = tree.prefixSum(index + 1), tree.search(y)
+    fenwick = time.perf_counter() - start
+
+    assert before == after
+    print(f"{NUM_TICKS} ticks with {NUM_CONTAINERS} containers: {summing * 1000:.1f} ms summing every size, {fenwick * 1000:.1f} ms with the FenwickTree")
+
+    # random updates and queries, with whole sizes so that the sums are exact
+    sizes[index] = 30
+    tree.build(sizes)
+    for i in range(2000):
+        index = random.randrange(NUM_CONTAINERS)
+        sizes[index] = random.choice([0, 30, 120])
+        tree.set(index, sizes[index])
+
+        prefixSums = list(itertools.accumulate(sizes))
+        count = random.randrange(NUM_CONTAINERS + 1)
+        assert tree.prefixSum(count) == (prefixSums[count - 1] if count > 0 else 0)
+
+        offset = random.uniform(-10, prefixSums[-1] + 10)
+        assert tree.search(offset) == bisect.bisect_right(prefixSums, offset)
+
+    assert tree.total() == sum(sizes) and len(tree) == NUM_CONTAINERS
+    print("prefixSum() and search() match summing the sizes")
+
+if __name__ == "__main__":
+    main()
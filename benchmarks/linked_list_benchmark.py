@@ -0,0 +1,61 @@
+from data_structures.linked_list import LinkedList, LinkedListNode
+import random, time
+
+"""
+Inserts nodes at random positions into a LinkedList, like inserting path nodes into the
+middle of a long path, comparing against the previous O(n) contains() check on insertAfter().
+Also checks isBefore() and getIndex() against the iteration order, including nested iteration.
+Run from the repository root with: python -m benchmarks.linked_list_benchmark
+"""
+
+NUM_NODES = 5000
+
+def containsByWalking(linkedList: LinkedList, node: LinkedListNode) -> bool:
+    current = linkedList.head
+    while current is not None:
+        if current is node:
+            return True
+        current = current.getNext()
+    return False
+
+def build(checkByWalking: bool) -> tuple[LinkedList, float]:
+    random.seed(0)
+    linkedList = LinkedList()
+    nodes = []
+
+    start = time.perf_counter()
+    for i in range(NUM_NODES):
+        node = LinkedListNode()
+        after = random.choice(nodes) if len(nodes) > 0 else None
+        if checkByWalking and after is not None:
+            assert containsByWalking(linkedList, after)
+        linkedList.insertAfter(after, node)
+        nodes.append(node)
+    return linkedList, time.perf_counter() - start
+
+def main():
+
+    _, before = build(True)
+    linkedList, after = build(False)
+    print(f"insert {NUM_NODES} nodes: {before * 1000:.1f} ms with the walking contains(), {after * 1000:.1f} ms now")
+
+    order = list(linkedList)
+    assert len(order) == len(linkedList) == NUM_NODES
+    for i, node in enumerate(order):
+        assert linkedList.getIndex(node) == i
+        if i > 0:
+            assert linkedList.isBefore(order[i - 1], node) and not linkedList.isBefore(node, order[i - 1])
+
+    # nested iteration over the same list
+    pairs = sum(1 for a in linkedList for b in linkedList if b is a)
+    assert pairs == NUM_NODES
+
+    # removing during iteration
+    removed = set(order[::2])
+    for node in linkedList:
+        if node in removed:
+            linkedList.remove(node)
+    assert list(linkedList) == order[1::2] and len(linkedList) == NUM_NODES // 2
+
+if __name__ == "__main__":
+    main()
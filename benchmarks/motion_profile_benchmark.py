@@ -0,0 +1,49 @@
+from utility.motion_profile import MotionProfile, MotionProfileStore
+import time
+
+"""
+Collapses 500 commands at once, each with an expansion profile and an R, G and B color
+profile like CommandBlockEntity, and ticks them until they are done. Compares ticking each
+profile on its own against stepping them all with MotionProfileStore.step() first, like
+EntityManager.tick() does. Profiles are only ticked while not isDone(), like the onTick() of
+their owners, which recompute with the ticked value. Checks that both tick the same values
+every frame, including the last tick before each profile is done.
+Run from the repository root with: python -m benchmarks.motion_profile_benchmark
+"""
+
+NUM_COMMANDS = 500
+
+def makeProfiles(store: MotionProfileStore) -> list[MotionProfile]:
+    profiles = []
+    for i in range(NUM_COMMANDS):
+        profiles.append(MotionProfile(1, speed = 0.4, store = store))
+        profiles.extend(MotionProfile(255, speed = 0.2, threshold = 1, store = store) for color in range(3))
+    return profiles
+
+def collapse(profiles: list[MotionProfile]):
+    for i, profile in enumerate(profiles):
+        profile.setEndValue(0 if i % 4 == 0 else 120)
+
+def run(store: MotionProfileStore, profiles: list[MotionProfile], vectorized: bool) -> tuple[float, list[list[float]]]:
+    collapse(profiles)
+    values = []
+    start = time.perf_counter()
+    while not all(profile.isDone() for profile in profiles):
+        if vectorized:
+            store.step()
+        values.append([profile.tick() if not profile.isDone() else None for profile in profiles])
+    return time.perf_counter() - start, values
+
+def main():
+
+    scalarStore = MotionProfileStore()
+    scalarTime, scalarValues = run(scalarStore, makeProfiles(scalarStore), False)
+
+    vectorStore = MotionProfileStore()
+    vectorTime, vectorValues = run(vectorStore, makeProfiles(vectorStore), True)
+
+    assert scalarValues == vectorValues
+    print(f"{len(scalarValues)} ticks of {NUM_COMMANDS * 4} profiles: {scalarTime * 1000:.1f} ms ticking each, {vectorTime * 1000:.1f} ms stepping the store")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+from data_structures.observer import NotifyType, Observable, Observer
+import gc, time
+
+"""
+Compares the NotifyType-indexed, weakly referencing Observable against the previous
+list-based one, which scanned every subscription on notify() and unsubscribe().
+Also checks that observers deleted without unsubscribing are garbage collected.
+Run from the repository root with: python -m benchmarks.observer_benchmark
+"""
+
+NUM_OBSERVERS = 5000
+ITERATIONS = 20
+
+# the previous Observable, kept as the reference
+class ListObservable:
+
+    def subscribe(self, yourself: Observer, id = NotifyType.DEFAULT, onNotify = lambda : None):
+        if "observers" not in self.__dict__:
+            self.observers = []
+        self.observers.append((yourself, id, onNotify))
+
+    def unsubscribe(self, observer: Observer):
+        i = 0
+        while i < len(self.observers):
+            if self.observers[i][0] is observer:
+                del self.observers[i]
+            else:
+                i += 1
+
+    def notify(self, id = NotifyType.DEFAULT):
+        for observer, observerID, onNotify in self.observers:
+            if id == observerID:
+                onNotify()
+
+class Counter(Observer):
+
+    count = 0
+
+    def onNotify(self):
+        Counter.count += 1
+
+def benchmark(name: str, function) -> float:
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        function()
+    elapsed = (time.perf_counter() - start) / ITERATIONS * 1000
+    print(f"{name}: {elapsed:.3f} ms")
+    return elapsed
+
+def subscribeAll(observable, observers: list[Counter]):
+    # most subscriptions are for a different NotifyType than the one notified
+    for i, observer in enumerate(observers):
+        id = NotifyType.DEFAULT if i % 10 == 0 else NotifyType.VALUE_CHANGED
+        observable.subscribe(observer, id = id, onNotify = observer.onNotify)
+
+def main():
+
+    observers = [Counter() for i in range(NUM_OBSERVERS)]
+    old, new = ListObservable(), Observable()
+    subscribeAll(old, observers)
+    subscribeAll(new, observers)
+    print(f"{new.getNumSubscriptions()} subscriptions")
+
+    Counter.count = 0
+    old.notify()
+    expected = Counter.count
+    Counter.count = 0
+    new.notify()
+    assert Counter.count == expected
+
+    for name, observable in [("list", old), ("indexed", new)]:
+        benchmark(f"{name} notify()", lambda: observable.notify())
+
+    def unsubscribeHalf(observable):
+        for observer in observers[::2]:
+            observable.unsubscribe(observer)
+        subscribeAll(observable, observers[::2])
+
+    for name, observable in [("list", old), ("indexed", new)]:
+        benchmark(f"{name} unsubscribe and resubscribe half", lambda: unsubscribeHalf(observable))
+
+    # observers that are dropped without unsubscribing must not be kept alive
+    numOld = len(old.observers)
+    del old
+    observers.clear()
+    gc.collect()
+    print(f"after deleting the observers: {numOld} list subscriptions would remain, {new.getNumSubscriptions()} indexed subscriptions remain")
+    assert new.getNumSubscriptions() == 0
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from adapter.arc_adapter import ArcAdapter
+from adapter.bezier_adapter import BezierAdapter
+from adapter.straight_adapter import StraightAdapter
+from adapter.turn_adapter import TurnAdapter
+from command_creation.command_definition_database import CommandDefinitionDatabase
+from command_creation.command_type import CommandType
+from common.image_manager import ImageID
+from data_structures.variable import Variable
+from entities.root_container.panel_container.command_block.wait_id import WaitID
+from entity_base.image.image_state import ImageState
+from models.command_models.command_model import CommandUIState, SerializedCommandState
+from models.command_models.full_model import SerializedFullState
+from models.command_models.section_model import SerializedSectionState
+from models.path_models.constraint_model import SerializedConstraintsState
+from models.path_models.path_command_linker import SerializedLinkerState
+from models.path_models.path_model import SerializedPathState
+from models.path_models.path_node_model import SerializedPathNodeState, TurnDirection
+from models.path_models.path_segment_model import SerializedPathSegmentState
+from models.path_models.path_segment_state.arc_segment_state import ArcIconID, SerializedArcState
+from models.path_models.path_segment_state.bezier_segment_state import BezierIconID, SerializedBezierState
+from models.path_models.path_segment_state.segment_type import SegmentType
+from models.path_models.path_segment_state.straight_segment_state import SerializedStraightState
+from models.path_models.segment_direction import SegmentDirection
+from models.project_data_model import ProjectDataModel
+from models.project_model import SerializedProjectState
+from serialization.pgpath_format import PGPathReader, dumpsProject, loadProject, migrate
+from services.headless_service import HeadlessProject
+from services.constraint_solver_service import SerializedConstraintState
+from utility.line import Line
+import io, pickle, random, tempfile, time
+
+"""
+Compares the binary .pgpath format against pickle on file size and load time, for a
+project with 1,000 nodes whose segments alternate between straight, arc and bezier.
+Checks that both load to a project that generates the same code, that loadProject()
+refuses pickled files, and that migrate() converts them but refuses classes outside the schema.
+Run from the repository root with: python -m benchmarks.pgpath_format_benchmark
+"""
+
+NUM_NODES = 1000
+ITERATIONS = 10
+
+# command definition used for each segment shape
+DEFINITIONS = {SegmentType.STRAIGHT: "GO_FORWARD", SegmentType.ARC: "GO_ARC", SegmentType.BEZIER: "GO_PURE_PURSUIT"}
+
+def adapterState(adapter):
+    adapter.makeSerialized()
+    return adapter.serialize()
+
+# builds the serialized state the same way ProjectModel.serialize() would for this project
+def buildState() -> SerializedProjectState:
+
+    full = SerializedFullState()
+    section = SerializedSectionState("Autonomous")
+    full.addChild(section)
+
+    def addCommand(adapter, definitionID: str, params: dict) -> SerializedCommandState:
+        command = SerializedCommandState(CommandUIState(), adapter, None, params, definitionID, WaitID.WAIT)
+        section.addChild(command)
+        return command
+
+    pathList, nodeToCommand, segmentToCommand, commandToPath = [], {}, {}, {}
+    for i in range(NUM_NODES):
+
+        if i > 0:
+            states = {
+                SegmentType.STRAIGHT: SerializedStraightState(adapterState(StraightAdapter([
+                    ImageState(SegmentDirection.FORWARD, ImageID.STRAIGHT_FORWARD),
+                    ImageState(SegmentDirection.REVERSE, ImageID.STRAIGHT_REVERSE)]))),
+                SegmentType.ARC: SerializedArcState(adapterState(ArcAdapter([
+                    ImageState(icon, ImageID.CURVE_LEFT_FORWARD) for icon in ArcIconID])), random.uniform(-20, 20)),
+                SegmentType.BEZIER: SerializedBezierState(adapterState(BezierAdapter([ImageState(BezierIconID.BEZIER, ImageID.BEZIER)])),
+                    (random.uniform(-30, 30), random.uniform(-30, 30)), (random.uniform(-30, 30), random.uniform(-30, 30)))
+            }
+            current = [SegmentType.STRAIGHT, SegmentType.ARC, SegmentType.BEZIER][i % 3]
+            segment = SerializedPathSegmentState(SegmentDirection.FORWARD, states, current)
+            command = addCommand(states[current].adapter, DEFINITIONS[current], {"Speed": 0.75})
+            pathList.append(segment)
+            segmentToCommand[segment] = command
+            commandToPath[command] = segment
+
+        adapter = adapterState(TurnAdapter([ImageState(TurnDirection.RIGHT, ImageID.TURN_RIGHT), ImageState(TurnDirection.LEFT, ImageID.TURN_LEFT)]))
+        node = SerializedPathNodeState((random.uniform(0, 144), random.uniform(0, 144)), adapter, i % 2 == 0)
+        command = addCommand(adapter, "GO_TURN", {})
+        pathList.append(node)
+        nodeToCommand[node] = command
+        commandToPath[command] = node
+
+    constraints = SerializedConstraintsState([SerializedConstraintState(Line((10, 10), theta = 0), pathList[0:3:2])])
+    path = SerializedPathState(pathList, SerializedLinkerState(nodeToCommand, segmentToCommand, commandToPath), constraints, [pathList[0]])
+
+    data = ProjectDataModel()
+    data.projectName = Variable("Benchmark")
+    return SerializedProjectState(data, full, path)
+
+def timeLoad(name: str, Fload) -> float:
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        Fload()
+    elapsed = (time.perf_counter() - start) / ITERATIONS * 1000
+    print(f"{name}: {elapsed:.1f} ms")
+    return elapsed
+
+def main():
+
+    random.seed(0)
+    database = CommandDefinitionDatabase.getInstance()
+    database.getDefinitionByID(CommandType.TURN, "GO_TURN").templateText = "goTurn($THETA2$, $THETA1$);"
+    database.getDefinitionByID(CommandType.STRAIGHT, "GO_FORWARD").templateText = "goForward($DISTANCE$, $Speed$, $X2$, $Y2$);"
+
+    state = buildState()
+    pickled = pickle.dumps(state)
+    binary = dumpsProject(state)
+    print(f"{NUM_NODES} nodes: pickle {len(pickled) / 1024:.1f} KB, binary {len(binary) / 1024:.1f} KB")
+
+    expected = HeadlessProject(pickle.loads(pickled)).generateCode()
+    assert HeadlessProject(PGPathReader(io.BytesIO(binary)).readState()).generateCode() == expected
+
+    timeLoad("pickle load", lambda: pickle.loads(pickled))
+    timeLoad("binary load", lambda: PGPathReader(io.BytesIO(binary)).readState())
+    timeLoad("binary load, project name only", lambda: PGPathReader(io.BytesIO(binary)).readProjectData())
+
+    with tempfile.TemporaryDirectory() as directory:
+
+        path = os.path.join(directory, "old.pgpath")
+        with open(path, "wb") as f:
+            f.write(pickled)
+        try:
+            loadProject(path)
+            assert False, "loadProject() loaded a pickled file"
+        except ValueError:
+            pass
+        assert migrate(path) and not migrate(path)
+        assert HeadlessProject.load(path).generateCode() == expected
+
+        # a pickle that would call os.system when loaded
+        path = os.path.join(directory, "unsafe.pgpath")
+        with open(path, "wb") as f:
+            f.write(b"\x80\x04cos\nsystem\n\x8c\x04true\x85R.")
+        try:
+            migrate(path)
+            assert False, "migrate() unpickled a class outside the schema"
+        except pickle.UnpicklingError:
+            pass
+    print("pickled files are refused by loadProject() and migrated without unpickling other classes")
+
+if __name__ == "__main__":
+    main()
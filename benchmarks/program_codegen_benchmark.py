@@ -0,0 +1,106 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from adapter.path_adapter import PathAttributeID
+from adapter.straight_adapter import StraightAdapter
+from adapter.turn_adapter import TurnAdapter
+from command_creation.command_definition_database import CommandDefinitionDatabase
+from command_creation.command_type import CommandType
+from models.command_models.command_model import CommandModel
+from models.command_models.full_model import FullCommandsModel
+from models.command_models.section_model import SectionModel
+from services.program_code_generation_service import ProgramCodeGenerationService
+import random, time
+
+"""
+Measures regenerating the code for a 300-command program after dragging one node,
+which changes the adapter values of the node's turn command and its two segments.
+Compares the incremental generator against rendering every command again.
+Run from the repository root with: python -m benchmarks.program_codegen_benchmark
+"""
+
+NUM_NODES = 150 # one turn and one straight command per node
+ITERATIONS = 100
+
+def buildProgram() -> tuple[FullCommandsModel, list[TurnAdapter], list[StraightAdapter]]:
+
+    database = CommandDefinitionDatabase.getInstance()
+    database.getDefinitionByID(CommandType.TURN, "GO_TURN").templateText = \
+        "goTurn($THETA2$, $Speed$, $Invert direction?$); // from $THETA1$"
+    database.getDefinitionByID(CommandType.STRAIGHT, "GO_FORWARD").templateText = \
+        "goForward($DISTANCE$, $Speed$, \"$Mode$\", \"$Motion Profile$\");\n// ($X1$, $Y1$) to ($X2$, $Y2$) at $THETA1$"
+
+    # attach models directly, the same way deserializing does, so no UI is created
+    full = FullCommandsModel()
+    section = SectionModel()
+    full.children.append(section)
+    section.parent = full
+
+    turns, straights = [], []
+    for i in range(NUM_NODES):
+        turn = TurnAdapter([])
+        straight = StraightAdapter([])
+        for adapter in [turn, straight]:
+            command = CommandModel(adapter)
+            section.children.append(command)
+            command.parent = section
+        turn.setTurnEnabled(True)
+        turns.append(turn)
+        straights.append(straight)
+
+    return full, turns, straights
+
+def drag(turns: list[TurnAdapter], straights: list[StraightAdapter], i: int):
+    x, y, theta = random.random() * 144, random.random() * 144, random.random() * 6
+    turns[i].set(PathAttributeID.THETA1, theta, "")
+    turns[i].set(PathAttributeID.THETA2, theta + 1, "")
+    for straight, attributes in [(straights[i - 1], [PathAttributeID.X2, PathAttributeID.Y2]), (straights[i], [PathAttributeID.X1, PathAttributeID.Y1])]:
+        straight.set(attributes[0], x, "")
+        straight.set(attributes[1], y, "")
+        straight.set(PathAttributeID.DISTANCE, x + y, "")
+        straight.set(PathAttributeID.THETA1, theta, "")
+
+def main():
+
+    random.seed(0)
+    full, turns, straights = buildProgram()
+    commands = full.getFirstChild().children
+
+    service = ProgramCodeGenerationService(full)
+    program = service.generate()
+    print(f"{len(commands)} commands, {program.count(chr(10))} lines")
+
+    def incremental():
+        drag(turns, straights, random.randrange(1, NUM_NODES))
+        return service.generate()
+
+    def full_regenerate():
+        drag(turns, straights, random.randrange(1, NUM_NODES))
+        for command in commands:
+            command.onCodeChange()
+        return ProgramCodeGenerationService(full).generate()
+
+    for name, function in [("render every command", full_regenerate), ("incremental", incremental)]:
+        start = time.perf_counter()
+        for i in range(ITERATIONS):
+            function()
+        elapsed = (time.perf_counter() - start) / ITERATIONS * 1000
+        print(f"{name}: {elapsed:.3f} ms per drag")
+
+    # the incremental program must match rendering everything from scratch
+    program = incremental()
+    print(f"commands rendered after a drag: {service.numRendered}")
+    for command in commands:
+        command.onCodeChange()
+    assert program == ProgramCodeGenerationService(full).generate()
+
+    # each command's line range must hold exactly its code
+    lines = program.splitlines()
+    for command in commands:
+        if command.show:
+            assert "\n".join(lines[i] for i in service.lineRanges[command]) == command.getGeneratedCode()
+            assert all(service.getCommandAtLine(i) is command for i in service.lineRanges[command])
+    assert service.getCommandAtLine(-1) is None and service.getCommandAtLine(len(lines)) is None
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+from utility.text_surface_cache import TextSurfaceCache
+import pygame, random, time
+
+"""
+Draws the header text of a long command list every frame, like the command block headers,
+readouts and dropdown options do, with a few strings changing each frame. Compares
+rendering every string with font.render() against getting it from a TextSurfaceCache,
+and prints the hit rate. Also checks that eviction keeps the cache under its byte limit.
+Run from the repository root with: python -m benchmarks.text_surface_cache_benchmark
+"""
+
+NUM_STRINGS = 300
+NUM_FRAMES = 200
+CHANGED_PER_FRAME = 3
+
+def main():
+
+    pygame.font.init()
+    font = pygame.font.Font(None, 20)
+
+    random.seed(0)
+    strings = [f"Go to point ({random.randint(0, 144)}, {random.randint(0, 144)})" for i in range(NUM_STRINGS)]
+
+    def frames():
+        for frame in range(NUM_FRAMES):
+            for i in range(CHANGED_PER_FRAME):
+                strings[random.randrange(NUM_STRINGS)] = f"Turn to {random.uniform(-180, 180):.1f} degrees"
+            yield strings
+
+    random.seed(1)
+    start = time.perf_counter()
+    for frame in frames():
+        for string in frame:
+            font.render(string, True, (0,0,0))
+    rendering = time.perf_counter() - start
+
+    cache = TextSurfaceCache()
+    random.seed(1)
+    start = time.perf_counter()
+    for frame in frames():
+        for string in frame:
+            cache.render(font, string, (0,0,0))
+    caching = time.perf_counter() - start
+
+    print(f"{NUM_FRAMES} frames of {NUM_STRINGS} strings: {rendering * 1000:.1f} ms rendering, {caching * 1000:.1f} ms with the cache, hit rate {cache.getHitRate():.1%}")
+
+    # a cache that only fits a few surfaces
+    small = TextSurfaceCache(maxBytes = 20 * cache.getByteCount() // len(cache))
+    for string in strings:
+        small.render(font, string, (0,0,0))
+    assert small.getByteCount() <= small.maxBytes and small.evictions > 0
+    print(f"small cache kept {len(small)} surfaces after {small.evictions} evictions")
+
+if __name__ == "__main__":
+    main()
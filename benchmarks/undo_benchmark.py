@@ -0,0 +1,150 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from common.window import Window
+from entities.root_container.main_window_container import MainWindowContainer
+from entity_ui.scrollbar.scrolling_container import ScrollingContainer
+from entity_ui.selector_menu.selector_menu_manager import SelectorMenuManager
+from command_creation.command_definition_database import CommandDefinitionDatabase
+from common.reference_frame import initReferenceframe
+from models.path_models.path_node_model import PathNodeModel
+from models.project_history_interface import ProjectHistoryInterface
+from models.project_history_model import ProjectHistoryModel
+from models.project_model import ProjectModel, SerializedProjectState
+from models.ui_model import UIModel
+from serialization.edit_journal import MAGIC, EditJournal, RecordType, _encodeChunks, _encodeDigests, _encodeRecord, _U32
+from serialization.pgpath_format import dumpsProject
+from services.autosave_service import AutosaveService
+from services.program_code_generation_service import ProgramCodeGenerationService
+import tempfile, time
+
+"""
+Compares undo/redo through ProjectModel.loadSerializedState(), which only updates the
+models and UI that changed between the two saves, against rebuilding every model and
+entity from the save, for a project with 40 nodes where one node was moved.
+Checks that both load to the same project, and that saving after an undo
+replaces the redo history with the new save, and that an unreadable journal is moved aside.
+Run from the repository root with: python -m benchmarks.undo_benchmark
+"""
+
+NUM_NODES = 40
+ITERATIONS = 3
+
+# the way loadSerializedState() used to load every state
+def loadSerializedStateRebuild(projectModel: ProjectModel, state: SerializedProjectState):
+    projectModel._rebuildSerializedState(state)
+    projectModel.fieldEntity.interactor.removeAllEntities()
+    for selected in state.path.selected:
+        projectModel.fieldEntity.interactor.addEntity(selected.deserialize().ui)
+
+# set up the window and project the same way main() does, but saving to a temporary directory
+def buildProject(directory: str) -> tuple[ProjectModel, ProjectHistoryModel]:
+
+    history = ProjectHistoryModel(
+        autosave = AutosaveService(os.path.join(directory, "save.pgpath")),
+        journal = EditJournal(os.path.join(directory, "history.pgjournal"))
+    )
+    ProjectHistoryInterface.initInstance(history)
+
+    projectModel = ProjectModel.getInstance()
+    uiModel = UIModel.getInstance()
+
+    window = Window(0.8, 0.8, 0, 0)
+    windowContainer = MainWindowContainer(window.getRootContainer(), projectModel, lambda isProcessDone: None)
+    uiModel.initRootContainer(windowContainer)
+
+    fieldContainer = windowContainer.FIELD_CONTAINER
+    initReferenceframe(window.dimensions, fieldContainer.fieldEntity)
+    projectModel.initFieldEntity(fieldContainer.fieldEntity)
+
+    window.interactor.initInteractor(SelectorMenuManager(fieldContainer.fieldEntity), fieldContainer.fieldEntity)
+
+    CommandDefinitionDatabase()
+
+    scrollingContainer = ScrollingContainer(windowContainer.PANEL_CONTAINER)
+    projectModel.initCommandParentEntity(scrollingContainer.getContainer())
+    projectModel.commandsModel.initParentUI(scrollingContainer.getContainer())
+    window.getRootContainer().recomputeEntity()
+
+    projectModel.pathModel.initFirstNode((20, 20))
+    for i in range(NUM_NODES - 1):
+        projectModel.pathModel.addNode((20 + (i * 7) % 100, 20 + (i * 13) % 100))
+    history.save()
+
+    return projectModel, history
+
+def describe(projectModel: ProjectModel) -> tuple[str, bytes]:
+    return ProgramCodeGenerationService(projectModel.commandsModel).generate(), dumpsProject(projectModel.serialize())
+
+def timeUndoRedo(name: str, projectModel: ProjectModel, history: ProjectHistoryModel, Fload, expected: list) -> float:
+
+    times = []
+    for i in range(ITERATIONS):
+        for index in [0, 1]:
+            state = history.store.get(history.history[index])
+            start = time.perf_counter()
+            Fload(state)
+            times.append(time.perf_counter() - start)
+            assert describe(projectModel) == expected[index]
+
+    elapsed = sum(times) / len(times) * 1000
+    print(f"{name}: {elapsed:.1f} ms per undo or redo")
+    return elapsed
+
+def main():
+
+    with tempfile.TemporaryDirectory() as directory:
+
+        projectModel, history = buildProject(directory)
+        expected = [describe(projectModel)]
+
+        # the edit to undo and redo
+        nodes = [element for element in projectModel.pathModel.pathList if isinstance(element, PathNodeModel)]
+        nodes[NUM_NODES // 2].setPosition((50, 50))
+        history.save()
+        expected.append(describe(projectModel))
+
+        timeUndoRedo("rebuild everything", projectModel, history,
+                     lambda state: loadSerializedStateRebuild(projectModel, state), expected)
+        timeUndoRedo("update changed models", projectModel, history, projectModel.loadSerializedState, expected)
+
+        # undo, then edit. The redo future is discarded and the new save ends the history
+        history.undo()
+        nodes = [element for element in projectModel.pathModel.pathList if isinstance(element, PathNodeModel)]
+        nodes[NUM_NODES // 2].setPosition((80, 30))
+        history.save()
+        edited = dumpsProject(projectModel.serialize())
+        assert len(history.history) == 2 and history.pointer is None
+        assert dumpsProject(history.store.get(history.history[-1])) == edited
+
+        history.journal.stop()
+        history.autosave.stop()
+
+        # replaying the journal goes through the same undo and save
+        recovered = ProjectHistoryModel(
+            autosave = AutosaveService(os.path.join(directory, "recovered.pgpath")),
+            journal = EditJournal(os.path.join(directory, "history.pgjournal"))
+        )
+        assert recovered.recover()
+        assert len(recovered.history) == 2 and recovered.pointer is None
+        assert dumpsProject(recovered.store.get(recovered.history[-1])) == edited
+        recovered.journal.stop()
+        recovered.autosave.stop()
+        print("saving after an undo keeps the new save, also when recovered from the journal")
+
+        # a journal with a save that cannot be unpickled is moved aside instead of stopping startup
+        path = os.path.join(directory, "broken.pgjournal")
+        with open(path, "wb") as f:
+            f.write(MAGIC + _encodeRecord(RecordType.SAVE, _encodeDigests([]) + _encodeChunks({}) + [_U32.pack(3), b"bad"]))
+        broken = ProjectHistoryModel(
+            autosave = AutosaveService(os.path.join(directory, "broken.pgpath")),
+            journal = EditJournal(path)
+        )
+        assert not broken.recover() and len(broken.history) == 0
+        assert not os.path.exists(path) and os.path.exists(path + ".failed")
+        broken.journal.stop()
+        broken.autosave.stop()
+        print("an unreadable journal is moved aside")
+
+if __name__ == "__main__":
+    main()
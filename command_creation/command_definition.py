@@ -1,6 +1,7 @@
 from entities.root_container.panel_container.element.row.element_definition import ElementDefinition
 from entities.root_container.panel_container.element.readout.readout_definition import ReadoutDefinition
 from command_creation.command_type import CommandType
+from services.code_generation_service import CompiledTemplate
 
 """
 Struct used to represent the structure of a user-created command
@@ -28,6 +29,8 @@ class CommandDefinition:
         self.nonblockingEnabled = nonblockingEnabled
         self.allowedInTask = allowedInTask
 
+        self._compiledTemplate: CompiledTemplate = None
+
     def getElementDefinitionByID(self, id) -> ElementDefinition:
         for element in self.elements:
             if element.id == id:
@@ -38,4 +41,10 @@ class CommandDefinition:
         for element in self.elements:
             if element.variableName == name:
                 return element
-        return None
\ No newline at end of file
+        return None
+    
+    # templateText parsed for code generation. Recompiled if templateText was changed since
+    def getCompiledTemplate(self) -> CompiledTemplate:
+        if self._compiledTemplate is None or not self._compiledTemplate.matches(self.templateText, self):
+            self._compiledTemplate = CompiledTemplate(self.templateText, self)
+        return self._compiledTemplate
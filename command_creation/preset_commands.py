@@ -24,7 +24,8 @@ def preset(func):
 """
 The default set of command definitions at the start of the program.
 To add a preset, simply create a function inside the CommandDefinitionPresets
-class that returns a CommandDefinition, and decorate it with @preset
+class that returns a CommandDefinition, and decorate it with @preset.
+Presets have fixed ids so that saved commands can find their definition after a restart
 """
 class CommandDefinitionPresets:
 
@@ -43,6 +44,7 @@ class CommandDefinitionPresets:
         for commandType in CommandType:
             builder = CommandDefinitionBuilder(commandType, True)
             builder.setName("[manual set]")
+            builder.setID("MANUAL_" + commandType.name)
             command = builder.build()
 
             self.presets.append(command)
@@ -51,6 +53,7 @@ class CommandDefinitionPresets:
     def goForward(self) -> CommandDefinition:
         builder = CommandDefinitionBuilder(CommandType.STRAIGHT)
         builder.setName("goForward()")
+        builder.setID("GO_FORWARD")
         builder.addReadout("Distance", PathAttributeID.DISTANCE)
         builder.addReadout("x1", PathAttributeID.X1)
         builder.addReadout("angle", PathAttributeID.THETA1)
@@ -63,6 +66,7 @@ class CommandDefinitionPresets:
     def goForwardTime(self) -> CommandDefinition:
         builder = CommandDefinitionBuilder(CommandType.STRAIGHT)
         builder.setName("goForwardTime()")
+        builder.setID("GO_FORWARD_TIME")
         builder.addReadout("Distance", PathAttributeID.DISTANCE)
         builder.addWidget(ValueTextboxWidgetDefinition("Speed", 0.75))
         builder.addWidget(ValueTextboxWidgetDefinition("Time (s)", 1.0))
@@ -72,6 +76,7 @@ class CommandDefinitionPresets:
     def goTurn(self) -> CommandDefinition:
         builder = CommandDefinitionBuilder(CommandType.TURN)
         builder.setName("goTurn()")
+        builder.setID("GO_TURN")
         builder.addReadout("Initial angle", PathAttributeID.THETA1)
         builder.addReadout("Final angle", PathAttributeID.THETA2)
         builder.addWidget(ValueTextboxWidgetDefinition("Speed", 0.85))
@@ -82,6 +87,7 @@ class CommandDefinitionPresets:
     def goArc(self) -> CommandDefinition:
         builder = CommandDefinitionBuilder(CommandType.ARC)
         builder.setName("goArc()")
+        builder.setID("GO_ARC")
         builder.addReadout("X1", PathAttributeID.X1)
         builder.addReadout("Arc length", PathAttributeID.ARC_LENGTH)
         builder.addReadout("Initial angle", PathAttributeID.THETA1)
@@ -95,6 +101,7 @@ class CommandDefinitionPresets:
     def goPurePursuit(self) -> CommandDefinition:
         builder = CommandDefinitionBuilder(CommandType.BEZIER)
         builder.setName("goPurePursuit()")
+        builder.setID("GO_PURE_PURSUIT")
         builder.addReadout("Initial angle", PathAttributeID.THETA1)
         builder.addReadout("Final angle", PathAttributeID.THETA2)
         builder.addWidget(ValueTextboxWidgetDefinition("Speed", 0.85))
@@ -105,6 +112,7 @@ class CommandDefinitionPresets:
     def goStanley(self) -> CommandDefinition:
         builder = CommandDefinitionBuilder(CommandType.BEZIER)
         builder.setName("goStanley()")
+        builder.setID("GO_STANLEY")
         builder.addReadout("Initial angle", PathAttributeID.THETA1)
         builder.addReadout("Final angle", PathAttributeID.THETA2)
         builder.addWidget(ValueTextboxWidgetDefinition("Speed", 0.85))
@@ -116,6 +124,7 @@ class CommandDefinitionPresets:
     def goRamsete(self) -> CommandDefinition:
         builder = CommandDefinitionBuilder(CommandType.BEZIER)
         builder.setName("goRamsete()")
+        builder.setID("GO_RAMSETE")
         builder.addReadout("Initial angle", PathAttributeID.THETA1)
         builder.addReadout("Final angle", PathAttributeID.THETA2)
         builder.addWidget(ValueTextboxWidgetDefinition("Speed", 0.85))
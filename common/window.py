@@ -16,9 +16,15 @@ import sys, os
 
 """
 A window object creates a pygame window with a context for entities, EntityManager, etc.
+
+When nothing is animating, nothing needs to be redrawn and no recompute is pending,
+run() sleeps until the next event instead of running at 60fps. It still wakes up every
+IDLE_TIMEOUT milliseconds, so that polling tick listeners are ticked.
 """
 class Window:
 
+    IDLE_TIMEOUT = 250
+
     def __init__(self, defaultWindowWidthPercent: float = 0.8, defaultWindowHeightPercent: float = 0.8, xLeftPercent = 0, yTopPercent = 0):
 
        
@@ -62,11 +68,22 @@ class Window:
 
         self.rootContainer.recomputeEntity()
 
+        # from now on, recomputes requested during a tick are run once in the layout pass
+        self.entities.layout.setDeferred(True)
+
         oldHoveredEntity = None
         oldMouse = None
         thisTickIsDifferent = True # whether this frame is different from previous
+        isIdle = False
         while True:
 
+            # sleep until an event arrives, keeping it to handle in order with the rest
+            events = []
+            if isIdle:
+                event = pygame.event.wait(self.IDLE_TIMEOUT)
+                if event.type != pygame.NOEVENT:
+                    events.append(event)
+
             self.dimensions.RESIZED_THIS_FRAME = False
 
             mouse = pygame.mouse.get_pos()
@@ -77,7 +94,7 @@ class Window:
             if thisTickIsDifferent: # only recompute hovered entity if mouse moved
                 hoveredEntity = self.entities.getEntityAtPosition(mouse)
                 if oldHoveredEntity is not hoveredEntity:
-                    self.entities.redrawScreenThisTick()
+                    self.entities.redrawHoverChange(oldHoveredEntity, hoveredEntity)
                 oldHoveredEntity = hoveredEntity
             else:
                 hoveredEntity = oldHoveredEntity
@@ -93,7 +110,7 @@ class Window:
 
             self.interactor.setHoveredEntity(hoveredEntity, mouse)
             # handle events and call callbacks
-            for event in pygame.event.get():
+            for event in events + pygame.event.get():
                 if event.type == pygame.QUIT:
 
                     # send signal to end process, if flag exists
@@ -106,6 +123,7 @@ class Window:
                     screen = self.dimensions.resizeScreen(*event.size)
                 elif event.type == pygame.MOUSEWHEEL:
                     self.interactor.onMouseWheel(event.y, mouse)
+                    self.entities.redrawScreenThisTick()
                 elif event.type == pygame.MOUSEBUTTONDOWN and (event.button == 1 or event.button == 3):
                     ctrlKey = pygame.key.get_pressed()[pygame.K_LCTRL]
                     shiftKey = pygame.key.get_pressed()[pygame.K_LSHIFT]
@@ -121,20 +139,30 @@ class Window:
                     self.interactor.onMouseMove(self.entities, mouse)
                 elif event.type == pygame.KEYDOWN:
                     self.entities.onKeyDown(event.key)
+                    self.entities.redrawScreenThisTick()
                 elif event.type == pygame.KEYUP:
                     self.entities.onKeyUp(event.key)
+                    self.entities.redrawScreenThisTick()
 
             # Perform calculations
             self.entities.tick()
 
-            # Draw everything
+            # Recompute everything that changed this tick, once
+            self.entities.runLayoutPass()
+
+            # Draw everything that changed
             if self.entities.isRedrawThisTick():
-                self.entities.drawEntities(self.interactor, self.screen, mouse, self.dimensions)
+                updatedRects = self.entities.drawEntities(self.interactor, self.screen, mouse, self.dimensions)
                 # Update display and maintain frame rate
-                pygame.display.flip()
+                if updatedRects is None:
+                    pygame.display.flip()
+                else:
+                    pygame.display.update(updatedRects)
                 self.entities.resetFlagAfterDrawingEverything()
                 thisTickIsDifferent = True
             else:
                 thisTickIsDifferent = False
+
+            isIdle = not thisTickIsDifferent and not self.entities.hasActiveTicks() and not self.entities.layout.hasPendingRecomputes()
             
             self.clock.tick(60) # fps
\ No newline at end of file
@@ -0,0 +1,71 @@
+"""
+A Fenwick (binary indexed) tree over a list of numbers.
+
+Changing one value and getting the sum of the values before some index are both
+O(log n), as is finding the value that some offset from the start falls into. Used to
+lay out a list of sizes, where the prefix sum of the sizes is the position of each item.
+"""
+
+class FenwickTree:
+
+    def __init__(self, values: list[float] = []):
+        self.build(values)
+
+    # replace all values in O(n)
+    def build(self, values: list[float]):
+        self._values = list(values)
+        self._tree = [0] + self._values
+
+        n = len(self._values)
+        for i in range(1, n + 1):
+            parent = i + (i & -i)
+            if parent <= n:
+                self._tree[parent] += self._tree[i]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(self, index: int) -> float:
+        return self._values[index]
+
+    def set(self, index: int, value: float):
+
+        delta = value - self._values[index]
+        if delta == 0:
+            return
+        self._values[index] = value
+
+        i = index + 1
+        n = len(self._values)
+        while i <= n:
+            self._tree[i] += delta
+            i += i & -i
+
+    # sum of the first count values
+    def prefixSum(self, count: int) -> float:
+        total = 0
+        i = count
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def total(self) -> float:
+        return self.prefixSum(len(self._values))
+
+    # index of the value that the offset from the start falls into, so that
+    # prefixSum(index) <= offset < prefixSum(index + 1). Values must not be negative.
+    # Returns 0 if the offset is before the start, and len() if it is past the end
+    def search(self, offset: float) -> int:
+
+        index = 0
+        remaining = offset
+        step = 1 << len(self._values).bit_length()
+        while step > 0:
+            nextIndex = index + step
+            if nextIndex <= len(self._values) and self._tree[nextIndex] <= remaining:
+                index = nextIndex
+                remaining -= self._tree[nextIndex]
+            step >>= 1
+
+        return index
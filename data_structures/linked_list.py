@@ -1,15 +1,29 @@
-from typing import TypeVar, Generic
+from typing import Iterator, TypeVar, Generic
 from entity_base.entity import Entity
 
+"""
+A doubly linked list of nodes that store their own _next and _prev pointers.
+
+The list also keeps the set of its nodes for O(1) membership checks, and gives each
+node an order label that increases from head to tail, so isBefore() is O(1).
+Labels are spaced apart, so inserting only relabels the whole list once the gap at the
+insertion point runs out. Iterating returns a new generator each time, so iterations
+can be nested.
+"""
+
+# spacing between the order labels of consecutive nodes after relabeling
+ORDER_LABEL_GAP = 1 << 20
+
 T = TypeVar('T')
 class LinkedListNode(Generic[T]):
     def __init__(self):
         self._next: T | LinkedListNode | Entity = None
         self._prev: T | LinkedListNode | Entity = None
+        self._orderLabel: int = None # position in the list, compared by LinkedList.isBefore()
 
     def getPrevious(self) -> T | 'LinkedListNode':
         return self._prev
-    
+
     def getNext(self) -> T | 'LinkedListNode':
         return self._next
 
@@ -19,21 +33,54 @@ class LinkedList(Generic[T]):
         self.head: LinkedListNode[T] | T = None
         self.tail: LinkedListNode[T] | T = None
 
-    def __iter__(self):
-        self.iteratorPointer = self.head
-        return self
-    
-    def __next__(self) -> LinkedListNode[T] | T:
-        if self.iteratorPointer is None:
-            raise StopIteration
+        self._nodes: set[LinkedListNode[T] | T] = set()
+
+        # node -> index, rebuilt the first time getIndex() is called after a change
+        self._indices: dict[LinkedListNode[T] | T, int] = None
+
+    def __iter__(self) -> Iterator[LinkedListNode[T] | T]:
+        current = self.head
+        while current is not None:
+            # read the next node first, so the current one can be removed while iterating
+            nextNode = current._next
+            yield current
+            current = nextNode
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, node: LinkedListNode) -> bool:
+        return node in self._nodes
+
+    # called after a node is linked in, to label it between its neighbors
+    def _onInsert(self, node: LinkedListNode):
+
+        self._nodes.add(node)
+        self._indices = None
+
+        if self.head is self.tail:
+            node._orderLabel = 0
+        elif node is self.tail:
+            node._orderLabel = node._prev._orderLabel + ORDER_LABEL_GAP
+        elif node is self.head:
+            node._orderLabel = node._next._orderLabel - ORDER_LABEL_GAP
         else:
-            current = self.iteratorPointer
-            self.iteratorPointer = self.iteratorPointer._next
-            return current
+            node._orderLabel = (node._prev._orderLabel + node._next._orderLabel) // 2
+            if node._orderLabel == node._prev._orderLabel:
+                self._relabel()
+
+    # space out the labels of all nodes evenly again
+    def _relabel(self):
+        for i, node in enumerate(self):
+            node._orderLabel = i * ORDER_LABEL_GAP
 
     def addToBeginning(self, node: LinkedListNode):
-        
+
+        # the node may have been in the list before
+        node._prev = None
+
         if self.head is None:
+            node._next = None
             self.head = node
             self.tail = node
         else:
@@ -41,9 +88,15 @@ class LinkedList(Generic[T]):
             self.head._prev = node
             self.head = node
 
+        self._onInsert(node)
+
     def addToEnd(self, node: LinkedListNode):
 
+        # the node may have been in the list before
+        node._next = None
+
         if self.head is None:
+            node._prev = None
             self.head = node
             self.tail = node
         else:
@@ -51,6 +104,8 @@ class LinkedList(Generic[T]):
             node._prev = self.tail
             self.tail = node
 
+        self._onInsert(node)
+
     def insertBeforeEnd(self, node: LinkedListNode):
         self.insertBefore(self.tail, node)
 
@@ -61,25 +116,31 @@ class LinkedList(Generic[T]):
         if self.head is node:
             self.addToBeginning(newNode)
             return
-                
+
+        assert(node in self._nodes)
+
         newNode._prev = node._prev
         node._prev._next = newNode
         newNode._next = node
         node._prev = newNode
 
+        self._onInsert(newNode)
+
     def insertAfter(self, node: LinkedListNode, newNode: LinkedListNode):
 
         if self.tail is node or node is None:
             self.addToEnd(newNode)
             return
-        
-        assert(self.contains(node))
+
+        assert(node in self._nodes)
 
         newNode._next = node._next
         node._next._prev = newNode
         node._next = newNode
         newNode._prev = node
 
+        self._onInsert(newNode)
+
     def remove(self, node: LinkedListNode):
 
         if self.head is self.tail:
@@ -95,17 +156,27 @@ class LinkedList(Generic[T]):
             node._prev._next = node._next
             node._next._prev = node._prev
 
+        self._nodes.discard(node)
+        self._indices = None
+
     def clear(self):
         self.head = None
         self.tail = None
+        self._nodes.clear()
+        self._indices = None
 
     def contains(self, node: LinkedListNode):
-        current = self.head
-        while current is not None:
-            if current is node:
-                return True
-            current = current.getNext()
-        return False
+        return node in self._nodes
+
+    # whether node a comes before node b. Both must be in the list
+    def isBefore(self, a: LinkedListNode, b: LinkedListNode) -> bool:
+        return a._orderLabel < b._orderLabel
+
+    # position of the node from the head. O(1), except for the first call after the list changes
+    def getIndex(self, node: LinkedListNode) -> int:
+        if self._indices is None:
+            self._indices = {n: i for i, n in enumerate(self)}
+        return self._indices[node]
 
     def printList(self):
 
@@ -114,4 +185,4 @@ class LinkedList(Generic[T]):
             print(current)
             current = current._next
 
-        print()
\ No newline at end of file
+        print()
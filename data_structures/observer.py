@@ -1,5 +1,6 @@
 from typing import Callable
 from enum import Enum, auto
+import inspect, itertools, weakref
 
 from utility.pretty_printer import PrettyPrinter
 
@@ -7,36 +8,50 @@ from utility.pretty_printer import PrettyPrinter
 class NotifyType(Enum):
     DEFAULT = auto()
     TURN_ENABLE_TOGGLED = auto()
+    VALUE_CHANGED = auto() # a PathAdapter value used by generated code changed
+    ADAPTER_MODIFIED = auto() # a PathAdapter was modified since its command last polled it
 
 # Classes that want to observe observables must implement Observers
-# This is in charge of correctly handling unsubscriptions when the object is deleted
-# otherwise, the observable will still try to notify the observer, and prevent
-# object from being garbage collected
+# Observables only hold weak references to their observers, so an observer that is
+# deleted without unsubscribing is still garbage collected, and its subscriptions are
+# dropped automatically. unsubscribeAll() drops them right away instead
 class Observer:
 
     def onSubscribe(self, observable: 'Observable'):
 
         if "observablesIAmSubscribedTo" not in self.__dict__:
-            self.observablesIAmSubscribedTo: list['Observable'] = []
+            self.observablesIAmSubscribedTo: weakref.WeakValueDictionary[int, Observable] = weakref.WeakValueDictionary()
 
-        self.observablesIAmSubscribedTo.append(observable)
+        self.observablesIAmSubscribedTo[id(observable)] = observable
 
 
     def unsubscribeAll(self):
 
         if "observablesIAmSubscribedTo" not in self.__dict__:
             return
-        
-        
-        for observable in self.observablesIAmSubscribedTo:
+
+        for observable in list(self.observablesIAmSubscribedTo.values()):
             observable.unsubscribe(self)
+        self.observablesIAmSubscribedTo.clear()
 
 class _ObserverState(PrettyPrinter):
 
-    def __init__(self, observer: Observer, id = NotifyType.DEFAULT, onNotify: Callable = lambda : None):
-        self.observer = observer
+    def __init__(self, observer: Observer, id = NotifyType.DEFAULT, onNotify: Callable = lambda : None, onObserverDeleted: Callable = None):
+        self.observer = weakref.ref(observer, onObserverDeleted)
         self.id = id
-        self.onNotify = onNotify
+
+        # a method of the observer itself would keep the observer alive,
+        # so store the plain function and call it with the observer instead
+        self.isObserverMethod = inspect.ismethod(onNotify) and onNotify.__self__ is observer
+        self.onNotify = onNotify.__func__ if self.isObserverMethod else onNotify
+
+# subscription number -> subscription, for each NotifyType
+_Subscriptions = dict[NotifyType, dict[int, _ObserverState]]
+
+_subscriptionNumbers = itertools.count()
+
+# subscribe() uses "id" for the NotifyType, which shadows id()
+_builtinID = id
 
 class Observable:
 
@@ -48,31 +63,64 @@ class Observable:
 
         if not isinstance(id, NotifyType):
             raise Exception("id must be of type NotifyType")
-        
+
         if not isinstance(onNotify, Callable):
             raise Exception("onNotify must be of type Callable")
-        
+
         yourself.onSubscribe(self)
-        
+
         if "observers" not in self.__dict__:
-            self.observers: list[_ObserverState] = []
-        self.observers.append(_ObserverState(yourself, id, onNotify))
+            self.observers: _Subscriptions = {}
+            self._subscriptionsOf: dict[int, list[tuple[NotifyType, int]]] = {} # id(observer) -> its subscriptions
+
+        number = next(_subscriptionNumbers)
+        observerID = _builtinID(yourself)
+
+        # drop the subscriptions of the observer once it is garbage collected.
+        # Only a weak reference to the observable is held, so it can be collected first
+        weakSelf = weakref.ref(self)
+        def onObserverDeleted(ref):
+            observable = weakSelf()
+            if observable is not None:
+                observable._removeSubscriptions(observerID)
+
+        if id not in self.observers:
+            self.observers[id] = {}
+        self.observers[id][number] = _ObserverState(yourself, id, onNotify, onObserverDeleted)
+
+        if observerID not in self._subscriptionsOf:
+            self._subscriptionsOf[observerID] = []
+        self._subscriptionsOf[observerID].append((id, number))
         return True
-    
+
+    # removes every subscription of the observer. Only takes time for the observer's own subscriptions
     def unsubscribe(self, observer: Observer):
         if "observers" not in self.__dict__:
             return
-        
-        i = 0
-        while i < len(self.observers):
-            if self.observers[i].observer is observer:
-                del self.observers[i]
-            else:
-                i += 1
+        self._removeSubscriptions(_builtinID(observer))
+
+    def _removeSubscriptions(self, observerID: int):
+        for id, number in self._subscriptionsOf.pop(observerID, []):
+            del self.observers[id][number]
+            if len(self.observers[id]) == 0:
+                del self.observers[id]
 
     def notify(self, id = NotifyType.DEFAULT):
-        if "observers" in self.__dict__:
-            for observer in self.observers:
-                if id == observer.id:
-                    #print("notifying", id, observer.onNotify)
-                    observer.onNotify()
\ No newline at end of file
+        if "observers" in self.__dict__ and id in self.observers:
+
+            # copy, since callbacks may subscribe or unsubscribe
+            for state in tuple(self.observers[id].values()):
+                observer = state.observer()
+                if observer is None:
+                    continue # deleted, and about to be removed
+                #print("notifying", id, state.onNotify)
+                if state.isObserverMethod:
+                    state.onNotify(observer)
+                else:
+                    state.onNotify()
+
+    # number of live subscriptions to this observable, for debugging leaks
+    def getNumSubscriptions(self) -> int:
+        if "observers" not in self.__dict__:
+            return 0
+        return sum(len(subscriptions) for subscriptions in self.observers.values())
@@ -35,6 +35,13 @@ class ConstraintLinesEntity(Entity):
     def isTouching(self, mouse: tuple) -> float:
         return False
     
+    def defineHitbox(self) -> None:
+        return None
+    
+    # lines span the field and depend on the hovered node, not this entity
+    def defineDrawBounds(self) -> None:
+        return None
+    
     def _point(self, startPoint, distance, theta):
         return startPoint[0] + distance * math.cos(theta), startPoint[1] + distance * math.sin(theta)
     
@@ -50,8 +57,12 @@ class ConstraintLinesEntity(Entity):
         if hoveredNode is None:
             return
         
-        for constraint in hoveredNode.model.getConstraints():
-            point = self.field.inchesToMouse(constraint.line.p1)
+        constraints = hoveredNode.model.getConstraints()
+        if len(constraints) == 0:
+            return
+        
+        points = self.field.inchesToMouseArray([constraint.line.p1 for constraint in constraints]).tolist()
+        for constraint, point in zip(constraints, points):
             theta = constraint.line.theta
 
             p1 = self._point(point, self.dist, theta)
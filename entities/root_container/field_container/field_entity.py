@@ -20,7 +20,9 @@ from utility.coordinate_transform import CoordinateTransformBuilder
 from utility.math_functions import clamp, isInsideBox
 from utility.pygame_functions import scaleSurface
 from data_structures.observer import Observable
+from collections import OrderedDict
 import pygame
+import numpy as np
 import weakref
 
 class Ref(Enum):
@@ -38,6 +40,9 @@ This includes:
 
 class FieldEntity(Entity, Observable):
 
+    # number of zoom levels to keep scaled images for
+    MAX_SCALED_SURFACES = 4
+
     def __init__(self, parent: Entity):
 
         super().__init__(parent,
@@ -78,11 +83,14 @@ class FieldEntity(Entity, Observable):
         builder.defineSecondPoint(self.BOTTOM_RIGHT_POS_PIXELS, fsi)
         self.transform = builder.build()
 
-        # cache old rect to see if there was any change, in which case
-        # scaled image needs to be recomputed
-        self._oldRect = None
-        self._oldZoom = None
-        self._oldPan = None
+        # Scaled field images, keyed by pixel size and most recently used last.
+        # Panning only changes which part of the scaled image is drawn
+        self._scaledSurfaces: OrderedDict[int, pygame.Surface] = OrderedDict()
+        self.scaledSurface: pygame.Surface = None
+
+        # raw image, then repeatedly halved. Scaling starts from the smallest
+        # image at least as large as the target, which is much faster than from the raw image
+        self._mipLevels: list[pygame.Surface] = [self.rawSurface]
 
         # Construct global field objects
         ConstraintLinesEntity(self)
@@ -153,27 +161,31 @@ class FieldEntity(Entity, Observable):
     def onStopDrag(self):
         pass
 
-    # recompute scaled surface if change in scale
+    # get the scaled surface for the current size and zoom, scaling the image only if not cached
     def defineAfter(self) -> None:
-        
-        # use cached surface if no change
-        if self.RECT == self._oldRect:
-            if self._zoom == self._oldZoom:
-                if (self._panX, self._panY) == self._oldPan:
-                    return
-        
-        self._oldRect = self.RECT
-        self._oldZoom = self._zoom
-        self._oldPan = (self._panX, self._panY)
 
-        size = self.WIDTH * self._zoom
-        scaledSurface = pygame.transform.smoothscale(self.rawSurface, (size, size))
-        self.fieldSurface = pygame.Surface((self.WIDTH, self.HEIGHT)).convert_alpha()
+        size = max(1, int(self.WIDTH * self._zoom))
 
-        offsetX = self._pwidth(self._panX)
-        offsetY = self._pheight(self._panY)
+        if size in self._scaledSurfaces:
+            self._scaledSurfaces.move_to_end(size)
+        else:
+            self._scaledSurfaces[size] = pygame.transform.smoothscale(self._getMipLevel(size), (size, size)).convert_alpha()
+            if len(self._scaledSurfaces) > self.MAX_SCALED_SURFACES:
+                self._scaledSurfaces.popitem(last = False)
+
+        self.scaledSurface = self._scaledSurfaces[size]
 
-        self.fieldSurface.blit(scaledSurface, (offsetX, offsetY))
+    # smallest of the raw image and its halvings that is at least size pixels wide
+    def _getMipLevel(self, size: int) -> pygame.Surface:
+
+        while self._mipLevels[-1].get_width() // 2 >= size:
+            level = self._mipLevels[-1]
+            self._mipLevels.append(pygame.transform.smoothscale(level, (level.get_width() // 2, level.get_height() // 2)))
+
+        for level in reversed(self._mipLevels):
+            if level.get_width() >= size:
+                return level
+        return self.rawSurface
         
     # convert from absolute coordinates to position on field in inches (0-144)
     def mouseToInches(self, mousePos: tuple) -> tuple:
@@ -221,6 +233,29 @@ class FieldEntity(Entity, Observable):
         # convert to absolute coordinates
         return (self._px(px), self._py(py))
     
+    # Scale and offset arrays such that absolute coordinates = inches * scale + offset.
+    # Combines the image pixel transform, zoom, panning and field position into one affine map
+    def _inchesToMouseAffine(self) -> tuple[np.ndarray, np.ndarray]:
+        inchesScale, inchesOffset = self.transform.getAffine(Ref.FIELD_INCHES)
+
+        zoom = self._zoom / self.RAW_SURFACE_PIXELS
+        parentSize = np.array([self._parent.WIDTH, self._parent.HEIGHT])
+        parentTopLeft = np.array([self._parent.LEFT_X, self._parent.TOP_Y])
+
+        scale = inchesScale * zoom * parentSize
+        offset = (inchesOffset * zoom + (self._panX, self._panY)) * parentSize + parentTopLeft
+        return scale, offset
+
+    # convert an (N,2) array of points in inches (0-144) to absolute coordinates, all at once
+    def inchesToMouseArray(self, inches: np.ndarray) -> np.ndarray:
+        scale, offset = self._inchesToMouseAffine()
+        return np.asarray(inches, dtype = float).reshape(-1, 2) * scale + offset
+    
+    # convert an (N,2) array of absolute coordinates to points in inches (0-144), all at once
+    def mouseToInchesArray(self, mouse: np.ndarray) -> np.ndarray:
+        scale, offset = self._inchesToMouseAffine()
+        return (np.asarray(mouse, dtype = float).reshape(-1, 2) - offset) / scale
+    
     # convert only through scaling for vectors, no offsets
     def inchesToMouseScaleOnly(self, vector: tuple) -> tuple:
         pixelWidth, pixelHeight = self.transform.scaleFrom(Ref.FIELD_INCHES, vector)
@@ -251,6 +286,12 @@ class FieldEntity(Entity, Observable):
         # make a save
         ProjectHistoryInterface.getInstance().save()
 
+    # the field looks the same whether hovered or not
+    def defineHoverRedrawRects(self) -> list[list] | None:
+        return []
+
+    # draw the panned part of the scaled image
     def draw(self, screen: pygame.Surface, isActive: bool, isHovered: bool):
-        screen.blit(self.fieldSurface, (self.LEFT_X, self.TOP_Y))
-        pass
\ No newline at end of file
+        offsetX = self._pwidth(self._panX)
+        offsetY = self._pheight(self._panY)
+        screen.blit(self.scaledSurface, (self.LEFT_X, self.TOP_Y), (-offsetX, -offsetY, self.WIDTH, self.HEIGHT))
\ No newline at end of file
@@ -63,6 +63,7 @@ class PathNodeEntity(Entity, IPathNodeEntity):
         )
 
         self.RADIUS = 10
+        self.TOUCH_MARGIN = 4
         self.RADIUS_HOVERED = 12
 
         self.TURN_DISABLED_COLOR = (168, 194, 255)
@@ -169,9 +170,24 @@ class PathNodeEntity(Entity, IPathNodeEntity):
             self.COLOR = self.BLUE_COLOR
     
     def isTouching(self, position: tuple) -> bool:
-        MARGIN = 4
-        return self.distanceTo(position) <= self.RADIUS + MARGIN
+        return self.distanceTo(position) <= self.RADIUS + self.TOUCH_MARGIN
     
+    def defineHitbox(self) -> list:
+        return self._circleHitbox(self.RADIUS + self.TOUCH_MARGIN)
+    
+    # moving a node changes constraint lines and neighboring segments, so redraw everything
+    def defineDrawBounds(self) -> None:
+        return None
+    
+    # hovering only grows the node, unless it shows constraint lines or bezier control points
+    def defineHoverRedrawRects(self) -> list[list] | None:
+        if len(self.model.getConstraints()) > 0:
+            return None
+        for segment in [self.model.getPrevious(), self.model.getNext()]:
+            if segment is not None and segment.getType() == SegmentType.BEZIER:
+                return None
+        return [self._circleHitbox(self.RADIUS_HOVERED)]
+
     def draw(self, screen, isActive, isHovered):
 
         if self.model.isTemporary():
@@ -50,8 +50,24 @@ class AbstractSegmentEntity(Entity):
         self.colorReversedA = shade(self.colorReversed, 0.7)
 
     def defineAfter(self) -> None:
-        self.beforePos = self.field.inchesToMouse(self.model.getBeforePos())
-        self.afterPos = self.field.inchesToMouse(self.model.getAfterPos())
+        positions = self.field.inchesToMouseArray([self.model.getBeforePos(), self.model.getAfterPos()])
+        self.beforePos, self.afterPos = map(tuple, positions.tolist())
+
+    # bounding box of the line between the two nodes, padded by the hover thickness
+    # plus a pixel for the rounding of node positions
+    def defineHitbox(self) -> list:
+        return self._pointsHitbox([self.beforePos, self.afterPos])
+
+    # segments are redrawn together with the nodes they connect
+    def defineDrawBounds(self) -> None:
+        return None
+
+    def _pointsHitbox(self, points: list[tuple]) -> list:
+        margin = self.HOVER_THICKNESS + 1
+        xs = [point[0] for point in points]
+        ys = [point[1] for point in points]
+        x, y = min(xs) - margin, min(ys) - margin
+        return [x, y, max(xs) + margin - x, max(ys) + margin - y]
 
     def onStartDrag(self, mouse: tuple):
         self.nodeStartPosition = []
@@ -36,6 +36,7 @@ class ArcNodeEntity(Entity):
 
         self.RADIUS = 5
         self.RADIUS_H = 6
+        self.TOUCH_MARGIN = 4
 
     def _findPerpDistance(self, mouse: tuple) -> float:
         beforePos = self.segment.beforePos
@@ -68,9 +69,17 @@ class ArcNodeEntity(Entity):
         return self.field.inchesToMouse(centerInches)
     
     def isTouching(self, position: tuple) -> bool:
-        MARGIN = 4
-        return self.distanceTo(position) <= self.RADIUS + MARGIN
+        return self.distanceTo(position) <= self.RADIUS + self.TOUCH_MARGIN
     
+    def defineHitbox(self) -> list:
+        return self._circleHitbox(self.RADIUS + self.TOUCH_MARGIN)
+    
+    def defineDrawBounds(self) -> None:
+        return None
+    
+    def defineHoverRedrawRects(self) -> list[list]:
+        return [self._circleHitbox(self.RADIUS_H)]
+
     def draw(self, screen: pygame.Surface, isActive: bool, isHovered: bool) -> bool:
         RADIUS = self.RADIUS_H if self.hover.isHovering else self.RADIUS
         COLOR = self.COLOR_H if self.hover.isHovering else self.COLOR
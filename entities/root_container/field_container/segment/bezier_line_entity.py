@@ -22,6 +22,12 @@ class BezierLineEntity(Entity):
     def isTouching(self, mouse: tuple) -> float:
         return False
     
+    def defineHitbox(self) -> None:
+        return None
+    
+    def defineDrawBounds(self) -> None:
+        return None
+    
     def defineAfter(self) -> None:
         self.p1 = [self.CENTER_X, self.CENTER_Y]
         self.p2 = self.field.inchesToMouse(self.parent.getNeighborNode().position)
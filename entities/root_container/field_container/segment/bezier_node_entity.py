@@ -38,6 +38,7 @@ class BezierNodeEntity(Entity):
 
         self.RADIUS = 5
         self.RADIUS_H = 6
+        self.TOUCH_MARGIN = 4
 
         self.isFirst = isFirstControlPoint
 
@@ -113,8 +114,13 @@ class BezierNodeEntity(Entity):
         if not self.segment.isBezierHovered():
             return
 
-        MARGIN = 4
-        return self.distanceTo(position) <= self.RADIUS + MARGIN
+        return self.distanceTo(position) <= self.RADIUS + self.TOUCH_MARGIN
+    
+    def defineHitbox(self) -> list:
+        return self._circleHitbox(self.RADIUS + self.TOUCH_MARGIN)
+    
+    def defineDrawBounds(self) -> None:
+        return None
     
     def getColor(self) -> tuple:
         return self.COLOR_H if self.hover.isHovering else self.COLOR
@@ -49,6 +49,11 @@ class BezierSegmentEntity(AbstractSegmentEntity):
                 return True
 
         return False
+    
+    def defineHitbox(self) -> list:
+        if len(self.mousePoints) == 0:
+            return None
+        return self._pointsHitbox(self.mousePoints)
 
     def getBezierState(self) -> BezierSegmentState:
         return self.model.getState()
@@ -56,11 +61,12 @@ class BezierSegmentEntity(AbstractSegmentEntity):
     def defineAfter(self) -> None:
         super().defineAfter()
         
+        # convert all the points at once, then to lists since they are iterated point by point
         pointsInches = self.getBezierState().getBezierPoints()
-        self.points = [self.field.inchesToMouse(point) for point in pointsInches]
+        self.points = self.field.inchesToMouseArray(pointsInches).tolist()
 
         mousePointsInches = self.getBezierState().getBezierMousePoints()
-        self.mousePoints = [self.field.inchesToMouse(point) for point in mousePointsInches]
+        self.mousePoints = self.field.inchesToMouseArray(mousePointsInches).tolist()
 
     # return if self, nodes, or control points are hovered
     def isBezierHovered(self) -> bool:
@@ -37,6 +37,10 @@ class StraightSegmentEntity(AbstractSegmentEntity):
         afterUI = self.model.getNext().ui
         x2, y2 = afterUI.CENTER_X, afterUI.CENTER_Y
         return pointTouchingLine(*position, x1, y1, x2, y2, self.HOVER_THICKNESS)
+    
+    # hovering only changes the color of the line
+    def defineHoverRedrawRects(self) -> list[list]:
+        return [self.defineHitbox()]
 
     def draw(self, screen, isActive, isHovering):
 
@@ -84,7 +84,7 @@ class CommandBlockEntity(Entity, Observer, ModelBasedEntity, ICommandBlock):
         super().__init__(
             parent = parent,
             click = ClickLambda(self, FonLeftClick = self.onClick, FOnMouseDown = self.onMouseDown),
-            tick = TickLambda(self, FonTickStart = self.onTick),
+            tick = TickLambda(self, FonTickStart = self.onTick, FisActive = self.isTickActive),
             drag = DragLambda(self, FonStartDrag = self.onStartDrag, FonDrag = self.onDrag, FonStopDrag = self.onStopDrag),
             hover = HoverLambda(self),
             drawOrder = DrawOrder.COMMANND_BLOCK,
@@ -96,7 +96,6 @@ class CommandBlockEntity(Entity, Observer, ModelBasedEntity, ICommandBlock):
         ModelBasedEntity.__init__(self, self.model)
 
         self.elementsContainer = None
-        self.mouseHoveringCommand = False
 
         self.elementsVisible = True
 
@@ -117,6 +116,7 @@ class CommandBlockEntity(Entity, Observer, ModelBasedEntity, ICommandBlock):
         self.colorR.setEndValue(r)
         self.colorG.setEndValue(g)
         self.colorB.setEndValue(b)
+        self.activateTick()
 
     # called when a different name is selected in the dropdown
     def onFunctionChange(self):
@@ -161,8 +161,6 @@ class CommandBlockEntity(Entity, Observer, ModelBasedEntity, ICommandBlock):
             self.elementsContainer.setVisible()
             self.elementsVisible = True
 
-        self.mouseHoveringCommand = self.isSelfOrChildrenHovering()
-
         self.colorR.tick()
         self.colorG.tick()
         self.colorB.tick()
@@ -182,6 +180,12 @@ class CommandBlockEntity(Entity, Observer, ModelBasedEntity, ICommandBlock):
             self.model.resetModified()
 
 
+    # whether onTick() has anything to do next tick. The model activates the tick when the adapter is modified
+    def isTickActive(self) -> bool:
+        colorsDone = self.colorR.isDone() and self.colorG.isDone() and self.colorB.isDone()
+        return not self.animatedExpansion.isDone() or not colorsDone or self.model.wasModified() \
+            or self.elementsVisible == self.isFullyCollapsed()
+
     # how much the widgets stretch the command by. return the largest one
     def getElementStretch(self) -> int:
         if self.elementsContainer is None:
@@ -220,6 +224,8 @@ class CommandBlockEntity(Entity, Observer, ModelBasedEntity, ICommandBlock):
         self.ACTUAL_HEIGHT = self.ACTUAL_EXPANDED_HEIGHT if expanded else self.ACTUAL_COLLAPSED_HEIGHT
 
         self.animatedExpansion.setEndValue(1 if expanded else 0)
+        if not self.animatedExpansion.isDone():
+            self.activateTick()
         
         # current animated height
         ratio = self.animatedExpansion.get()
@@ -347,7 +353,7 @@ class CommandBlockEntity(Entity, Observer, ModelBasedEntity, ICommandBlock):
             color = shade(color, 1.4)
         elif isActive and isHovered and self.interactor.leftDragging:
             color = shade(color, 1.3)
-        elif self.mouseHoveringCommand and not self.interactor.disableUntilMouseUp:
+        elif self.isSelfOrChildrenHovering() and not self.interactor.disableUntilMouseUp:
             color = shade(color, 1.2)
         else:
             color = shade(color, 1.1)
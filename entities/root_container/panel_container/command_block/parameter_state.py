@@ -41,6 +41,7 @@ class ParameterState:
     def setValueByID(self, id: str, value: Any):
         print("setting value of " + str(id) + " to " + str(value))
         self.hashmap[id] = value
+        self.model.onCodeChange()
 
         # add save state to undo/redo stack
         ProjectHistoryInterface.getInstance().save()
@@ -30,7 +30,7 @@ class SectionEntity(Entity, ModelBasedEntity):
         self.HEADER_HEIGHT = 30
         super().__init__(parent = parent,
             click = ClickLambda(self, FonLeftClick=lambda mouse: self.toggleExpansion()),
-            tick = TickLambda(self, FonTickStart=lambda: self.onTick()),
+            tick = TickLambda(self, FonTickStart=lambda: self.onTick(), FisActive = lambda: self.isTickActive()),
             hover = HoverLambda(self)
         )
 
@@ -70,6 +70,10 @@ class SectionEntity(Entity, ModelBasedEntity):
             self.animatedExpansion.tick()
             self.recomputeEntity()
 
+    # whether onTick() has anything to do next tick
+    def isTickActive(self) -> bool:
+        return not self.animatedExpansion.isDone() or self.commandsVisible == self.isFullyCollapsed()
+
     def getCommandOpacity(self) -> float:
         return self.animatedExpansion.get()
 
@@ -84,6 +88,7 @@ class SectionEntity(Entity, ModelBasedEntity):
     
     def setExpansion(self, isExpanded: bool):
         self.animatedExpansion.setEndValue(1 if isExpanded else 0)
+        self.activateTick()
 
     def getExpansion(self) -> float:
         return self.commandsVisible
@@ -55,6 +55,9 @@ class ReadoutEntity(ElementContainer, Observer):
     def isTouching(self, mouse: tuple) -> bool:
         return Entity.isTouching(self, mouse)
     
+    def defineHitbox(self) -> list:
+        return Entity.defineHitbox(self)
+    
     def draw(self, screen: pygame.Surface, isActive: bool, isHovered: bool) -> bool:
 
         color = (60,60,60) if isHovered else (0,0,0)
@@ -11,4 +11,7 @@ as that will affect child entities without affecting itself
 class Container(Entity):
 
     def isTouching(self, position: tuple) -> bool:
-        return False
\ No newline at end of file
+        return False
+    
+    def defineHitbox(self) -> None:
+        return None
\ No newline at end of file
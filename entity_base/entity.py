@@ -45,6 +45,10 @@ _images: ImageManager = None
 _fonts: FontManager = None
 _dimensions: Dimensions = None
 ROOT_CONTAINER = None
+
+# set by recomputePosition(), and restored after probeSize()
+RECT_ATTRIBUTES = ["LEFT_X", "CENTER_X", "RIGHT_X", "TOP_Y", "CENTER_Y", "BOTTOM_Y", "WIDTH", "HEIGHT", "RECT"]
+
 def initEntityClass(entityManager: EntityManager, interactor: Interactor, images: ImageManager, fonts: FontManager, dimensions: Dimensions):
     global _entities, _interactor, _images, _fonts, _dimensions, _transform
     _entities = entityManager
@@ -76,6 +80,12 @@ class Entity(ABC, Observable):
                  drawOrderRecursive: bool = True,
 
                  ) -> None:
+
+        self.entities = _entities
+        self.interactor = _interactor
+        self.images = _images
+        self.fonts = _fonts
+        self.dimensions = _dimensions
                 
         self.drawOrder = drawOrder
         self.drawOrderRecursive = drawOrderRecursive # if not recursive, draws in front of everything
@@ -95,18 +105,18 @@ class Entity(ABC, Observable):
         # for debugging with tree()
         self.verbose = verbose
 
-        self.entities = _entities
-        self.interactor = _interactor
-        self.images = _images
-        self.fonts = _fonts
-        self.dimensions = _dimensions
-
         self._children: list[Entity] = []
         self._parent: Entity = parent
 
         self._widthCached = False
         self._heightCached = False
 
+        # last known tiebreaker, used to detect when the cached traversal order is stale
+        self._cachedTiebreaker = None
+
+        # sizes often depend on visibility, so see isSizeUnchanged()
+        self._visibleWhenRecomputed = None
+
         if self._parent is not None and self not in self._parent._children:
             self._parent._children.append(self)
             self._parent.onAddChild(self)
@@ -116,6 +126,18 @@ class Entity(ABC, Observable):
     def deleteEntity(self):
         self.entities.removeEntity(self)
 
+    # drawOrder is cached in the flattened traversal order, so changing it invalidates that order
+    @property
+    def drawOrder(self) -> DrawOrder:
+        return self._drawOrder
+    
+    @drawOrder.setter
+    def drawOrder(self, drawOrder: DrawOrder):
+        if "_drawOrder" in self.__dict__:
+            self.entities.redrawScreenThisTick()
+        self._drawOrder = drawOrder
+        self.entities.invalidateTraversalOrder()
+
     def removeChild(self, child: Entity):
         if child in self._children:
             child._parent = None
@@ -131,11 +153,22 @@ class Entity(ABC, Observable):
             newParent._children.append(self)
 
         self._parent = newParent
+        self.entities.invalidateTraversalOrder()
 
     # optional callback to override for when child just set this as parent
     def onAddChild(self, child: Entity):
         return
 
+    # optional callback to override for when a recompute is requested from within child's subtree
+    # while child updates this, meaning that the size of child may have changed
+    def onChildLayoutChanged(self, child: Entity):
+        return
+
+    # optional callback to override for entities that detach children from the entity tree
+    # while keeping them as their children, like a VariableContainer that was dematerialized
+    def isChildAttached(self, child: Entity) -> bool:
+        return True
+
     def distanceTo(self, position: tuple) -> float:
         return distance(*position, self.CENTER_X, self.CENTER_Y)
     
@@ -200,6 +233,7 @@ class Entity(ABC, Observable):
             return
 
         self._LOCAL_VISIBLE = True
+        self.entities.invalidateTraversalOrder()
 
         if recompute:
             if not self._parent.isVisible():
@@ -207,6 +241,9 @@ class Entity(ABC, Observable):
                 self._parent.recomputeEntity()
             else:
                 self.recomputeEntity()
+        else:
+            self.entities.redrawRects([self.entities.getSubtreeDrawBounds(self)])
+            self.findAncestorEntityIndependentFromParent()
 
     def setInvisible(self):
 
@@ -215,6 +252,11 @@ class Entity(ABC, Observable):
             return
 
         self._LOCAL_VISIBLE = False
+        self.entities.invalidateTraversalOrder()
+        self.entities.redrawRects([self.entities.getSubtreeDrawBounds(self)])
+
+        # ancestors that cache the size of this entity are told it may have changed
+        self.findAncestorEntityIndependentFromParent()
 
     
     def isSelfOrChildrenHovering(self):
@@ -237,6 +279,11 @@ class Entity(ABC, Observable):
         self._isTouching = isInsideBox2(*mouse, *self.RECT)
         return self._isTouching
     
+    # override. The box [x, y, width, height] that contains everywhere isTouching() could be true.
+    # Return None if never touching, or UNBOUNDED_HITBOX to always be tested
+    def defineHitbox(self) -> list | str | None:
+        return self.RECT
+
     # override
     # with entities of equal DrawOrder, the largest number is drawn in the front 
     def drawOrderTiebreaker(self) -> float:
@@ -246,6 +293,25 @@ class Entity(ABC, Observable):
     def draw(self, screen: pygame.Surface, isActive: bool, isHovered: bool) -> bool:
         pass
 
+    # override. The box [x, y, width, height] that contains everything draw() paints.
+    # Return None if not known, in which case any change to this entity redraws the whole screen
+    def defineDrawBounds(self) -> list | None:
+        return self.RECT
+    
+    # override. Areas whose pixels change when this entity starts or stops being hovered.
+    # By default, None redraws the whole screen
+    def defineHoverRedrawRects(self) -> list[list] | None:
+        return None
+
+    # Tick this entity from next tick on, for when its tick listener has new work that
+    # did not recompute the entity. See TickListener
+    def activateTick(self):
+        self.entities.activateTick(self)
+
+    # Redraw this entity next frame, for changes to draw() that did not recompute the entity
+    def redrawThisEntity(self):
+        self.entities.redrawRects([self.defineDrawBounds()])
+
     # draw rect specified by x, y, width, height. For testing only probably
     def drawRect(self, screen: pygame.Surface):
         pygame.draw.rect(screen, (0,0,0), [self.LEFT_X, self.TOP_Y, self.WIDTH, self.HEIGHT], 1)
@@ -258,6 +324,16 @@ class Entity(ABC, Observable):
         self.HEIGHT = self.defineHeight()
 
     def recomputePosition(self):
+        self._computeRect()
+
+        # tiebreakers often depend on position, so the traversal order is stale if it changed
+        tiebreaker = self.drawOrderTiebreaker()
+        if tiebreaker != self._cachedTiebreaker:
+            self._cachedTiebreaker = tiebreaker
+            self.entities.invalidateTraversalOrder()
+
+    # set the position and size attributes from the define methods
+    def _computeRect(self):
         self.CENTER_X, self.CENTER_Y = self.defineCenter()
         self.LEFT_X, self.TOP_Y = self.defineTopLeft()
         self.RIGHT_X = self.defineRightX()
@@ -297,6 +373,9 @@ class Entity(ABC, Observable):
             self.CENTER_Y = self.dimensions.SCREEN_HEIGHT/2 if self._parent is None else self._py(0.5)
             self.BOTTOM_Y = self.dimensions.SCREEN_HEIGHT if self._parent is None else self._py(1)
 
+        # before rounding, since parents like VariableGroupContainer lay out with the defined sizes
+        self._definedSize = (self.WIDTH, self.HEIGHT)
+
         self.WIDTH = int(round(self.WIDTH))
         self.HEIGHT = int(round(self.HEIGHT))
         self.LEFT_X = int(round(self.LEFT_X))
@@ -309,28 +388,75 @@ class Entity(ABC, Observable):
 
         self.RECT = [self.LEFT_X, self.TOP_Y, self.WIDTH, self.HEIGHT]
 
+    # The unrounded (WIDTH, HEIGHT) this entity would have if it were recomputed now.
+    # Only this entity is computed, and its position and size are left unchanged
+    def probeSize(self) -> tuple:
+
+        saved = {key: self.__dict__[key] for key in RECT_ATTRIBUTES + ["_definedSize"]}
+
+        self.defineBefore()
+        self.recomputeWidth()
+        self.recomputeHeight()
+        self._computeRect()
+        size = self._definedSize
+
+        self.__dict__.update(saved)
+        return size
+    
+    # whether recomputing this entity would leave its size the same, so that entities that
+    # update from this entity do not need to be recomputed.
+    # False if never computed, or if it was shown or hidden since it was last recomputed
+    def isSizeUnchanged(self) -> bool:
+
+        if "RECT" not in self.__dict__:
+            return False
+        
+        visible = self.isVisible()
+        if visible != self._visibleWhenRecomputed or not (visible or self.recomputeWhenInvisible):
+            return False
+        
+        # sub-pixel changes count, even if the rounded WIDTH and HEIGHT stay the same
+        return self.probeSize() == self._definedSize
+
     # Going up the tree, find first ancestor entity with (thisUpdatesParent == False)
     def findAncestorEntityIndependentFromParent(self) -> 'Entity':
         if self._parent is not None and self.thisUpdatesParent:
+            self._parent.onChildLayoutChanged(self)
             return self._parent.findAncestorEntityIndependentFromParent()
         else:
             return self
 
+    # Going up the tree, find the first entity to recompute so that everything that depends on this
+    # entity is updated. Like findAncestorEntityIndependentFromParent(), but also stops at a layout
+    # boundary: an entity whose size stays the same, since its parent then does not need to change
+    def findLayoutBoundary(self) -> 'Entity':
+        entity = self
+        while entity._parent is not None and entity.thisUpdatesParent:
+            if entity.isSizeUnchanged():
+                return entity
+            entity._parent.onChildLayoutChanged(entity)
+            entity = entity._parent
+        return entity
+
     # Must call recomputePosition every time the entity changes its position or dimensions
     def recomputeEntity(self, isRoot: bool = True):
 
         # for initially calling this function, update ancestors first if ancestor dimensions dependent on self
+        # Once the window is running, this is deferred to the layout pass at the end of the tick.
+        # Ancestors are updated first if their dimensions depend on self, see findLayoutBoundary()
         if isRoot:
-            self.entities.redrawScreenThisTick()
-            firstEntityToCompute = self.findAncestorEntityIndependentFromParent()
-            #print("first", firstEntityToCompute)
-            firstEntityToCompute.recomputeEntity(False)
+            self.entities.layout.requestRecompute(self)
             return
 
         # only recompute when visible. Otherwise, the position is not defined
         # When the entity is made visible, it will recompute its position
-        if not self.isVisible() and not self.recomputeWhenInvisible:
+        self._visibleWhenRecomputed = self.isVisible()
+        if not self._visibleWhenRecomputed and not self.recomputeWhenInvisible:
             return
+        
+        # recomputing often starts an animation, like a new end value for a MotionProfile
+        if self.tick is not None:
+            self.entities.activateTick(self)
                 
         self.defineBefore()
         self.recomputeWidth()
@@ -338,7 +464,7 @@ class Entity(ABC, Observable):
         self.recomputePosition()
 
         self.defineAfter()
-
+        self.entities.updateHitbox(self)
 
         # Now that this entity position is recomputed, make sure children recompute too
         for child in self._children:
@@ -349,6 +475,10 @@ class Entity(ABC, Observable):
     def scalePixels(self, pixels: float):
         return pixels * self.dimensions.RESOLUTION_RATIO
 
+    # hitbox for a circle of the given radius at the center of the entity
+    def _circleHitbox(self, radius):
+        return [self.CENTER_X - radius, self.CENTER_Y - radius, radius * 2, radius * 2]
+
     # get relative x as a percent of parent horizontal span
     def _px(self, px):
         return self._parent.LEFT_X + px * self._parent.WIDTH
@@ -4,6 +4,11 @@ from abc import ABC, abstractmethod
 Tick callbacks are invoked on a recursive manner. onTickStart() callbacks
 are invoked on the parent entities before children, while onTickEnd() callbacks
 are invoked on the children before the parent.
+
+A listener either polls, and is ticked every tick, or is only ticked while it has work,
+like an animation that is not done. The latter is ticked until isActive() is False, and
+then not again until Entity.activateTick() is called. Polling listeners do not keep
+Window.run() from sleeping when nothing else is active, so they are ticked less often then.
 """
 
 class TickListener(ABC):
@@ -19,17 +24,33 @@ class TickListener(ABC):
     def onTickEnd(self):
         pass
 
+    # override. Whether this is ticked every tick, rather than only while isActive()
+    def isPolling(self) -> bool:
+        return True
+    
+    # override. Whether the entity still has work to do next tick
+    def isActive(self) -> bool:
+        return False
+
 
 class TickLambda(TickListener):
 
-    def __init__(self, entity, FonTickStart = lambda: None, FonTickEnd = lambda: None):
+    # if FisActive is given, only tick while it returns True
+    def __init__(self, entity, FonTickStart = lambda: None, FonTickEnd = lambda: None, FisActive = None):
         super().__init__(entity)
 
         self.FonTickStart = FonTickStart
         self.FonTickEnd = FonTickEnd
+        self.FisActive = FisActive
 
     def onTickStart(self):
         self.FonTickStart()
 
     def onTickEnd(self):
-        self.FonTickEnd()
\ No newline at end of file
+        self.FonTickEnd()
+
+    def isPolling(self) -> bool:
+        return self.FisActive is None
+    
+    def isActive(self) -> bool:
+        return self.FisActive is not None and self.FisActive()
\ No newline at end of file
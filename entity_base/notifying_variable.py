@@ -29,4 +29,7 @@ class NotifyingVariable(TickEntity):
         return False
     
     def isTouching(self, mouse: tuple) -> float:
-        return False
\ No newline at end of file
+        return False
+    
+    def defineHitbox(self) -> None:
+        return None
\ No newline at end of file
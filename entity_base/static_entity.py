@@ -20,6 +20,13 @@ class StaticEntity(entity.Entity):
 
     def isTouching(self, position: tuple) -> bool:
         return False
+    
+    def defineHitbox(self) -> None:
+        return None
+    
+    # Fdraw can draw anywhere
+    def defineDrawBounds(self) -> None:
+        return None
 
     def draw(self, screen: pygame.Surface, isActive: bool, isHovered: bool) -> bool:
         self.Fdraw()
\ No newline at end of file
@@ -55,6 +55,9 @@ class TextEntity(Entity, Observer):
     
     def isTouching(self, mouse: tuple) -> float:
         return False
+    
+    def defineHitbox(self) -> None:
+        return None
 
     # Draw text at the center. opacity set to parent opacity
     def draw(self, screen: pygame.Surface, isActive: bool, isHovered: bool) -> bool:
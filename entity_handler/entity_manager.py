@@ -2,10 +2,13 @@ from typing import Iterator
 from data_structures.observer import Observer
 from entity_base.entity import Entity
 from entity_handler.entity_traversal import traverseEntities, TraversalOrder
+from entity_handler.layout_scheduler import LayoutScheduler
+from entity_handler.spatial_index import SpatialIndex
 from entities.root_container.root_container import RootContainer
 from entity_ui.tooltip import TooltipOwner
 from common.dimensions import Dimensions
 from common.draw_order import DrawOrder
+from utility.motion_profile import MotionProfileStore
 import pygame
 
 """
@@ -14,17 +17,42 @@ update and draw them every tick.
 """
 class EntityManager:
 
+    MAX_DAMAGED_RECTS = 32
+
     def __init__(self):
 
         self._redrawScreenThisTick = True
 
-        self.entities: list[Entity] = []
+        # screen areas to redraw next frame if not redrawing the whole screen
+        self._damagedRects: list[pygame.Rect] = []
+
+        # damaged areas are drawn here first, then copied to the screen
+        self._backBuffer: pygame.Surface = None
+
+        # Insertion-ordered dicts used as ordered sets, so adding and removing an entity is O(1).
+        # Values are unused
+        self.entities: dict[Entity, None] = {}
 
-        self.keyEntities: list[Entity] = []        
-        self.clickEntities: list[Entity] = []
+        # entities with key and click listeners
+        self.keyEntities: dict[Entity, None] = {}
+        self.clickEntities: dict[Entity, None] = {}
 
         # entities outside of normal draw order (drawOrderRecursive == False)
-        self.outsideEntites: list[Entity] = []
+        self.outsideEntites: dict[Entity, None] = {}
+
+        # entities ticked every tick, and entities ticked until their tick listener is not active
+        self.pollingTickEntities: dict[Entity, None] = {}
+        self.activeTickEntities: dict[Entity, None] = {}
+
+        # flattened traversal orders, rebuilt lazily after invalidateTraversalOrder()
+        self._traversalCache: dict[TraversalOrder, list[Entity]] = {}
+        self._mouseOrderIndex: dict[Entity, int] = None
+
+        # grid of entity hitboxes, so that hover only tests entities near the mouse
+        self.spatialIndex = SpatialIndex()
+
+        # coalesces recomputeEntity() calls into one layout pass per frame
+        self.layout = LayoutScheduler(self)
 
     def initRootContainer(self):
         self.rootContainer = RootContainer()
@@ -32,63 +60,171 @@ class EntityManager:
     
     def resetFlagAfterDrawingEverything(self):
         self._redrawScreenThisTick = False
+        self._damagedRects = []
 
     def redrawScreenThisTick(self):
         self._redrawScreenThisTick = True
 
+    # Redraw only the given [x, y, width, height] areas next frame.
+    # A None area means its extent is unknown, so the whole screen is redrawn
+    def redrawRects(self, rects: list):
+
+        if self._redrawScreenThisTick:
+            return
+        
+        for rect in rects:
+            if rect is None:
+                self.redrawScreenThisTick()
+                return
+            
+            # pad by a pixel for antialiasing and rounding
+            rect = pygame.Rect(rect).inflate(2, 2)
+            if rect.width > 2 and rect.height > 2:
+                self._damagedRects.append(rect)
+
+        # deleting or recomputing many entities would make the list grow large
+        if len(self._damagedRects) > self.MAX_DAMAGED_RECTS:
+            self._damagedRects = [self._damagedRects[0].unionall(self._damagedRects)]
+
     def isRedrawThisTick(self) -> bool:
-        return self._redrawScreenThisTick
+        return self._redrawScreenThisTick or len(self._damagedRects) > 0
     
+    # Bounding box of everything drawn by the entity and its descendants.
+    # None if any of them do not know their draw bounds
+    def getSubtreeDrawBounds(self, entity: Entity) -> pygame.Rect | None:
+
+        if "RECT" not in entity.__dict__: # never computed, so never drawn
+            bounds = pygame.Rect(0, 0, 0, 0)
+        else:
+            drawBounds = entity.defineDrawBounds()
+            if drawBounds is None:
+                return None
+            bounds = pygame.Rect(drawBounds)
+
+        for child in entity._children:
+            childBounds = self.getSubtreeDrawBounds(child)
+            if childBounds is None:
+                return None
+            if childBounds.width > 0 and childBounds.height > 0:
+                bounds = childBounds if bounds.width == 0 or bounds.height == 0 else bounds.union(childBounds)
+        
+        return bounds
+    
+    # Redraw whatever is affected by entities starting or stopping to be hovered
+    def redrawHoverChange(self, oldHoveredEntity: Entity, newHoveredEntity: Entity):
+        for entity in [oldHoveredEntity, newHoveredEntity]:
+            if entity is not None:
+                rects = entity.defineHoverRedrawRects()
+                self.redrawRects([None] if rects is None else rects)
+    
+    # Called whenever the tree structure, a drawOrder, or a tiebreaker changes.
+    # The next draw or hit test will rebuild the flattened order
+    def invalidateTraversalOrder(self):
+        self._traversalCache.clear()
+        self._mouseOrderIndex = None
+
+    # Return all entities flattened in the given traversal order.
+    # Cached, so sorting children only happens after the order is invalidated
+    def getTraversal(self, order: TraversalOrder) -> list[Entity]:
+        traversal = self._traversalCache.get(order)
+        if traversal is None:
+            traversal = list(traverseEntities(self, order))
+            self._traversalCache[order] = traversal
+        return traversal
+    
+    # position of each entity in the MOUSE traversal, to sort candidates from the spatial index
+    def getMouseOrderIndex(self) -> dict[Entity, int]:
+        if self._mouseOrderIndex is None:
+            traversal = self.getTraversal(TraversalOrder.MOUSE)
+            self._mouseOrderIndex = {entity: i for i, entity in enumerate(traversal)}
+        return self._mouseOrderIndex
+
+    # Called after an entity recomputes its position
+    def updateHitbox(self, entity: Entity):
+        self.spatialIndex.update(entity, entity.defineHitbox(), entity.dimensions.SCREEN_WIDTH, entity.dimensions.SCREEN_HEIGHT)
+
 
     # by setting a parent, it will be removed when parent is removed
     # SHOULD ONLY BE CALLED WITHIN BASE ENTITY CLASS
     def _addEntity(self, entity: Entity):
         
-        self.entities.append(entity)
+        self.entities[entity] = None
+        self.invalidateTraversalOrder()
 
         if not entity.drawOrderRecursive:
-            self.outsideEntites.append(entity)
+            self.outsideEntites[entity] = None
 
         if entity.key is not None:
-            self.keyEntities.append(entity)
-        if entity.click is not None:
-            self.clickEntities.append(entity)
+            self.keyEntities[entity] = None
 
-    def removeEntity(self, entity: Entity, excludeChildrenIf = lambda child : False):
+        # ticked at least once, in case it starts with work to do
+        if entity.tick is not None:
+            if entity.tick.isPolling():
+                self.pollingTickEntities[entity] = None
+            else:
+                self.activeTickEntities[entity] = None
 
-        i = 0
-        while i < len(entity._children):
-            child = entity._children[i]
-            
-            if not excludeChildrenIf(child):
-                self.removeEntity(child)
-                continue
-            i += 1
+        if entity.click is not None:
+            self.clickEntities[entity] = None
 
+    def removeEntity(self, entity: Entity, excludeChildrenIf = lambda child : False):
+        self.removeSubtree(entity, excludeChildrenIf)
+
+    # Remove the entity and all its descendants in one pass.
+    # Direct children of the entity for which excludeChildrenIf is true are kept, along with their descendants
+    def removeSubtree(self, entity: Entity, excludeChildrenIf = lambda child : False):
+
+        # collect the subtree
+        removed: list[Entity] = []
+        stack = [entity]
+        while len(stack) > 0:
+            current = stack.pop()
+            removed.append(current)
+            for child in current._children:
+                if current is not entity or not excludeChildrenIf(child):
+                    stack.append(child)
+
+        # redraw where visible entities were, before detaching them changes their visibility
+        self.redrawRects([e.defineDrawBounds() for e in removed if e.isVisible() and "RECT" in e.__dict__])
+
+        # detach the subtree from its parent. Descendants stay attached to nothing but each other
         if entity._parent is not None and entity in entity._parent._children:
             entity._parent._children.remove(entity)
 
-        if entity in self.entities:
-            self.entities.remove(entity)
+        removedSet = set(removed)
+        for e in removed:
 
-        if entity in self.outsideEntites:
-            self.outsideEntites.remove(entity)
-        if entity in self.keyEntities:
-            self.keyEntities.remove(entity)
-        if entity in self.clickEntities:
-            self.clickEntities.remove(entity)
+            self.entities.pop(e, None)
+            self.outsideEntites.pop(e, None)
+            self.keyEntities.pop(e, None)
+            self.clickEntities.pop(e, None)
+            self.pollingTickEntities.pop(e, None)
+            self.activeTickEntities.pop(e, None)
+            self.spatialIndex.remove(e)
 
-        # entity unsubscribes to any observables
-        if isinstance(entity, Observer):
-            entity.unsubscribeAll()
+            # removed children are no longer children, same as if each had been removed one by one
+            if len(e._children) > 0:
+                e._children = [child for child in e._children if child not in removedSet]
+
+            # entity unsubscribes to any observables
+            if isinstance(e, Observer):
+                e.unsubscribeAll()
+
+        self.invalidateTraversalOrder()
 
     def getEntityAtPosition(self, position: tuple) -> Entity:
         parent = None
         drawOrder: DrawOrder = None
         tiebreaker = None
 
+        # Only entities whose hitbox contains the position can be touching.
+        # Visit them in MOUSE order, so the result is the same as visiting every entity
+        mouseOrderIndex = self.getMouseOrderIndex()
+        candidates = [entity for entity in self.spatialIndex.query(position) if entity in mouseOrderIndex]
+        candidates.sort(key = mouseOrderIndex.get)
+
         self.touching: list[Entity] = []
-        for entity in traverseEntities(self, TraversalOrder.MOUSE):
+        for entity in candidates:
             if entity.isVisible() and entity.isTouching(position):
 
                 currentTiebreaker = entity.drawOrderTiebreaker()
@@ -123,9 +259,43 @@ class EntityManager:
                     closest = entity
             return closest
     
-    def drawEntities(self, interactor, screen: pygame.Surface, mousePosition: tuple, dimensions: Dimensions):
-        for entity in traverseEntities(self, TraversalOrder.DRAW):
+    # Draw everything that needs to be redrawn this tick.
+    # Returns the screen areas that were updated, or None if the whole screen was redrawn
+    def drawEntities(self, interactor, screen: pygame.Surface, mousePosition: tuple, dimensions: Dimensions) -> list[pygame.Rect] | None:
+
+        # tooltips follow the mouse, so the area they cover is not tracked
+        hovered = interactor.hoveredEntity
+        isTooltipShown = isinstance(hovered, TooltipOwner) and hovered.isVisible() and hovered.getTooltip() is not None
+
+        if self._redrawScreenThisTick or isTooltipShown:
+            self._drawEntitiesInArea(interactor, screen, None)
+
+            # draw the tooltip on top of the entities
+            if isTooltipShown:
+                hovered.drawTooltip(screen, mousePosition, dimensions)
+            return None
+        
+        # Redraw each damaged area into the back buffer and copy only that area to the screen.
+        # Not using set_clip() on the screen, because pygame rasterizes clipped lines differently
+        if self._backBuffer is None or self._backBuffer.get_size() != screen.get_size():
+            self._backBuffer = screen.copy()
+
+        areas = self._mergeRects(self._damagedRects)
+        for area in areas:
+            self._drawEntitiesInArea(interactor, self._backBuffer, area)
+            screen.blit(self._backBuffer, area, area)
+        return areas
+    
+    # Draw entities in draw order. If area is given, skip entities whose draw bounds are outside it
+    def _drawEntitiesInArea(self, interactor, screen: pygame.Surface, area: pygame.Rect | None):
+        for entity in self.getTraversal(TraversalOrder.DRAW):
             if entity.isVisible():
+
+                if area is not None:
+                    bounds = entity.defineDrawBounds()
+                    if bounds is not None and not area.colliderect(bounds):
+                        continue
+
                 selected = entity in interactor.selected.entities
                 hovering = entity is interactor.hoveredEntity and (selected or not (interactor.leftDragging or interactor.rightDragging))
 
@@ -135,36 +305,102 @@ class EntityManager:
                 entity.draw(screen, selected, hovering)
                 #entity.drawRect(screen)
 
-        # draw tooltips on top of the entities
-        for entity in self.entities:
-            if isinstance(entity, TooltipOwner) and entity.isVisible() and entity is interactor.hoveredEntity:
-                entity.drawTooltip(screen, mousePosition, dimensions)
+    # combine overlapping rects, so that no area is drawn twice
+    def _mergeRects(self, rects: list[pygame.Rect]) -> list[pygame.Rect]:
+        merged: list[pygame.Rect] = []
+        for rect in rects:
+            i = rect.collidelist(merged)
+            while i != -1:
+                rect = rect.union(merged.pop(i))
+                i = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
+
+    # tick the entity from next tick on, until its tick listener is no longer active
+    def activateTick(self, entity: Entity):
+        if entity.tick is not None and entity in self.entities and entity not in self.pollingTickEntities:
+            self.activeTickEntities[entity] = None
+
+    # Whether the entity is in the entity tree, ie. not inside a row that a virtualized
+    # ScrollingContainer dematerialized. Detached entities stay registered, but are not ticked
+    # and get no key or click callbacks. Pass the same attached dict to check many entities at once
+    def isAttached(self, entity: Entity, attached: dict[Entity, bool] = None) -> bool:
+
+        if attached is None:
+            attached = {}
+
+        path = []
+        result = True
+        while entity._parent is not None and entity not in attached:
+            path.append(entity)
+            if not entity._parent.isChildAttached(entity):
+                result = False
+                break
+            entity = entity._parent
+        else:
+            result = attached.get(entity, True)
+
+        for e in path:
+            attached[e] = result
+        return result
+
+    # whether some entity has work to do next tick. If not, the window can sleep until an event
+    def hasActiveTicks(self) -> bool:
+        return len(self.activeTickEntities) > 0
 
     """
-    Tick callbacks are invoked on a recursive manner. onTickStart() callbacks
-    are invoked on the parent entities before children, while onTickEnd() callbacks
-    are invoked on the children before the parent.
+    Only polling entities and active entities are ticked, instead of the whole tree.
+    onTickStart() callbacks are invoked on the parent entities before children, while
+    onTickEnd() callbacks are invoked on the children before the parent.
+    Active entities that are no longer active after the tick, or cannot be ticked
+    because they are invisible, are removed until activated again.
     """
     def tick(self):
-        self._tick(self.rootContainer)
 
-    def _tick(self, entity: Entity):
+        # step every animating MotionProfile at once. Their owners' tick() then only applies the new value
+        MotionProfileStore.getInstance().step()
 
-        tickable = (entity.tick is not None) and (entity.isVisible() or entity.recomputeWhenInvisible)
+        if len(self.activeTickEntities) == 0 and len(self.pollingTickEntities) == 0:
+            return
 
-        if tickable:
-            entity.tick.onTickStart()
-        
-        for child in entity._children:
-            self._tick(child)
+        depths = {entity: self._getDepth(entity) for entity in [*self.pollingTickEntities, *self.activeTickEntities]}
+        ordered = sorted(depths, key = depths.get)
+        attached = {}
+        tickable = [entity for entity in ordered if (entity.isVisible() or entity.recomputeWhenInvisible) and self.isAttached(entity, attached)]
+
+        # callbacks may delete entities
+        for entity in tickable:
+            if entity in self.entities:
+                entity.tick.onTickStart()
+
+        for entity in reversed(tickable):
+            if entity in self.entities:
+                entity.tick.onTickEnd()
+
+        tickableSet = set(tickable)
+        for entity in ordered:
+            if entity in self.activeTickEntities and not (entity in tickableSet and entity.tick.isActive()):
+                del self.activeTickEntities[entity]
+
+    def _getDepth(self, entity: Entity) -> int:
+        depth = 0
+        while entity._parent is not None:
+            entity = entity._parent
+            depth += 1
+        return depth
 
-        if tickable:
-            entity.tick.onTickEnd()
+    # recompute every entity marked dirty since the last layout pass
+    def runLayoutPass(self):
+        self.layout.runLayoutPass()
 
     def onKeyDown(self, key):
-        for entity in self.keyEntities:
-            entity.key.onKeyDown(key)
+        attached = {}
+        for entity in list(self.keyEntities): # handlers may add or remove entities
+            if entity in self.keyEntities and self.isAttached(entity, attached):
+                entity.key.onKeyDown(key)
 
     def onKeyUp(self, key):
-        for entity in self.keyEntities:
-            entity.key.onKeyUp(key)
\ No newline at end of file
+        attached = {}
+        for entity in list(self.keyEntities): # handlers may add or remove entities
+            if entity in self.keyEntities and self.isAttached(entity, attached):
+                entity.key.onKeyUp(key)
\ No newline at end of file
@@ -10,6 +10,8 @@ import entity_base.entity as entity
 """
 Handles postfix or prefix traversal of entities
 Useful for determining mouse interaction or drawing order
+EntityManager.getTraversal() caches the flattened result, so sorting only
+happens after the tree, a drawOrder, or a tiebreaker changes
 """
 
 class TraversalOrder(Enum):
@@ -43,5 +45,7 @@ def traverseEntities(manager: EntityManager, order: TraversalOrder) -> Iterator[
     yield from _traverseEntities(entity.ROOT_CONTAINER, order, ignoreOutside = (order == TraversalOrder.DRAW))
 
     if order == TraversalOrder.DRAW:
+        attached = {}
         for e in manager.outsideEntites:
-            yield from _traverseEntities(e, order, ignoreOutside = False)
\ No newline at end of file
+            if manager.isAttached(e, attached):
+                yield from _traverseEntities(e, order, ignoreOutside = False)
\ No newline at end of file
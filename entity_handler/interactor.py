@@ -136,8 +136,9 @@ class Interactor:
         if self.leftDragging or self.rightDragging:
             return
         
-        for entity in entities.entities:
-            if entity.click is not None:
+        attached = {}
+        for entity in list(entities.clickEntities): # handlers may add or remove entities
+            if entity in entities.clickEntities and entities.isAttached(entity, attached):
                 entity.click.onMouseDownAny(mouse)
 
         self.didMove = False
@@ -238,8 +239,9 @@ class Interactor:
 
     def onMouseUp(self, entities: EntityManager, mouse: tuple):
 
-        for entity in entities.entities:
-            if entity.click is not None:
+        attached = {}
+        for entity in list(entities.clickEntities): # handlers may add or remove entities
+            if entity in entities.clickEntities and entities.isAttached(entity, attached):
                 entity.click.onMouseUpAny(mouse)
 
         isRight = self.rightDragging
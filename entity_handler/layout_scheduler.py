@@ -0,0 +1,117 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from entity_base.entity import Entity
+    from entity_handler.entity_manager import EntityManager
+
+"""
+Coalesces the recomputes requested through Entity.recomputeEntity().
+
+The entity a recompute is requested for is not recomputed directly. Instead, its layout
+boundary is, from Entity.findLayoutBoundary(): the closest entity going up the tree whose
+size stays the same, or that does not update its parent. So a change that keeps an entity's
+size only recomputes that entity's subtree, instead of everything up to the independent ancestor.
+
+While deferred, a recompute only marks the entity as dirty. runLayoutPass() then finds the
+boundary of each dirty entity, and recomputes each boundary once, ancestors first. Boundaries
+whose ancestor was already recomputed in the same pass are skipped, since that recomputed them too.
+Recomputes requested during the pass are run in another pass right after.
+
+Window.run() defers recomputes once the window is set up, and runs a layout pass every
+frame before drawing. Until then, recomputes run immediately, so setup code can read
+positions right after requesting them.
+"""
+
+class LayoutScheduler:
+
+    # passes in a single runLayoutPass(), in case recomputing keeps requesting recomputes
+    MAX_PASSES = 10
+
+    def __init__(self, entities: EntityManager):
+
+        self.entities = entities
+        self._deferred = False
+
+        # insertion-ordered dict used as an ordered set. Values are unused
+        self._dirty: dict[Entity, None] = {}
+
+        # number of recomputes requested while deferred, and how many were actually run
+        self.requested = 0
+        self.performed = 0
+
+    def setDeferred(self, deferred: bool):
+        self._deferred = deferred
+        if not deferred:
+            self.runLayoutPass()
+
+    def isDeferred(self) -> bool:
+        return self._deferred
+
+    def requestRecompute(self, entity: Entity):
+
+        if not self._deferred:
+            self.recompute(entity.findLayoutBoundary())
+            return
+
+        self.requested += 1
+        self._dirty[entity] = None
+
+    def hasPendingRecomputes(self) -> bool:
+        return len(self._dirty) > 0
+
+    # recompute the entity and its subtree now,
+    # redrawing wherever the recomputed entities were drawn before and after
+    def recompute(self, entity: Entity):
+        oldBounds = self.entities.getSubtreeDrawBounds(entity)
+        entity.recomputeEntity(False)
+        newBounds = self.entities.getSubtreeDrawBounds(entity)
+        self.entities.redrawRects([oldBounds, newBounds])
+
+    def runLayoutPass(self):
+
+        for i in range(self.MAX_PASSES):
+
+            if len(self._dirty) == 0:
+                return
+
+            dirty = self._dirty
+            self._dirty = {}
+
+            # find every boundary before recomputing any, since recomputing changes the sizes
+            # that the boundaries are found from. Skip entities deleted since they were marked dirty
+            boundaries = {entity.findLayoutBoundary(): None for entity in dirty if entity in self.entities.entities}
+
+            # ancestors before descendants
+            roots = sorted(boundaries, key = self._getDepth)
+            recomputed: set[Entity] = set()
+            for entity in roots:
+
+                if self._hasAncestorIn(entity, recomputed):
+                    continue
+
+                self.recompute(entity)
+                self.performed += 1
+                recomputed.add(entity)
+
+    # number of recomputes that were coalesced into others or were not needed
+    def getAvoidedCount(self) -> int:
+        return self.requested - self.performed
+
+    def resetCounters(self):
+        self.requested = 0
+        self.performed = 0
+
+    def _getDepth(self, entity: Entity) -> int:
+        depth = 0
+        while entity._parent is not None:
+            entity = entity._parent
+            depth += 1
+        return depth
+
+    def _hasAncestorIn(self, entity: Entity, entities: set[Entity]) -> bool:
+        entity = entity._parent
+        while entity is not None:
+            if entity in entities:
+                return True
+            entity = entity._parent
+        return False
@@ -0,0 +1,66 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from entity_base.entity import Entity
+
+import math
+
+"""
+A uniform grid over the screen. Each cell stores the entities whose hitbox overlaps it,
+so that finding the entity under the mouse only needs to test entities in a single cell.
+Entities with an unbounded hitbox are returned by every query.
+"""
+
+# returned by Entity.defineHitbox() when the entity must always be tested for isTouching()
+UNBOUNDED_HITBOX = "unbounded"
+
+class SpatialIndex:
+
+    def __init__(self, cellSize: int = 64):
+
+        self.cellSize = cellSize
+
+        self._cells: dict[tuple[int, int], set[Entity]] = {}
+        self._entityCells: dict[Entity, list[tuple[int, int]]] = {}
+        self._unbounded: set[Entity] = set()
+
+    # replace the stored hitbox [x, y, width, height] of an entity.
+    # Cells are clamped to the screen, since the mouse can never be outside of it
+    def update(self, entity: Entity, hitbox: list | str | None, screenWidth: float, screenHeight: float):
+
+        self.remove(entity)
+
+        if hitbox is None:
+            return
+
+        if hitbox == UNBOUNDED_HITBOX:
+            self._unbounded.add(entity)
+            return
+
+        x, y, width, height = hitbox
+        x1 = max(0, math.floor(x / self.cellSize))
+        y1 = max(0, math.floor(y / self.cellSize))
+        x2 = min(math.floor((x + width) / self.cellSize), math.floor(screenWidth / self.cellSize))
+        y2 = min(math.floor((y + height) / self.cellSize), math.floor(screenHeight / self.cellSize))
+
+        cells = [(cx, cy) for cx in range(x1, x2 + 1) for cy in range(y1, y2 + 1)]
+        for cell in cells:
+            if cell not in self._cells:
+                self._cells[cell] = set()
+            self._cells[cell].add(entity)
+
+        self._entityCells[entity] = cells
+
+    def remove(self, entity: Entity):
+
+        self._unbounded.discard(entity)
+
+        for cell in self._entityCells.pop(entity, []):
+            self._cells[cell].discard(entity)
+            if len(self._cells[cell]) == 0:
+                del self._cells[cell]
+
+    # return all entities that could be touching the position, in no particular order
+    def query(self, position: tuple) -> set[Entity]:
+        cell = (math.floor(position[0] / self.cellSize), math.floor(position[1] / self.cellSize))
+        return self._cells.get(cell, set()) | self._unbounded
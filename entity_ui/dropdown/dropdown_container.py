@@ -78,7 +78,7 @@ class DropdownContainer(Container, Observable):
         self.name = name
         
         super().__init__(parent,
-                         tick = TickLambda(self, FonTickStart = self.onTick),
+                         tick = TickLambda(self, FonTickStart = self.onTick, FisActive = self.isTickActive),
                          click = ClickLambda(self, FOnMouseDownAny = self.onMouseDown),
                          drawOrder = DrawOrder.DROPDOWN
                          )
@@ -199,6 +199,7 @@ class DropdownContainer(Container, Observable):
         self.widthProfile.setEndValue(self.getFullWidth())
         self.heightProfile.setEndValue(self.getFullHeight())
         self.borderProfile.setEndValue(1 if self.expanded else 0)
+        self.activateTick()
 
         if force:
             self.widthProfile.forceToEndValue()
@@ -220,6 +221,14 @@ class DropdownContainer(Container, Observable):
     def isFullyCollapsed(self) -> bool:
         return self.heightProfile.isDone() and not self.expanded
 
+    # whether onTick() has anything to do next tick. While expanded, the surface
+    # is redrawn every tick. Hovering an option also activates the tick, see DropdownOptionEntity
+    def isTickActive(self) -> bool:
+        if self.heightProfile is None:
+            return False
+        return self.expanded or self.stillVisibleWhileCollapsing or not self.heightProfile.isDone() \
+            or not self.widthProfile.isDone() or not self.borderProfile.isDone()
+
     def onTick(self):
         
         if self.heightProfile is None:
@@ -308,6 +317,10 @@ class DropdownContainer(Container, Observable):
         self.updateProfiles()
     
     
+    # the border is drawn just outside the rect
+    def defineDrawBounds(self) -> list:
+        return [self.LEFT_X - 2, self.TOP_Y - 2, self.WIDTH + 4, self.HEIGHT + 4]
+
     def draw(self, screen, a, b):
 
         if self.surface is None:
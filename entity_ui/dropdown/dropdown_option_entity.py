@@ -40,8 +40,10 @@ class DropdownOptionEntity(Entity):
 
         super().__init__(parent = dropdownContainer,
             click = ClickLambda(self, FonLeftClick = lambda mouse, i=i, t=t: dropdownContainer.onOptionClick(i, t())),
-            hover = HoverLambda(self)
-            )
+            hover = HoverLambda(self,
+                FonHoverOn = dropdownContainer.activateTick,
+                FonHoverOff = dropdownContainer.activateTick
+            ))
         self.dropdownContainer = dropdownContainer
         self.i = i
         
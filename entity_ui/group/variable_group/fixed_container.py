@@ -10,7 +10,9 @@ from entity_base.container_entity import Container
 from abc import ABC, abstractmethod
 
 """
-A container with fixed dimensions positioned relatively according to VGC
+A container with fixed dimensions positioned relatively according to VGC.
+Like VariableContainer, it reads its position from VariableGroupContainer.getContainerPosition().
+It is never dematerialized, since it has no child to detach
 """
 class FixedContainer(Container, ABC):
 
@@ -21,19 +23,26 @@ class FixedContainer(Container, ABC):
 
         super().__init__(parent = parent)
 
-    # set by VariableGroupContainer. Size refers to x if isHorizontal, else y
-    def setPosition(self, position: int):
-        self._POSITION_FROM_VGC = position
+    def isMaterialized(self) -> bool:
+        return True
+
+    def setMaterialized(self, materialized: bool):
+        return
+
+    # queried from VariableGroupContainer. Position refers to x if isHorizontal, else y
+    def _updatePosition(self) -> float:
+        self._POSITION_FROM_VGC = self._parent.getContainerPosition(self)
+        return self._POSITION_FROM_VGC
 
     def defineLeftX(self) -> float:
         if self.isHorizontal:
-            return self._POSITION_FROM_VGC
+            return self._updatePosition()
         else:
             return self._px(0)
 
     def defineTopY(self) -> float:
         if not self.isHorizontal:
-            return self._POSITION_FROM_VGC
+            return self._updatePosition()
         else:
             return self._py(0)
         
@@ -16,8 +16,12 @@ width/height to determine this object's absolute position.
 
 To use AbstractVariableContainer, create a AVC as part of a VGC, and set
 AVC as parent of your entity. Make sure to set AVC's child as yourself.
-Then, call AVC.onChangeInContainerSize() whenever the size of your entity changes.
-This will cause the VGC to recompute the position
+Then, call recomputeEntity() on your entity whenever its size changes.
+This will cause the VGC to query the new size and recompute the positions
+
+Inside a virtualized ScrollingContainer, the VGC dematerializes containers far from the
+visible area by detaching the child from the entity tree. The child keeps its model and
+observers, and the height it had when it was detached is used until it is reattached
 """
 T = TypeVar('T')
 class VariableContainer(Container, ABC, Generic[T]):
@@ -26,6 +30,7 @@ class VariableContainer(Container, ABC, Generic[T]):
         self.isHorizontal = isHorizontal
         self.child: T | Entity = None
         self._POSITION_FROM_VGC = 0
+        self._DEMATERIALIZED_HEIGHT = 0
 
         super().__init__(parent = parent, thisUpdatesParent = True)
 
@@ -37,19 +42,43 @@ class VariableContainer(Container, ABC, Generic[T]):
         super().changeParent(newParent)
         self._parent = newParent
     
-    # set by VariableGroupContainer. Size refers to x if isHorizontal, else y
-    def setPosition(self, position: int):
-        self._POSITION_FROM_VGC = position
+    # whether the child is attached to the entity tree.
+    # The child may be reattached by changeParent(), so this is not stored separately
+    def isMaterialized(self) -> bool:
+        return self.child is None or self.child in self._children
+
+    def isChildAttached(self, child: Entity) -> bool:
+        return child is not self.child or self.isMaterialized()
+
+    # set by VariableGroupContainer when the container enters or leaves the materialized range
+    def setMaterialized(self, materialized: bool):
+
+        if self.child is None or materialized == self.isMaterialized():
+            return
+        
+        if materialized:
+            self._children.append(self.child)
+        else:
+            self._DEMATERIALIZED_HEIGHT = self.child.defineHeight()
+            self.entities.redrawRects([self.entities.getSubtreeDrawBounds(self.child)])
+            self._children.remove(self.child)
+
+        self.entities.invalidateTraversalOrder()
+
+    # queried from VariableGroupContainer. Position refers to x if isHorizontal, else y
+    def _updatePosition(self) -> float:
+        self._POSITION_FROM_VGC = self._parent.getContainerPosition(self)
+        return self._POSITION_FROM_VGC
 
     def defineLeftX(self) -> float:
         if self.isHorizontal:
-            return self._POSITION_FROM_VGC
+            return self._updatePosition()
         else:
             return self._px(0)
 
     def defineTopY(self) -> float:
         if not self.isHorizontal:
-            return self._POSITION_FROM_VGC
+            return self._updatePosition()
         else:
             return self._py(0)
         
@@ -66,6 +95,8 @@ class VariableContainer(Container, ABC, Generic[T]):
         if not self.isHorizontal:
             if self.child is None:
                 return 0
+            elif not self.isMaterialized():
+                return self._DEMATERIALIZED_HEIGHT
             else:
                 return self.child.defineHeight()
         else:
@@ -1,14 +1,17 @@
 from typing import Callable, Generic, TypeVar
+from data_structures.fenwick_tree import FenwickTree
 from data_structures.linked_list import LinkedList
 from data_structures.observer import Observable
 from entity_base.container_entity import Container
 from entity_base.entity import Entity
 from entity_base.listeners.tick_listener import TickLambda
 from entity_ui.group.variable_group.variable_container import VariableContainer
+from entity_ui.scrollbar.scrolling_container import ScrollingContainer
 
 
 """
-Stores a linked list of VariableContainers, which are containers that have their own
+Stores a linked list of VariableContainers (or FixedContainers, which follow the same
+protocol with a fixed size and are never dematerialized), which are containers that have their own
 variable width/height. The VariableGroupContainer should expand and contract to fit the
 VariableContainers, and handles the absolute positioning of the VariableContainers
 based on their width and height, and their order.
@@ -26,10 +29,20 @@ If not isHorizontal:
 
 Calling recomputePosition() on this class does the following things in this order:
 1. Get the left x (for horizontal) or top y (for vertical) of parent to define VGC position
-2. In defineBefore(), update VariableContainer positions through container.setPosition()
-3. Update width/height of VGC
-3. Call recomputePosition() on all VariableContainers as specified in Entity class
+2. Update width/height of VGC from the cached VariableContainer sizes
+3. In defineAfter(), materialize the VariableContainers in range (see below)
+4. Call recomputePosition() on all VariableContainers as specified in Entity class,
+   which read their positions through getContainerPosition()
 It is an expensive operation. Attempt not to call this more than once per tick.
+
+The sizes of the VariableContainers are cached in a FenwickTree, so the position of a
+container and the container at some position are found in O(log n). A size is only
+queried again when a recompute is requested from inside that container, which calls
+onChildLayoutChanged(). All sizes are queried again when the containers are added,
+removed or reordered, or when the screen size or the visibility of the VGC changes.
+
+A vertical VGC inside a virtualized ScrollingContainer also materializes only the
+VariableContainers that overlap the ScrollingContainer's materialized range in step 3
 """
 T = TypeVar('T')
 class VariableGroupContainer(Container, Generic[T], Observable):
@@ -43,6 +56,18 @@ class VariableGroupContainer(Container, Generic[T], Observable):
         self.innerMargin = innerMargin
         self.outerMargin = outerMargin
 
+        # size of each VariableContainer plus the inner margin after it, in the order of _children
+        self._sizes = FenwickTree()
+        self._order: list[VariableContainer] = []
+        self._indices: dict[VariableContainer, int] = {}
+        self._dirty: set[VariableContainer] = set()
+
+        # sizes are all queried again when this changes. See _getLayoutKey()
+        self._layoutKey = None
+
+        # containers whose child is attached to the entity tree
+        self._materialized: set[VariableContainer] = set()
+
         super().__init__(parent = parent)
 
     def _getMargin(self, margin):
@@ -53,46 +78,123 @@ class VariableGroupContainer(Container, Generic[T], Observable):
             self.entities.removeEntity(vc)
         self._children.clear()
 
-    # Return the size of the VGC while setting the positions of the children
-    def getSize(self) -> float:
+    # a recompute was requested from inside the container, so its size may have changed
+    def onChildLayoutChanged(self, child: Entity):
+        self._dirty.add(child)
 
+    def _getContainerSize(self, vc: VariableContainer) -> float:
+        return vc.defineWidth() if self.isHorizontal else vc.defineHeight()
+    
+    # everything other than the containers themselves that their sizes depend on
+    def _getLayoutKey(self) -> tuple:
+        return self.dimensions.X_RATIO, self.dimensions.Y_RATIO, self.isVisible()
+
+    # bring the cached sizes up to date. Comparing the order with _children is a single
+    # pass in C, and catches children added, removed or reordered anywhere
+    def _updateSizes(self):
+
+        layoutKey = self._getLayoutKey()
+        if self._order != self._children or layoutKey != self._layoutKey:
+            self._layoutKey = layoutKey
+            self._rebuildSizes()
+            return
+        
+        if len(self._dirty) == 0:
+            return
+        
         inner = self._getMargin(self.innerMargin)
-        outer = self._getMargin(self.outerMargin)
+        for vc in self._dirty:
+            index = self._indices.get(vc)
+            if index is not None:
+                self._sizes.set(index, self._getContainerSize(vc) + inner)
+        self._dirty.clear()
 
-        # add upper outer margin
-        size = outer
-
-        for vc in self._children:
-            vc: VariableContainer = vc
-            
-            # use container size to find position of next container
-            size += vc.defineWidth() if self.isHorizontal else vc.defineHeight()
-            size += inner
-
-        size += outer
-        return size
-    
-    # Return the size of the VGC while setting the positions of the children
-    def updateContainerPositions(self) -> float:
+    def _rebuildSizes(self):
 
         inner = self._getMargin(self.innerMargin)
-        outer = self._getMargin(self.outerMargin)
 
+        self._order = list(self._children)
+        self._indices = {vc: i for i, vc in enumerate(self._order)}
+        self._sizes.build([self._getContainerSize(vc) + inner for vc in self._order])
+        self._dirty.clear()
+
+        self._materialized = {vc for vc in self._order if vc.isMaterialized()}
+
+    # Return the size of the VGC
+    def getSize(self) -> float:
+
+        self._updateSizes()
+
+        # upper and lower outer margins, with the inner margin after each container
+        return self._sizes.total() + 2 * self._getMargin(self.outerMargin)
+    
+    def _getStartPosition(self) -> float:
         startPos = self._px(0) if self.isHorizontal else self._py(0)
+        return startPos + self._getMargin(self.outerMargin)
+    
+    # absolute x (for horizontal) or y (for vertical) of the container, in O(log n)
+    def getContainerPosition(self, vc: VariableContainer) -> float:
 
-        # add upper outer margin
-        pos = startPos + outer
+        if vc not in self._indices:
+            self._updateSizes()
 
-        for vc in self._children:
-            vc: VariableContainer = vc
+        return self._getStartPosition() + self._sizes.prefixSum(self._indices[vc])
+    
+    # index of the container at the absolute x (for horizontal) or y (for vertical) in O(log n),
+    # counting the inner margin after a container as part of it. Clamped to the first and last container
+    def getContainerIndexAtPosition(self, position: float) -> int:
+        index = self._sizes.search(position - self._getStartPosition())
+        return max(0, min(index, len(self._order) - 1))
+    
+    # the container at the absolute x (for horizontal) or y (for vertical), or None if there is none there
+    def getContainerAtPosition(self, position: float) -> VariableContainer | None:
+        offset = position - self._getStartPosition()
+        if len(self._order) == 0 or offset < 0 or offset >= self._sizes.total():
+            return None
+        return self._order[self._sizes.search(offset)]
+    
+    # the range of the closest ScrollingContainer ancestor, if vertical and it is virtualized
+    def _getMaterializedRange(self) -> tuple[float, float] | None:
+
+        if self.isHorizontal:
+            return None
+        
+        ancestor = self._parent
+        while ancestor is not None:
+            if isinstance(ancestor, ScrollingContainer):
+                return ancestor.getMaterializedRange()
+            ancestor = ancestor._parent
+        return None
+    
+    # Attach the children of the containers overlapping the materialized range and detach the rest.
+    # Only the containers in range and the ones that were materialized before are visited
+    def updateMaterializedContainers(self):
+
+        self._updateSizes()
+
+        materializedRange = self._getMaterializedRange()
+        if materializedRange is None:
+            materialized = set(self._order) if len(self._materialized) < len(self._order) else self._materialized
+        elif len(self._order) == 0:
+            materialized = set()
+        else:
+            first = self.getContainerIndexAtPosition(materializedRange[0])
+            last = self.getContainerIndexAtPosition(materializedRange[1])
+            materialized = set(self._order[first : last + 1])
+
+        if materialized is self._materialized:
+            return
+
+        inner = self._getMargin(self.innerMargin)
+        for vc in self._materialized - materialized:
+            vc.setMaterialized(False)
+        for vc in materialized - self._materialized:
+            vc.setMaterialized(True)
 
-            # set the position of the container
-            vc.setPosition(pos)
-            
-            # use container size to find position of next container
-            pos += vc.defineWidth() if self.isHorizontal else vc.defineHeight()
-            pos += inner
+            # the child may have changed size while detached
+            self._sizes.set(self._indices[vc], self._getContainerSize(vc) + inner)
 
+        self._materialized = materialized
 
     def defineLeftX(self) -> float:
         if self.isHorizontal:
@@ -127,4 +229,4 @@ class VariableGroupContainer(Container, Generic[T], Observable):
             return self._pheight(1)
         
     def defineAfter(self) -> None:
-        self.updateContainerPositions()
\ No newline at end of file
+        self.updateMaterializedContainers()
@@ -15,6 +15,13 @@ Behind the scenes, a ScrollingContainer contains a
 
 Thus, to use this feature for some content, create some container,
 and pass in scrollingContainer.getContainer() as parent
+
+If virtualized, vertical VariableGroupContainers inside the content only keep the
+entities of rows near the visible area in the entity tree. Rows further than OVERSCAN
+above or below are detached: they stay registered in the EntityManager, but are not
+recomputed, drawn or hovered, and EntityManager.isAttached() is False for them, so they
+are not ticked and get no key or click callbacks. Their last height stands in for them
+until they are scrolled back into view
 """
 
 from entity_base.container_entity import Container
@@ -26,7 +33,10 @@ from entity_ui.scrollbar.scrollbar_container import ScrollbarContainer
 
 class ScrollingContainer(Container):
     
-    def __init__(self, parent: Entity):
+    # rows within this many relative pixels outside the visible area stay materialized
+    OVERSCAN = 150
+
+    def __init__(self, parent: Entity, virtualized: bool = False):
 
         super().__init__(parent,
             mousewheel = MousewheelLambda(self, FonMousewheel = self.onMousewheel)  
@@ -34,6 +44,7 @@ class ScrollingContainer(Container):
 
         self.SCROLLBAR_WIDTH = 13 # in relative pixels
         self.yOffset = 0 # in relative pixels, 0 means from the top
+        self.virtualized = virtualized
 
         self.movingContainer = MovingScrollingContainer(self)
         self.scrollbarContainer = ScrollbarContainer(self)
@@ -52,6 +63,14 @@ class ScrollingContainer(Container):
     def getContentHeight(self) -> float:
         return self.content.defineHeight()
     
+    # the absolute (top, bottom) y range in which rows should be materialized,
+    # or None if every row should be
+    def getMaterializedRange(self) -> tuple[float, float] | None:
+        if not self.virtualized:
+            return None
+        overscan = self._aheight(self.OVERSCAN)
+        return self.TOP_Y - overscan, self.BOTTOM_Y + overscan
+
     def setYOffset(self, newYOffset):
         self.yOffset = newYOffset
         self.recomputeEntity()
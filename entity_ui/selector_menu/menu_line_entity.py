@@ -30,6 +30,13 @@ class MenuLineEntity(Entity):
 
     def isTouching(self, mouse: tuple) -> float:
         return False
+    
+    def defineHitbox(self) -> None:
+        return None
+    
+    # the line extends from the menu to the selected entity, outside of this rect
+    def defineDrawBounds(self) -> None:
+        return None
 
     # Draws the background of the menu
     def draw(self, screen: pygame.Surface, isActive: bool, isHovered: bool):
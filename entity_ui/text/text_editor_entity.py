@@ -9,6 +9,7 @@ from entity_ui.text.text_border import TextBorder
 from entity_base.listeners.click_listener import ClickLambda
 from entity_base.listeners.key_listener import KeyLambda
 from entity_base.listeners.select_listener import SelectLambda, SelectorType
+from entity_base.listeners.tick_listener import TickLambda
 
 from common.font_manager import DynamicFont, FontID
 from utility.math_functions import isInsideBox2
@@ -31,10 +32,17 @@ class CursorBlink:
         self.numOn = numOn
         self.numOff = numOff
 
-    def get(self) -> bool:
+    def reset(self):
+        self.i = 0
+
+    # advance one tick. returns whether the cursor toggled between on and off
+    def tick(self) -> bool:
+        before = self.get()
         self.i += 1
         self.i %= self.numOn + self.numOff
+        return self.get() != before
 
+    def get(self) -> bool:
         return self.i < self.numOn
 
 # propagates change whenever resized from text (isDynamic)
@@ -68,7 +76,8 @@ class TextEditorEntity(Entity, Observer, Observable):
                 FonSelect = self.onSelect,
                 FonDeselect = self.onDeselect
             ),
-            hover = HoverLambda(self))
+            hover = HoverLambda(self),
+            tick = TickLambda(self, FonTickStart = self.onTick, FisActive = lambda: self.mode == TextEditorMode.WRITE))
         self.font = self.fonts.getDynamicFont(fontID, fontSize)
         
         self.dynamic = isDynamic # whether to grow vertically
@@ -192,6 +201,11 @@ class TextEditorEntity(Entity, Observer, Observable):
 
         screen.blit(surf, (leftX, topY))
 
+    # the cursor blinks independently of any other change, so only redraw the editor itself
+    def onTick(self):
+        if self.mode == TextEditorMode.WRITE and self.cursorBlink.tick():
+            self.redrawThisEntity()
+
     def onKeyDown(self, key):
 
         # only useful when in write mode
@@ -221,4 +235,5 @@ class TextEditorEntity(Entity, Observer, Observable):
 
     def setMode(self, mode: TextEditorMode):
         self.mode = mode
+        self.cursorBlink.reset()
         self.recomputeEntity()
\ No newline at end of file
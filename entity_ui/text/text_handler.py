@@ -2,6 +2,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 import pygame
+from utility.pygame_functions import getText
 
 
 if TYPE_CHECKING:
@@ -210,7 +211,7 @@ class TextHandler:
 
     def update(self):
         font = self.textEditor.font.get()
-        self.textSurfaces = [font.render(textLine, True, (0,0,0)) for textLine in self.text]
+        self.textSurfaces = [getText(font, textLine, (0,0,0)) for textLine in self.text]
         self.fullText = ""
         for textLine in self.text:
             self.fullText += textLine + "\n"
@@ -2,6 +2,7 @@
 from common.font_manager import DynamicFont
 from common.dimensions import Dimensions
 from data_structures.observer import Observer
+from utility.pygame_functions import getText
 import pygame
 from abc import ABC, abstractmethod
 
@@ -35,7 +36,7 @@ class Tooltip(Observer):
     def recalculateTooltipSurface(self):
 
         # generate temporary text surfaces for each line to figure out width and height of text
-        texts = [self.font.get().render(message, True, TEXT_COLOR) for message in self.messages]
+        texts = [getText(self.font.get(), message, TEXT_COLOR) for message in self.messages]
 
         OUTSIDE_MARGIN_VERTICAL = 3 # margin between text and tooltip surface
         OUTSIDE_MARGIN_HORIZONTAL = 6
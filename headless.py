@@ -0,0 +1,57 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from services.headless_service import HeadlessProject
+import argparse, glob, multiprocessing as mp, time
+
+"""
+Generates code for .pgpath projects without opening a window.
+Every project in the input directory is processed in parallel, and its code is written
+to a file of the same name in the output directory.
+Run from the repository root with: python headless.py saves generated --extension .cpp
+"""
+
+def generateProject(inputPath: str, outputPath: str) -> str | None:
+    try:
+        code = HeadlessProject.load(inputPath).generateCode()
+        with open(outputPath, "w") as f:
+            f.write(code)
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+    return None
+
+def main():
+
+    parser = argparse.ArgumentParser(description = "Generate code for every .pgpath project in a directory")
+    parser.add_argument("input", help = "directory containing .pgpath files")
+    parser.add_argument("output", help = "directory to write the generated code to")
+    parser.add_argument("--extension", default = ".txt", help = "extension of the generated code files")
+    parser.add_argument("--processes", type = int, default = None, help = "number of worker processes. Defaults to the number of CPUs")
+    args = parser.parse_args()
+
+    inputPaths = sorted(glob.glob(os.path.join(args.input, "*.pgpath")))
+    os.makedirs(args.output, exist_ok = True)
+
+    jobs = []
+    for inputPath in inputPaths:
+        name = os.path.splitext(os.path.basename(inputPath))[0]
+        jobs.append((inputPath, os.path.join(args.output, name + args.extension)))
+
+    start = time.perf_counter()
+    with mp.Pool(args.processes) as pool:
+        errors = pool.starmap(generateProject, jobs)
+
+    failed = 0
+    for (inputPath, outputPath), error in zip(jobs, errors):
+        if error is None:
+            print(f"{inputPath} -> {outputPath}")
+        else:
+            print(f"{inputPath} failed: {error}")
+            failed += 1
+
+    print(f"Generated {len(jobs) - failed}/{len(jobs)} projects in {time.perf_counter() - start:.2f}s")
+    if failed > 0:
+        exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -68,7 +68,7 @@ def main():
     database = CommandDefinitionDatabase()
 
     # create command model
-    scrollingContainer = ScrollingContainer(panelContainer)
+    scrollingContainer = ScrollingContainer(panelContainer, virtualized = True)
     projectModel.initCommandParentEntity(scrollingContainer.getContainer())
     projectModel.commandsModel.initParentUI(scrollingContainer.getContainer())
 
@@ -76,12 +76,12 @@ def main():
     print("compute everything")
     window.getRootContainer().recomputeEntity()
 
-    # create first path node
-    START_POSITION = (20,20)
-    projectModel.pathModel.initFirstNode(START_POSITION)
-
-    # make initial save
-    ProjectHistoryInterface.getInstance().save()
+    # restore the project and its undo history from the last run if possible.
+    # Otherwise, or if the journal could not be loaded, create the first path node and make the initial save
+    if not ProjectHistoryInterface.getInstance().recover():
+        START_POSITION = (20,20)
+        projectModel.pathModel.initFirstNode(START_POSITION)
+        ProjectHistoryInterface.getInstance().save()
 
     window.run()
 
@@ -9,7 +9,7 @@ from entity_base.entity import Entity
 from models.command_models.model_based_entity import ModelBasedEntity
 from entities.root_container.panel_container.command_block.command_inserter import CommandInserter
 from models.project_history_interface import ProjectHistoryInterface
-from serialization.serializable import Serializable, SerializedState
+from serialization.serializable import Serializable, SerializedState, newElementID
 
 
 if TYPE_CHECKING:
@@ -26,6 +26,9 @@ to regenerate the UI for its children through caching.
 
 class SerializedRecursiveState(SerializedState):
 
+    # None for states saved before models had IDs
+    elementID: int = None
+
     def __init__(self):
         self.children: list[SerializedRecursiveState] = []
         self.DESERIALIZED = None
@@ -36,6 +39,15 @@ class SerializedRecursiveState(SerializedState):
     def _deserialize(self) -> 'AbstractModel':
         raise NotImplementedError("Must implement this method")
 
+    # whether _update() can turn the existing model into this state. Otherwise, a new model is deserialized
+    def _canUpdate(self, model: 'AbstractModel') -> bool:
+        return False
+
+    # Modify the existing model in place to match this state, not including children.
+    # Returns whether the UI for the model itself must be regenerated
+    def _update(self, model: 'AbstractModel') -> bool:
+        raise NotImplementedError("Must implement this method")
+
     
     def makeNullAdapterDeserialized(self):
         self.makeChildrenAdapterDeserialized()
@@ -61,6 +73,7 @@ class AbstractModel(Serializable, Generic[T1, T2]):
     
     def serialize(self) -> SerializedRecursiveState:
         state = self._serialize()
+        state.elementID = self.elementID
         for child in self.children:
             state.addChild(child.serialize())
         self.SERIALIZED = state
@@ -69,6 +82,8 @@ class AbstractModel(Serializable, Generic[T1, T2]):
     @staticmethod
     def deserialize(state: SerializedRecursiveState) -> 'AbstractModel':
         model = state._deserialize()
+        if state.elementID is not None:
+            model.elementID = state.elementID
         for childState in state.children:
             childModel = AbstractModel.deserialize(childState)
             model.children.append(childModel)
@@ -76,6 +91,84 @@ class AbstractModel(Serializable, Generic[T1, T2]):
         state.DESERIALIZED = model
         return model
 
+    # Update this model and its descendants in place to match the state, which must describe
+    # this model. Descendants with the same element ID are kept along with their UI, so only
+    # the UI of models that changed is regenerated, and only changed child lists are relinked
+    def reconcile(self, state: SerializedRecursiveState):
+
+        existing: dict[int, AbstractModel] = {}
+        stack = list(self.children)
+        while len(stack) > 0:
+            model = stack.pop()
+            existing[model.elementID] = model
+            stack.extend(model.children)
+
+        changed: set[AbstractModel] = set()
+        relinked: set[AbstractModel] = set()
+        if state._update(self):
+            changed.add(self)
+        state.DESERIALIZED = self
+        self._reconcileChildren(state, existing, changed, relinked)
+
+        # delete the UI of models not in the state. Deleting it also deletes the UI of their
+        # children, so any that were kept elsewhere need new UI
+        for model in existing.values():
+            if model.ui is not None:
+                model.ui.entities.removeEntity(model.ui)
+                model.ui = None
+            for child in model.children:
+                if child.elementID not in existing:
+                    changed.add(child)
+
+        self._rebuildReconciled(changed, relinked)
+
+    def _reconcileChildren(self, state: SerializedRecursiveState, existing: dict[int, AbstractModel],
+                           changed: set[AbstractModel], relinked: set[AbstractModel]):
+
+        shownBefore = [child for child in self.children if child.show]
+
+        children: list[AbstractModel] = []
+        for childState in state.children:
+
+            child = existing.get(childState.elementID)
+            if child is not None and childState._canUpdate(child):
+                del existing[child.elementID]
+
+                # detach while updating, so showing or hiding it does not relink the old parent
+                child.parent = None
+                if childState._update(child):
+                    changed.add(child)
+            else:
+                child = childState._deserialize()
+                if childState.elementID is not None:
+                    child.elementID = childState.elementID
+
+            child._reconcileChildren(childState, existing, changed, relinked)
+            child.parent = self
+            childState.DESERIALIZED = child
+            children.append(child)
+
+        # only shown children are linked. New models have no UI yet, so rebuilding them links their children anyways
+        if self.ui is not None and [child for child in children if child.show] != shownBefore:
+            relinked.add(self)
+        self.children = children
+
+    def _rebuildReconciled(self, changed: set[AbstractModel], relinked: set[AbstractModel]):
+
+        if self in changed:
+            if self.parent is None or self.show:
+                self.rebuild()
+            else:
+                # hidden, so the UI is only generated once it is shown again
+                self.ui.entities.removeEntity(self.ui)
+                self.ui = None
+        elif self in relinked:
+            self.rebuildChildren()
+
+        for child in self.children:
+            if child.ui is not None:
+                child._rebuildReconciled(changed, relinked)
+
     def __init__(self):
 
         super().__init__()
@@ -86,14 +179,18 @@ class AbstractModel(Serializable, Generic[T1, T2]):
         self.ui = None
         self.show = True
 
+        # the same for every serialized state of this model, so undo can find it again
+        self.elementID = newElementID()
+
+    # the parent has no UI if the model was loaded headless
     def showUI(self):
         self.show = True
-        if self.parent is not None:
+        if self.parent is not None and self.parent.ui is not None:
             self.parent.rebuildChildren()
 
     def hideUI(self):
         self.show = False
-        if self.parent is not None:
+        if self.parent is not None and self.parent.ui is not None:
             self.parent.rebuildChildren()
 
     def resetUIToNone(self):
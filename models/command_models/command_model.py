@@ -9,7 +9,7 @@ from command_creation.command_definition_database import CommandDefinitionDataba
 
     
 from entity_base.entity import Entity
-from adapter.path_adapter import PathAdapter
+from adapter.path_adapter import AdapterState, PathAdapter
 from models.command_models.model_based_entity import ModelBasedEntity
 from command_creation.command_definition import CommandDefinition
 from entities.root_container.panel_container.command_block.custom_command_block_entity import CustomCommandBlockEntity
@@ -17,12 +17,13 @@ from entities.root_container.panel_container.command_block.custom_command_block_
 
 from entities.root_container.panel_container.command_block.parameter_state import ParameterState
 from serialization.serializable import SerializedState
+from services.code_generation_service import CodeGenerationService, CompiledTemplate
 
 class SerializedCommandState(SerializedRecursiveState):
 
     def __init__(self,
                  uiState: 'SharedCommandUIState',
-                 adapter: PathAdapter,
+                 adapter: PathAdapter | AdapterState,
                  templateText: str,
                  paramHashmap: dict[str, Any],
                  definitionID: str,
@@ -30,7 +31,7 @@ class SerializedCommandState(SerializedRecursiveState):
     ):
         super().__init__()
         self.uiState = uiState
-        self.adapter = adapter.serialize()
+        self.adapter = adapter if isinstance(adapter, AdapterState) else adapter.serialize()
         self.templateText = templateText
         self.paramHashmap = paramHashmap.copy()
         self.definitionID = definitionID
@@ -43,7 +44,42 @@ class SerializedCommandState(SerializedRecursiveState):
         model.parameters.hashmap = self.paramHashmap
         model._definitionID = self.definitionID
         model.waitState = self.waitState
+
+        # hidden if its node was deserialized with the turn disabled
+        if model.adapter.type == CommandType.TURN and model.adapter.turnEnabled is not None:
+            model.show = model.adapter.turnEnabled
         return model
+
+    def _canUpdate(self, model: AbstractModel) -> bool:
+        return isinstance(model, CommandModel)
+
+    def _update(self, model: 'CommandModel') -> bool:
+
+        # custom commands have their own null adapters, so keep the existing one
+        if self.adapter.type == CommandType.CUSTOM and model.adapter.type == CommandType.CUSTOM:
+            adapter = model.adapter
+        else:
+            adapter = self.adapter.deserialize()
+
+        # the turn may have been enabled or disabled when its node was updated
+        if adapter.type == CommandType.TURN:
+            model.show = bool(adapter.turnEnabled)
+
+        changed = adapter is not model.adapter or model.uiState.expanded != self.uiState.expanded \
+            or model.templateText != self.templateText or model.parameters.hashmap != self.paramHashmap \
+            or model._definitionID != self.definitionID or model.waitState != self.waitState
+        if not changed:
+            return False
+
+        if adapter is not model.adapter:
+            model.setNewAdapter(adapter)
+        model.uiState = self.uiState
+        model.templateText = self.templateText
+        model.parameters.hashmap = self.paramHashmap
+        model._definitionID = self.definitionID
+        model.waitState = self.waitState
+        model.onCodeChange()
+        return True
     
     def makeNullAdapterDeserialized(self):
         if self.adapter.type == CommandType.CUSTOM:
@@ -97,6 +133,11 @@ class CommandModel(AbstractModel, Observer):
         # subscribe to changes in the database
         self.database.subscribe(self, onNotify = self.onCommandDefinitionChange)
 
+        # output of getGeneratedCode(), kept until the adapter values, parameters or template change.
+        # None if it must be regenerated
+        self._generatedCode: str = None
+        self._generatedFrom: CompiledTemplate = None
+
         self.adapter: PathAdapter = None
         self.setNewAdapter(pathAdapter)
 
@@ -107,13 +148,20 @@ class CommandModel(AbstractModel, Observer):
         # default state is to wait for completion
         self.waitState: WaitID = WaitID.WAIT
 
+        # compiled version of templateText, if templateText is set
+        self._compiledTemplate: CompiledTemplate = None
+
 
     def setNewAdapter(self, newAdapter: 'PathAdapter'):
 
         if self.adapter is not None:
             self.adapter.unsubscribeAll()
+            self.adapter.unsubscribe(self)
         
         self.adapter = newAdapter
+        self.adapter.subscribe(self, id = NotifyType.VALUE_CHANGED, onNotify = self.onCodeChange)
+        self.adapter.subscribe(self, id = NotifyType.ADAPTER_MODIFIED, onNotify = self.onAdapterModified)
+        self.onCodeChange()
 
         # initialize default command definition to be the first one
         self._definitionID = self.database.getDefinitionByIndex(self.adapter.type).id
@@ -145,6 +193,11 @@ class CommandModel(AbstractModel, Observer):
     def resetModified(self):
         self.adapter.resetModified()
 
+    # the command block polls wasModified() when ticked, so make sure it is ticked
+    def onAdapterModified(self):
+        if self.ui is not None:
+            self.ui.activateTick()
+
     def onCommandDefinitionChange(self):
         print("CommandModel: onCommandDefinitionChange")
 
@@ -156,7 +209,7 @@ class CommandModel(AbstractModel, Observer):
         else:
             self.hideUI()
 
-        if recompute:
+        if recompute and self.parent.ui is not None:
             self.parent.ui.recomputeEntity()
 
     def isHighlighted(self):
@@ -198,18 +251,32 @@ class CommandModel(AbstractModel, Observer):
     def setDefinitionID(self, id: str):
         self._definitionID = id
     
-    def getGeneratedCode(self) -> str:
-        
+    # the template to generate code from, compiled and cached
+    def getCompiledTemplate(self) -> CompiledTemplate:
+
         # get template text from command definition if not set
         if self.templateText is None:
-            templateText = self.getDefinition().templateText
-        else:
-            templateText = self.templateText
+            return self.getDefinition().getCompiledTemplate()
+
+        # recompile if the text was edited or the definition changed since
+        if self._compiledTemplate is None or not self._compiledTemplate.matches(self.templateText, self.getDefinition()):
+            self._compiledTemplate = CompiledTemplate(self.templateText, self.getDefinition())
+        return self._compiledTemplate
+    
+    # called when an adapter value or parameter changes, so the generated code is out of date
+    def onCodeChange(self):
+        self._generatedCode = None
+
+    def getGeneratedCode(self) -> str:
 
-        # replace all parameters with their values
-        # TODO
+        # a different compiled template means the template text or definition changed
+        template = self.getCompiledTemplate()
+        if self._generatedCode is None or self._generatedFrom is not template:
+            # replace all parameters with their values
+            self._generatedCode = CodeGenerationService(template, self.adapter, self.parameters).generateCode()
+            self._generatedFrom = template
 
-        return templateText
+        return self._generatedCode
 
     def getFunctionName(self) -> str:
         return self.getDefinition().name
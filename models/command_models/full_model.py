@@ -18,6 +18,12 @@ class SerializedFullState(SerializedRecursiveState):
     def _deserialize(self) -> 'FullCommandsModel':
         return FullCommandsModel()
 
+    def _canUpdate(self, model: AbstractModel) -> bool:
+        return isinstance(model, FullCommandsModel)
+
+    def _update(self, model: 'FullCommandsModel') -> bool:
+        return False
+
 class FullCommandsModel(AbstractModel[None, SectionModel]):
 
     def _serialize(self) -> SerializedFullState:
@@ -75,6 +75,10 @@ class InserterProcessor:
         children: list[VariableContainer] = mbe.getChildVGC()._children
         for i in range(len(children)):
             
+            # dematerialized entities are far from the dragged command and have stale positions
+            if not children[i].isMaterialized():
+                continue
+
             before = children[i - 1].child if i > 0 else None
             entity = children[i].child
             after = children[i + 1].child if (i < len(children)-1) else None
@@ -21,6 +21,15 @@ class SerializedSectionState(SerializedRecursiveState):
         model._sectionName = self.sectionName
         return model
 
+    def _canUpdate(self, model: AbstractModel) -> bool:
+        return isinstance(model, SectionModel)
+
+    def _update(self, model: 'SectionModel') -> bool:
+        if model._sectionName == self.sectionName:
+            return False
+        model._sectionName = self.sectionName
+        return True
+
 class SectionModel(AbstractModel):
 
     def _serialize(self) -> SerializedSectionState:
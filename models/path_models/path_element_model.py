@@ -1,7 +1,7 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
-from serialization.serializable import Serializable, SerializedState
+from serialization.serializable import Serializable, SerializedState, newElementID
 
 if TYPE_CHECKING:
     from root_container.field_container.field_entity import FieldEntity
@@ -18,15 +18,33 @@ A PathNodeEntity or PathSegment entity
 
 class SerializedPathElementState(SerializedState):
 
+    # None for states saved before elements had IDs
+    elementID: int = None
+
     def _deserialize(self, pathModel: PathModel) -> PathElementModel:
         raise NotImplementedError()
     
     def makeDeserialized(self, pathModel: PathModel):
         self.DESERIALIZED = self._deserialize(pathModel)
+        if self.elementID is not None:
+            self.DESERIALIZED.elementID = self.elementID
 
     def makeAdapterDeserialized(self):
         raise NotImplementedError
 
+    # whether update() can turn the existing element into this state
+    def canUpdate(self, element: PathElementModel) -> bool:
+        raise NotImplementedError
+
+    # use the adapters of the existing element instead of deserializing new ones
+    def makeAdapterReused(self, element: PathElementModel):
+        raise NotImplementedError
+
+    # Modify the existing element in place to match this state.
+    # Returns whether its UI must be regenerated
+    def update(self, element: PathElementModel) -> bool:
+        raise NotImplementedError
+
     def deserialize(self) -> PathElementModel:
         return self.DESERIALIZED
 
@@ -38,6 +56,7 @@ class PathElementModel(Serializable, LinkedListNode[T], Generic[T]):
 
     def makeSerialized(self):
         self.SERIALIZED = self._serialize()
+        self.SERIALIZED.elementID = self.elementID
 
     def makeAdapterSerialized(self):
         raise NotImplementedError()
@@ -53,14 +72,23 @@ class PathElementModel(Serializable, LinkedListNode[T], Generic[T]):
         self.field = pathModel.fieldEntity
         self.ui: Entity = None
 
+        # the same for every serialized state of this element, so undo can find it again
+        self.elementID = newElementID()
+
     def getCommand(self) -> CommandModel:
         return self.path.getCommandFromPath(self)
 
     def _generateUI(self, fieldEntity: FieldEntity) -> Entity:
         raise NotImplementedError()
     
+    # whether the path was loaded without a field, ie. by the headless batch tool.
+    # No UI is created for headless elements
+    def isHeadless(self) -> bool:
+        return self.path.fieldEntity is None
+
     def generateUI(self):
-        assert(self.path.fieldEntity is not None)
+        if self.isHeadless():
+            return
 
         if self.ui is not None:
             self.deleteUI()
@@ -68,8 +96,11 @@ class PathElementModel(Serializable, LinkedListNode[T], Generic[T]):
         self.ui = self._generateUI(self.path.fieldEntity)
 
     def recomputeUI(self):
-        self.ui.recomputeEntity()
+        if self.ui is not None:
+            self.ui.recomputeEntity()
 
     def deleteUI(self):
+        if self.ui is None:
+            return
         self.ui.entities.removeEntity(self.ui)
         self.ui = None
\ No newline at end of file
@@ -79,11 +79,42 @@ class PathModel(Serializable):
         for element in state.pathList:
             model.pathList.addToEnd(element.deserialize())
 
-        # deserialize other objects
-        model.linker = PathCommandLinker.deserialize(state.linker)
-        model.constraints = ConstraintModel.deserialize(state.constraints)
+        model.deserializeLinks(state)
         return model
 
+    # Update the path in place to match the state. Nodes and segments with the same element ID
+    # are kept along with their entities and adapters, so their commands can be kept too.
+    # Call deserializeLinks() once the commands are loaded
+    def reconcile(self, state: SerializedPathState):
+
+        existing = {element.elementID: element for element in self.pathList}
+
+        for elementState in state.pathList:
+            element = existing.get(elementState.elementID)
+            if element is not None and elementState.canUpdate(element):
+                del existing[element.elementID]
+                elementState.makeAdapterReused(element)
+                if elementState.update(element):
+                    element.generateUI()
+                elementState.DESERIALIZED = element
+            else:
+                elementState.makeAdapterDeserialized()
+                elementState.makeDeserialized(self)
+
+        # delete the entities of elements that are not in the state
+        for element in existing.values():
+            element.deleteUI()
+
+        self.pathList.clear()
+        for elementState in state.pathList:
+            self.pathList.addToEnd(elementState.deserialize())
+
+    # deserialize the links to commands and the constraints. The path elements and commands
+    # in the state must be deserialized first
+    def deserializeLinks(self, state: SerializedPathState):
+        self.linker = PathCommandLinker.deserialize(state.linker)
+        self.constraints = ConstraintModel.deserialize(state.constraints)
+
     def initCommandsModel(self, commandsModel: FullCommandsModel):
         self.commandsModel = commandsModel
 
@@ -216,6 +247,8 @@ class PathModel(Serializable):
         # remvoe turn command
         turnCommand = self.linker.getCommandFromPath(node)
         turnCommand.delete()
+        self.linker.deleteNode(node)
+        self.constraints.removeAllConstraintsWithNode(node)
 
         # remove the next segment, unless its the last segment, in which case remove the previous segment
         if node.isLastNode():
@@ -230,6 +263,7 @@ class PathModel(Serializable):
 
         segmentCommand = self.linker.getCommandFromPath(segment)
         segmentCommand.delete()
+        self.linker.deleteSegment(segment)
         
         # the other segment is the only node/segment affected by this
         if otherSegment is not None: # it's none if there are only two nodes total and remove last one
@@ -37,6 +37,24 @@ class SerializedPathNodeState(SerializedPathElementState):
     def makeAdapterDeserialized(self):
         self.adapter.makeDeserialized()
 
+        # known before the commands are deserialized, so the turn command is shown or hidden
+        # from the start instead of relinking its section when the path is recalculated
+        self.adapter.deserialize().turnEnabled = self.turnEnabled
+
+    def canUpdate(self, element: PathElementModel) -> bool:
+        return isinstance(element, PathNodeModel)
+
+    def makeAdapterReused(self, node: PathNodeModel):
+        self.adapter.DESERIALIZED = node.adapter
+
+    def update(self, node: PathNodeModel) -> bool:
+        node.position = self.position
+        node.TURN_ENABLED = self.turnEnabled
+
+        # without notifying, since updating the commands shows or hides the turn command
+        node.adapter.turnEnabled = self.turnEnabled
+        return False
+
 class TurnDirection(Enum):
     RIGHT = 0
     LEFT = 1
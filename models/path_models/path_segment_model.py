@@ -51,6 +51,23 @@ class SerializedPathSegmentState(SerializedPathElementState):
         for state in self.states.values():
             state.adapter.makeDeserialized()
 
+    def canUpdate(self, element: PathElementModel) -> bool:
+        return isinstance(element, PathSegmentModel) and element.states.keys() == self.states.keys()
+
+    def makeAdapterReused(self, segment: PathSegmentModel):
+        for key, state in self.states.items():
+            state.adapter.DESERIALIZED = segment.states[key].adapter
+
+    # the entity depends on the segment type, so it is only regenerated if that changed
+    def update(self, segment: PathSegmentModel) -> bool:
+        segment.direction = self.direction
+        for key, state in self.states.items():
+            state.update(segment.states[key])
+
+        typeChanged = segment.currentStateType != self.current
+        segment.currentStateType = self.current
+        return typeChanged
+
 class PathSegmentModel(PathElementModel):
 
     def makeAdapterSerialized(self):
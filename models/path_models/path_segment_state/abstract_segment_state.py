@@ -23,6 +23,10 @@ class SerializedSegmentStateState(SerializedState):
     def deserialize(self, model: PathSegmentModel) -> 'AbstractSegmentState':
         raise NotImplementedError()
 
+    # copy the values of this state into an existing segment state of the same type
+    def update(self, state: 'AbstractSegmentState'):
+        pass
+
 T = TypeVar('T')
 class AbstractSegmentState(Serializable, Generic[T]):
 
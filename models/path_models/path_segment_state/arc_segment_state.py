@@ -40,6 +40,9 @@ class SerializedArcState(SerializedSegmentStateState):
         arc.perpDistance = self.perpDistance
         return arc
 
+    def update(self, arc: 'ArcSegmentState'):
+        arc.perpDistance = self.perpDistance
+
 
 class ArcSegmentState(AbstractSegmentState):
 
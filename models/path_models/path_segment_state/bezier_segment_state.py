@@ -1,6 +1,7 @@
 from __future__ import annotations
 from enum import Enum, auto
 import math
+import numpy as np
 from typing import TYPE_CHECKING
 from adapter.bezier_adapter import BezierAdapter
 from adapter.path_adapter import AdapterState, PathAttributeID
@@ -34,6 +35,10 @@ class SerializedBezierState(SerializedSegmentStateState):
         bez.controlOffset2 = self.controlOffset2
         return bez
 
+    def update(self, bez: 'BezierSegmentState'):
+        bez.controlOffset1 = self.controlOffset1
+        bez.controlOffset2 = self.controlOffset2
+
 class BezierIconID(Enum):
     BEZIER = auto()
 
@@ -54,7 +59,7 @@ class BezierSegmentState(AbstractSegmentState):
         self.controlOffset1 = None
         self.controlOffset2 = None
 
-        self.FAST_POINTS: list[tuple] = None # cubic bezier
+        self.FAST_POINTS: np.ndarray = None # cubic bezier, (N,2) array
         self.SLOW_POINTS: list[tuple] = None # cubic bezier with arc length parametrization
 
         # higher is more detailed
@@ -117,7 +122,7 @@ class BezierSegmentState(AbstractSegmentState):
             return self.model.aConstraints
 
     # return slow bezier points if it exists. Otherwise, return fast bezier points
-    def getBezierPoints(self) -> list[tuple]:
+    def getBezierPoints(self) -> list[tuple] | np.ndarray:
         if self.SLOW_POINTS is not None:
             return self.SLOW_POINTS
         elif self.FAST_POINTS is not None:
@@ -126,7 +131,7 @@ class BezierSegmentState(AbstractSegmentState):
             raise Exception("Bezier points not defined")
     
     # return mouse points for hovering over bezier if it exists
-    def getBezierMousePoints(self) -> list[tuple]:
+    def getBezierMousePoints(self) -> np.ndarray:
         return self.FAST_POINTS
 
     # reset slow bezier points when they are no longer valid (user is dragging control points)
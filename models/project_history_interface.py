@@ -36,4 +36,9 @@ class ProjectHistoryInterface:
     
     # go forward one state
     def redo(self):
+        raise NotImplementedError
+
+    # restore the history saved by an earlier run of the program, and load its current state.
+    # Returns False if there was nothing to restore
+    def recover(self) -> bool:
         raise NotImplementedError
\ No newline at end of file
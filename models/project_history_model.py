@@ -3,40 +3,129 @@ from enum import Enum
 from typing import TYPE_CHECKING
 
 from models.project_model import ProjectModel, SerializedProjectState
-
-import pickle
+from models.path_models.path_element_model import SerializedPathElementState
+from models.command_models.abstract_model import SerializedRecursiveState
+from adapter.path_adapter import AdapterState
+from serialization.snapshot_store import Snapshot, SnapshotStore
+from serialization.edit_journal import EditJournal, JournalCheckpoint, JournalPointer, JournalSave
+from serialization.pgpath_format import dumpsProject
+from services.autosave_service import AutosaveService
+
+# Path elements, commands and adapters are referenced from several places in a
+# SerializedProjectState, and most of them do not change between saves.
+# Each is stored once and shared by all the saves it appears in
+def isSharedState(state) -> bool:
+    return isinstance(state, (SerializedPathElementState, SerializedRecursiveState, AdapterState))
 
 """
-Stores an ordered list of SerializedProjectState objects to represent
+Stores an ordered list of snapshots of SerializedProjectState objects to represent
 the save history of the project. This can be used for undo/redo.
+Snapshots share unchanged elements with each other, and the oldest snapshots
+are discarded once the history takes up more than maxBytes.
+Every change to the history is also appended to an EditJournal, so that recover()
+can restore the project and its undo history when the program starts again.
 """
 class ProjectHistoryModel:
 
-    def __init__(self):
-        
-        # list of serialized project states
-        self.history = [] # from oldest to newest
-        self.pointer: SerializedProjectState = None # current state. if None, then we're in present
+    MAX_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, maxBytes: int = MAX_BYTES, autosave: AutosaveService = None, journal: EditJournal = None):
+
+        self.maxBytes = maxBytes
+        self.store = SnapshotStore(isSharedState)
+
+        # writes the latest save to disk in the background
+        self.autosave = AutosaveService('saves/save.pgpath') if autosave is None else autosave
+
+        # appends every save, undo and redo to disk in the background
+        self.journal = EditJournal('saves/history.pgjournal') if journal is None else journal
+
+        # list of project snapshots
+        self.history: list[Snapshot] = [] # from oldest to newest
+        self.pointer: Snapshot = None # current state. if None, then we're in present
 
     # save a snapshot of the project as a SerializedProjectState,
     # and add it to the history
     def save(self):
 
+        currentState = ProjectModel.getInstance().serialize()
+        snapshot = self.store.put(currentState)
+        self._addSnapshot(snapshot)
+
+        self.journal.appendSave(snapshot, self.store)
+        self._checkpointIfNeeded()
+
+        # encode now, since the state references the live project, but write it later
+        self.autosave.save(dumpsProject(currentState))
+
+        print("save")
+
+    # add a new snapshot at the present. Used both by save() and when replaying the journal
+    def _addSnapshot(self, snapshot: Snapshot):
+
         # if pointer is not None, then we must delete the incompatible future
         # essentially, disables any states that would be accessible through redo
         if self.pointer is not None:
             i = self.history.index(self.pointer)
+            for future in self.history[i+1:]:
+                self.store.release(future)
             self.history = self.history[:i+1] # delete all states after pointer
 
-        currentState = ProjectModel.getInstance().serialize()
-        self.history.append(currentState)
+        self.history.append(snapshot)
         self.pointer = None # set pointer to new
 
-        # pickle
-        file = open('saves/save.pgpath', 'wb')
-        pickle.dump(currentState, file)
-
-        print("save")
+        # forget the oldest saves if over the memory cap, but always keep the newest
+        while self.store.nbytes > self.maxBytes and len(self.history) > 1:
+            self.store.release(self.history.pop(0))
+
+    # index of the pointer in the history, or -1 if at the present
+    def _getPointerIndex(self) -> int:
+        return -1 if self.pointer is None else self.history.index(self.pointer)
+
+    # compact the journal once it has grown long enough since the last checkpoint
+    def _checkpointIfNeeded(self):
+        if self.journal.shouldCheckpoint():
+            self.journal.checkpoint(self.history, self._getPointerIndex(), self.store)
+
+    # Rebuild the history from the journal and load the current state of it.
+    # Returns False if there was nothing to recover, or if the journal could not be loaded.
+    # In that case the journal is moved aside, and the history is left empty
+    def recover(self) -> bool:
+        try:
+            return self._recover()
+        except Exception as e:
+            print(f"could not recover from {self.journal.path}:", repr(e))
+            self.store = SnapshotStore(isSharedState)
+            self.history = []
+            self.pointer = None
+            self.journal.discard()
+            return False
+
+    def _recover(self) -> bool:
+
+        records = self.journal.read()
+
+        chunks: dict[bytes, bytes] = {} # data of every chunk in the journal
+        for record in records:
+            if isinstance(record, JournalCheckpoint):
+                for snapshot in self.history:
+                    self.store.release(snapshot)
+                chunks = record.chunks
+                self.history = [self.store.restore(root, digests, chunks) for digests, root in record.snapshots]
+                self.pointer = None if record.pointer == -1 else self.history[record.pointer]
+            elif isinstance(record, JournalSave):
+                chunks.update(record.chunks)
+                self._addSnapshot(self.store.restore(record.root, record.digests, chunks))
+            elif isinstance(record, JournalPointer):
+                self.pointer = None if record.index == -1 else self.history[record.index]
+
+        if len(self.history) == 0:
+            return False
+
+        current = self.history[-1] if self.pointer is None else self.pointer
+        ProjectModel.getInstance().loadSerializedState(self.store.get(current))
+        print(f"recovered {len(self.history)} saves from {self.journal.path}")
+        return True
 
     # whether undo should be enabled
     def canUndo(self) -> bool:
@@ -66,8 +155,11 @@ class ProjectHistoryModel:
             self.pointer = self.history[i-1]
         else:
             raise Exception("Cannot undo past beginning of history")
+
+        self.journal.appendPointer(i-1)
+        self._checkpointIfNeeded()
             
-        ProjectModel.getInstance().loadSerializedState(self.pointer)
+        ProjectModel.getInstance().loadSerializedState(self.store.get(self.pointer))
 
     # whether redo should be enabled
     def canRedo(self) -> bool:
@@ -89,4 +181,7 @@ class ProjectHistoryModel:
         else:
             raise Exception("Cannot redo past end of history")
 
-        ProjectModel.getInstance().loadSerializedState(self.pointer)
\ No newline at end of file
+        self.journal.appendPointer(i+1)
+        self._checkpointIfNeeded()
+
+        ProjectModel.getInstance().loadSerializedState(self.store.get(self.pointer))
\ No newline at end of file
@@ -5,7 +5,6 @@ from entity_base.entity import Entity
 from models.command_models.abstract_model import SerializedRecursiveState
 
 from models.project_data_model import ProjectDataModel
-import copy
 
 if TYPE_CHECKING:
     from entities.root_container.field_container.field_entity import FieldEntity
@@ -70,7 +69,8 @@ class ProjectModel:
         self.parentCommandEntity = parentCommandEntity
 
     # Serialize and return the entire project model.
-    # Make a deepcopy, so that the original model is not modified.
+    # The state may reference live objects like projectData, so copy it (e.g. through
+    # ProjectHistoryModel) before the model is modified again
     def serialize(self) -> SerializedProjectState:
 
         # convert all the adapters to serialized states first
@@ -81,14 +81,47 @@ class ProjectModel:
         commands = self.commandsModel.serialize()
         path = self.pathModel.serialize()
 
-        state = SerializedProjectState(self.projectData, commands, path)
-        stateCopy = copy.deepcopy(state)
-
-        return stateCopy
+        return SerializedProjectState(self.projectData, commands, path)
 
     # given a serialized state, update the project model and ui
     def loadSerializedState(self, state: SerializedProjectState):
 
+        # States saved from this project, ie. for undo/redo, describe the same models with the
+        # same element IDs, so only what changed is updated. Otherwise everything is rebuilt
+        if state.commands.elementID is not None and state.commands.elementID == self.commandsModel.elementID:
+            self._reconcileSerializedState(state)
+        else:
+            self._rebuildSerializedState(state)
+
+        # select the selected entities at this state
+        self.fieldEntity.interactor.removeAllEntities()
+        for selectedNodeOrSegmentSerialized in state.path.selected:
+            selectedNodeOrSegment = selectedNodeOrSegmentSerialized.deserialize()
+            self.fieldEntity.interactor.addEntity(selectedNodeOrSegment.ui)
+
+    # update the existing models to the state, reusing the models and UI that did not change
+    def _reconcileSerializedState(self, state: SerializedProjectState):
+
+        self.projectData = state.data
+
+        # the path first, since commands share the adapters of path elements
+        self.pathModel.reconcile(state.path)
+
+        state.commands.makeNullAdapterDeserialized()
+        self.commandsModel.reconcile(state.commands)
+
+        self.pathModel.deserializeLinks(state.path)
+
+        # recalculate path cached data. Only turns that were enabled or disabled update commands
+        self.pathModel.recalculateAll()
+
+        # update the UI
+        self.fieldEntity.recomputeEntity()
+        self.commandsModel.recomputeUI()
+
+    # replace the models and all UI with new ones deserialized from the state
+    def _rebuildSerializedState(self, state: SerializedProjectState):
+
         # delete all the path ui
         for element in self.pathModel.pathList:
             element.ui.deleteEntity()
@@ -122,13 +155,5 @@ class ProjectModel:
         self.fieldEntity.recomputeEntity()
         self.commandsModel.recomputeUI()
 
-        # select the selected entities at this state
-        self.fieldEntity.interactor.removeAllEntities()
-        for selectedNodeOrSegmentSerialized in state.path.selected:
-            selectedNodeOrSegment = selectedNodeOrSegmentSerialized.deserialize()
-            self.fieldEntity.interactor.addEntity(selectedNodeOrSegment.ui)
-
-        
-
         #self.commandsModel.tree()
         #print(self.pathModel.pathList)
\ No newline at end of file
@@ -0,0 +1,335 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import TYPE_CHECKING
+import atexit, os, struct, tempfile, threading, time, zlib
+
+if TYPE_CHECKING:
+    from serialization.snapshot_store import Snapshot, SnapshotStore
+
+"""
+An append-only file of the edits to the project history, so that the project and its
+undo history can be recovered after the program exits or crashes.
+
+Each save appends a record with the snapshot's root and only the chunks that are not
+already in the journal, so a save writes a few KB instead of the whole project.
+Undo and redo append a record with the new position in the history.
+A checkpoint record stores every snapshot in the history. Once enough records were
+appended since the last checkpoint, the journal is compacted: a new file with only a
+checkpoint replaces it. Recovery then only has to replay from the last checkpoint.
+
+All writes happen in order on a background thread. Every record has a CRC, so a record
+that was only partly written when the program crashed is detected and dropped.
+
+Chunks and roots are the pickled data from SnapshotStore. Unlike .pgpath files, which are
+shared between users and so are never unpickled when loaded, the journal is private to the
+program: it is only written and read by ProjectHistoryModel in the saves folder. A journal
+that cannot be unpickled, ie. from a build where a state class was renamed, is moved aside
+by discard() and the program starts without history.
+
+File: MAGIC, then records of [type: u8][payload length: u32][crc32 of payload: u32][payload]
+SAVE payload:        [digests][chunks][root]
+POINTER payload:     [index: i32], -1 if at the present
+CHECKPOINT payload:  [chunks][number of snapshots: u32]([digests][root])...[pointer: i32]
+where digests are [count: u32][16 bytes]..., chunks are [count: u32]([16 bytes][length: u32][data])...
+and root is [length: u32][data]
+"""
+
+MAGIC = b"PGJOURNAL\x01"
+
+class RecordType(IntEnum):
+    SAVE = 1
+    POINTER = 2
+    CHECKPOINT = 3
+
+_HEADER = struct.Struct("<BII")
+_U32 = struct.Struct("<I")
+_I32 = struct.Struct("<i")
+DIGEST_SIZE = 16
+
+# a save, with the chunks it added to the journal
+@dataclass
+class JournalSave:
+    digests: list[bytes] # every chunk the snapshot references
+    chunks: dict[bytes, bytes] # chunks not in any earlier record since the checkpoint
+    root: bytes
+
+# undo or redo
+@dataclass
+class JournalPointer:
+    index: int # index of the current snapshot in the history, -1 if at the present
+
+# the whole history
+@dataclass
+class JournalCheckpoint:
+    chunks: dict[bytes, bytes]
+    snapshots: list[tuple[list[bytes], bytes]] # (digests, root) of each snapshot, oldest first
+    pointer: int
+
+JournalRecord = JournalSave | JournalPointer | JournalCheckpoint
+
+@dataclass
+class JournalStats:
+    records: int = 0 # appended since the last checkpoint
+    bytesAppended: int = 0 # total over all appended records
+    checkpoints: int = 0 # number of compactions written
+    failed: int = 0
+    lastCheckpointBytes: int = 0
+    lastCheckpointLatency: float = 0 # seconds taken to write the last compacted file
+
+def _encodeDigests(digests) -> list[bytes]:
+    digests = list(digests)
+    return [_U32.pack(len(digests))] + digests
+
+def _encodeChunks(chunks: dict[bytes, bytes]) -> list[bytes]:
+    parts = [_U32.pack(len(chunks))]
+    for digest, data in chunks.items():
+        parts += [digest, _U32.pack(len(data)), data]
+    return parts
+
+def _encodeRecord(type: RecordType, parts: list[bytes]) -> bytes:
+    payload = b"".join(parts)
+    return _HEADER.pack(type, len(payload), zlib.crc32(payload)) + payload
+
+def _encodeCheckpoint(checkpoint: JournalCheckpoint) -> bytes:
+    parts = _encodeChunks(checkpoint.chunks)
+    parts.append(_U32.pack(len(checkpoint.snapshots)))
+    for digests, root in checkpoint.snapshots:
+        parts += _encodeDigests(digests)
+        parts += [_U32.pack(len(root)), root]
+    parts.append(_I32.pack(checkpoint.pointer))
+    return _encodeRecord(RecordType.CHECKPOINT, parts)
+
+class _Reader:
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.offset = 0
+
+    def u32(self) -> int:
+        value = _U32.unpack_from(self.data, self.offset)[0]
+        self.offset += 4
+        return value
+
+    def i32(self) -> int:
+        value = _I32.unpack_from(self.data, self.offset)[0]
+        self.offset += 4
+        return value
+
+    def bytes(self, size: int) -> bytes:
+        value = self.data[self.offset : self.offset + size]
+        self.offset += size
+        return value
+
+    def digests(self) -> list[bytes]:
+        return [self.bytes(DIGEST_SIZE) for i in range(self.u32())]
+
+    def chunks(self) -> dict[bytes, bytes]:
+        chunks = {}
+        for i in range(self.u32()):
+            digest = self.bytes(DIGEST_SIZE)
+            chunks[digest] = self.bytes(self.u32())
+        return chunks
+
+def _decodeRecord(type: int, payload: bytes) -> JournalRecord:
+    reader = _Reader(payload)
+    if type == RecordType.SAVE:
+        return JournalSave(reader.digests(), reader.chunks(), reader.bytes(reader.u32()))
+    elif type == RecordType.POINTER:
+        return JournalPointer(reader.i32())
+    elif type == RecordType.CHECKPOINT:
+        chunks = reader.chunks()
+        snapshots = [(reader.digests(), reader.bytes(reader.u32())) for i in range(reader.u32())]
+        return JournalCheckpoint(chunks, snapshots, reader.i32())
+    raise ValueError(f"unknown journal record type {type}")
+
+class EditJournal:
+
+    # compact the journal after this many records since the last checkpoint
+    CHECKPOINT_RECORDS = 200
+
+    def __init__(self, path: str, checkpointRecords: int = CHECKPOINT_RECORDS):
+
+        self.path = path
+        self.checkpointRecords = checkpointRecords
+
+        self.stats = JournalStats()
+
+        # chunks written to the journal since its checkpoint, which later records can reference
+        self._written: set[bytes] = set()
+
+        # encoded records, or JournalCheckpoints to compact the journal with, in order
+        self._pending: list[bytes | JournalCheckpoint] = []
+        self._stopping = False
+        self._condition = threading.Condition()
+
+        self._file = None # opened for appending by the worker thread
+
+        self._thread = threading.Thread(target = self._run, name = "journal", daemon = True)
+        self._thread.start()
+
+        atexit.register(self.stop)
+
+    # Read the records from the last checkpoint on. Call before appending anything.
+    # A partly written record at the end, ie. from a crash, is removed from the file
+    def read(self) -> list[JournalRecord]:
+
+        if not os.path.exists(self.path):
+            return []
+
+        with open(self.path, "rb") as f:
+            data = f.read()
+
+        if not data.startswith(MAGIC):
+            print("journal: unrecognized file, ignoring", self.path)
+            return []
+
+        records: list[JournalRecord] = []
+        offset = len(MAGIC)
+        while offset + _HEADER.size <= len(data):
+            type, length, crc = _HEADER.unpack_from(data, offset)
+            payload = data[offset + _HEADER.size : offset + _HEADER.size + length]
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                break
+            offset += _HEADER.size + length
+
+            record = _decodeRecord(type, payload)
+            if isinstance(record, JournalCheckpoint):
+                records = []
+            records.append(record)
+
+        if offset < len(data):
+            print(f"journal: dropping {len(data) - offset} bytes of incomplete records")
+            with open(self.path, "r+b") as f:
+                f.truncate(offset)
+
+        # later saves only need to write chunks that are not in these records
+        for record in records:
+            if not isinstance(record, JournalPointer):
+                self._written.update(record.chunks)
+        self.stats.records = len(records)
+
+        return records
+
+    # Move the journal aside to path + ".failed", ie. when its records could not be loaded,
+    # so that the next save starts a new journal. Call before appending anything
+    def discard(self):
+
+        if os.path.exists(self.path):
+            os.replace(self.path, self.path + ".failed")
+            print("journal: moved unreadable journal to", self.path + ".failed")
+
+        self._written = set()
+        self.stats.records = 0
+
+    def appendSave(self, snapshot: Snapshot, store: SnapshotStore):
+
+        chunks = {digest: store.getChunk(digest) for digest in snapshot.chunks if digest not in self._written}
+        self._written.update(chunks)
+
+        parts = _encodeDigests(snapshot.chunks) + _encodeChunks(chunks) + [_U32.pack(len(snapshot.root)), snapshot.root]
+        self._append(_encodeRecord(RecordType.SAVE, parts))
+
+    def appendPointer(self, index: int):
+        self._append(_encodeRecord(RecordType.POINTER, [_I32.pack(index)]))
+
+    def shouldCheckpoint(self) -> bool:
+        return self.stats.records >= self.checkpointRecords
+
+    # Replace the journal with a single checkpoint of the history, in the background.
+    # The chunk data is immutable, so it is only encoded later on the worker thread
+    def checkpoint(self, history: list[Snapshot], pointer: int, store: SnapshotStore):
+
+        chunks = {}
+        for snapshot in history:
+            for digest in snapshot.chunks:
+                if digest not in chunks:
+                    chunks[digest] = store.getChunk(digest)
+
+        checkpoint = JournalCheckpoint(chunks, [(list(snapshot.chunks), snapshot.root) for snapshot in history], pointer)
+
+        self._written = set(chunks)
+        self.stats.records = 0
+
+        with self._condition:
+            self._pending.append(checkpoint)
+            self._condition.notify()
+
+    def _append(self, record: bytes):
+        self.stats.records += 1
+        with self._condition:
+            self._pending.append(record)
+            self._condition.notify()
+
+    # write everything pending and stop the worker thread
+    def stop(self):
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+
+            with self._condition:
+                while len(self._pending) == 0 and not self._stopping:
+                    self._condition.wait()
+                if len(self._pending) == 0:
+                    if self._file is not None:
+                        self._file.close()
+                    return
+                pending = self._pending
+                self._pending = []
+
+            try:
+                for item in pending:
+                    if isinstance(item, JournalCheckpoint):
+                        self._writeCheckpoint(item)
+                    else:
+                        self._writeRecord(item)
+
+                # make the whole batch durable at once
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            except OSError as e:
+                self.stats.failed += 1
+                print("journal write failed:", e)
+
+    def _writeRecord(self, record: bytes):
+
+        if self._file is None:
+            isNew = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            self._file = open(self.path, "ab")
+            if isNew:
+                self._file.write(MAGIC)
+
+        self._file.write(record)
+        self.stats.bytesAppended += len(record)
+
+    # write the checkpoint to a new file that atomically replaces the journal
+    def _writeCheckpoint(self, checkpoint: JournalCheckpoint):
+
+        start = time.perf_counter()
+        data = MAGIC + _encodeCheckpoint(checkpoint)
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+        directory = os.path.dirname(self.path) or "."
+        file, tempPath = tempfile.mkstemp(dir = directory, prefix = ".journal-", suffix = ".tmp")
+        try:
+            with os.fdopen(file, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tempPath, self.path)
+        finally:
+            if os.path.exists(tempPath):
+                os.remove(tempPath)
+
+        self._file = open(self.path, "ab")
+
+        self.stats.checkpoints += 1
+        self.stats.lastCheckpointBytes = len(data)
+        self.stats.lastCheckpointLatency = time.perf_counter() - start
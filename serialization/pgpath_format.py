@@ -0,0 +1,758 @@
+from __future__ import annotations
+from enum import Enum, IntEnum
+from typing import Any, BinaryIO, Iterator
+import array, copyreg, io, math, os, pickle, struct, sys, tempfile, zlib
+
+from adapter.arc_adapter import ArcAdapterState
+from adapter.bezier_adapter import BezierAdapterState
+from adapter.null_adapter import NullAdapterState
+from adapter.path_adapter import AdapterState
+from adapter.straight_adapter import StraightAdapterState
+from adapter.turn_adapter import TurnAdapterState
+from command_creation.command_type import CommandType
+from common.image_manager import ImageID
+from data_structures.variable import Variable
+from entities.root_container.panel_container.command_block.wait_id import WaitID
+from entity_base.image.image_state import SerializedImageState
+from models.command_models.abstract_model import SerializedRecursiveState
+from models.command_models.command_model import CommandUIState, SerializedCommandState
+from models.command_models.full_model import SerializedFullState
+from models.command_models.section_model import SerializedSectionState
+from models.path_models.constraint_model import SerializedConstraintsState
+from models.path_models.path_command_linker import SerializedLinkerState
+from models.path_models.path_element_model import SerializedPathElementState
+from models.path_models.path_model import SerializedPathState
+from models.path_models.path_node_model import SerializedPathNodeState, TurnDirection
+from models.path_models.path_segment_model import SerializedPathSegmentState
+from models.path_models.path_segment_state.arc_segment_state import ArcIconID, SerializedArcState
+from models.path_models.path_segment_state.bezier_segment_state import BezierIconID, SerializedBezierState
+from models.path_models.path_segment_state.segment_type import SegmentType
+from models.path_models.path_segment_state.straight_segment_state import SerializedStraightState
+from models.path_models.segment_direction import SegmentDirection
+from models.project_data_model import ProjectDataModel
+from models.project_model import SerializedProjectState
+from services.constraint_solver_service import SerializedConstraintState
+from utility.line import Line
+
+"""
+Versioned binary format for .pgpath project files, replacing pickled SerializedProjectStates.
+Only the types listed in this schema are read back, so loading a file never imports or runs
+arbitrary classes, and renaming a class or moving a module does not break old files.
+Enums are stored by member name, so reordering or adding members does not break them either.
+
+File: MAGIC, [version: u16], then sections of [id: u16][payload length: u32][crc32: u32][payload]
+Each payload starts with a table of the enum members it uses, which it references by index.
+DATA:         project name
+DEFINITIONS:  table of the command definition IDs that commands reference
+ADAPTERS:     table of the distinct adapter types and icons, then the packed index into it
+              of each adapter. A command shares its adapter with its path element, so both
+              reference the same adapter
+NODES:        packed positions, turn flags and adapter indices
+SEGMENTS:     packed arc distances and bezier control offsets, then direction, current
+              shape and the adapter index of each shape for each segment
+PATH:         order of nodes and segments, selection, constraints, and path <-> command links
+COMMANDS:     the command tree in preorder
+ELEMENT_IDS:  packed element IDs of the path elements in path order, then of the commands
+              in preorder, with 0 for none. Optional, since IDs only let undo reuse models
+
+Sections are written one at a time, so a writer only holds one section in memory.
+PGPathReader only reads the section headers up front, and reads and decodes each section
+the first time it is needed. Readers skip sections with unknown IDs, so a later version can
+add sections that older versions ignore. loadProject() refuses old pickled files. They can be
+converted with migrate(), or by running: python -m serialization.pgpath_format FILES
+which unpickles only the classes of the schema.
+"""
+
+MAGIC = b"PGPATH\x00\n"
+VERSION = 1
+
+class SectionID(IntEnum):
+    DATA = 1
+    DEFINITIONS = 2
+    ADAPTERS = 3
+    NODES = 4
+    SEGMENTS = 5
+    PATH = 6
+    COMMANDS = 7
+    ELEMENT_IDS = 8
+
+_VERSION = struct.Struct("<H")
+_SECTION = struct.Struct("<HII")
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+
+# enums that can be stored. Only append to this list, since files store the index
+ENUM_TYPES: list[type[Enum]] = [
+    CommandType, ImageID, WaitID, SegmentType, SegmentDirection, TurnDirection, ArcIconID, BezierIconID
+]
+_ENUM_INDICES = {enum: i for i, enum in enumerate(ENUM_TYPES)}
+
+# tags for values stored with _Writer.value()
+class _Tag(IntEnum):
+    NONE = 0
+    FALSE = 1
+    TRUE = 2
+    INT = 3
+    FLOAT = 4
+    STR = 5
+    ENUM = 6
+    TUPLE = 7
+    LIST = 8
+
+ADAPTER_STATES: dict[CommandType, type[AdapterState]] = {
+    CommandType.TURN: TurnAdapterState,
+    CommandType.STRAIGHT: StraightAdapterState,
+    CommandType.ARC: ArcAdapterState,
+    CommandType.BEZIER: BezierAdapterState,
+    CommandType.CUSTOM: NullAdapterState,
+}
+
+# kinds of models in the COMMANDS section, and of elements in the PATH section
+class _CommandKind(IntEnum):
+    FULL = 0
+    SECTION = 1
+    COMMAND = 2
+
+class _ElementKind(IntEnum):
+    NODE = 0
+    SEGMENT = 1
+
+_NO_INDEX = 0xFFFFFFFF
+
+# Writes the payload of a section. Enum members are stored as an index into a table at the
+# start of the section, so each member name is only written once per section
+class _Writer:
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.enums: dict[Enum, int] = {} # member -> index in the table
+
+    def getPayload(self) -> bytes:
+        table = _Writer()
+        table.u32(len(self.enums))
+        for member in self.enums:
+            table.u8(_ENUM_INDICES[type(member)])
+            table.string(member.name)
+        return bytes(table.buffer + self.buffer)
+
+    def u8(self, value: int):
+        self.buffer += _U8.pack(value)
+
+    def u32(self, value: int):
+        self.buffer += _U32.pack(value)
+
+    def f64(self, value: float):
+        self.buffer += _F64.pack(value)
+
+    def string(self, value: str):
+        data = value.encode("utf-8")
+        self.u32(len(data))
+        self.buffer += data
+
+    # arrays are stored little-endian, like everything else
+    def _array(self, values: array.array):
+        self.u32(len(values))
+        if sys.byteorder == "big":
+            values.byteswap()
+        self.buffer += values.tobytes()
+
+    # packed array of float64s, with None stored as NaN
+    def floats(self, values: list[float | None]):
+        self._array(array.array("d", [math.nan if v is None else v for v in values]))
+
+    # packed float64s, followed by a byte for each that is 1 if it was an int.
+    # Ints are loaded as ints again, since generated code prints them differently
+    def numbers(self, values: list[float | int | None]):
+        self.floats(values)
+        self.buffer += bytes(isinstance(v, int) for v in values)
+
+    def indices(self, values: list[int]):
+        self._array(array.array("I", values))
+
+    def elementIDs(self, values: list[int | None]):
+        self._array(array.array("Q", [0 if v is None else v for v in values]))
+
+    def enum(self, value: Enum):
+        if value not in self.enums:
+            if type(value) not in _ENUM_INDICES:
+                raise ValueError(f"{type(value).__name__} is not an enum in the .pgpath schema")
+            self.enums[value] = len(self.enums)
+        self.buffer += _U16.pack(self.enums[value])
+
+    # a value of any type that parameters and image states use
+    def value(self, value: Any):
+        if value is None:
+            self.u8(_Tag.NONE)
+        elif isinstance(value, bool):
+            self.u8(_Tag.TRUE if value else _Tag.FALSE)
+        elif isinstance(value, Enum):
+            self.u8(_Tag.ENUM)
+            self.enum(value)
+        elif isinstance(value, int):
+            self.u8(_Tag.INT)
+            self.buffer += _I64.pack(value)
+        elif isinstance(value, float):
+            self.u8(_Tag.FLOAT)
+            self.f64(value)
+        elif isinstance(value, str):
+            self.u8(_Tag.STR)
+            self.string(value)
+        elif isinstance(value, (tuple, list)):
+            self.u8(_Tag.TUPLE if isinstance(value, tuple) else _Tag.LIST)
+            self.u32(len(value))
+            for item in value:
+                self.value(item)
+        else:
+            raise ValueError(f"cannot store {type(value).__name__} in a .pgpath file")
+
+    # the type and icons of an adapter, as returned by _getAdapterKind()
+    def adapterKind(self, kind: tuple):
+        type, images = kind
+        self.enum(type)
+        self.u32(len(images))
+        for image in images:
+            for value in image:
+                self.value(value)
+
+class _Reader:
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.offset = 0
+
+        # the enum table at the start of the section
+        self.enums: list[Enum] = []
+        for i in range(self.u32()):
+            index = self.u8()
+            name = self.string()
+            if index >= len(ENUM_TYPES) or name not in ENUM_TYPES[index].__members__:
+                raise ValueError(f"unknown enum value {name} in .pgpath file")
+            self.enums.append(ENUM_TYPES[index][name])
+
+    def _unpack(self, format: struct.Struct):
+        value = format.unpack_from(self.data, self.offset)[0]
+        self.offset += format.size
+        return value
+
+    def u8(self) -> int:
+        return self._unpack(_U8)
+
+    def u32(self) -> int:
+        return self._unpack(_U32)
+
+    def f64(self) -> float:
+        return self._unpack(_F64)
+
+    def string(self) -> str:
+        size = self.u32()
+        value = self.data[self.offset : self.offset + size].decode("utf-8")
+        self.offset += size
+        return value
+
+    def _array(self, typecode: str) -> array.array:
+        values = array.array(typecode)
+        size = self.u32() * values.itemsize
+        values.frombytes(self.data[self.offset : self.offset + size])
+        self.offset += size
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values
+
+    def floats(self) -> list[float | None]:
+        return [None if math.isnan(v) else v for v in self._array("d")]
+
+    def numbers(self) -> list[float | int | None]:
+        values = self.floats()
+        isInt = self.data[self.offset : self.offset + len(values)]
+        self.offset += len(values)
+        return [int(v) if i else v for v, i in zip(values, isInt)]
+
+    def indices(self) -> list[int]:
+        return self._array("I").tolist()
+
+    def elementIDs(self) -> list[int | None]:
+        return [v or None for v in self._array("Q")]
+
+    def enum(self) -> Enum:
+        return self.enums[self._unpack(_U16)]
+
+    def value(self) -> Any:
+        tag = self.u8()
+        if tag == _Tag.NONE:
+            return None
+        elif tag == _Tag.FALSE:
+            return False
+        elif tag == _Tag.TRUE:
+            return True
+        elif tag == _Tag.INT:
+            return self._unpack(_I64)
+        elif tag == _Tag.FLOAT:
+            return self.f64()
+        elif tag == _Tag.STR:
+            return self.string()
+        elif tag == _Tag.ENUM:
+            return self.enum()
+        elif tag == _Tag.TUPLE:
+            return tuple(self.value() for i in range(self.u32()))
+        elif tag == _Tag.LIST:
+            return [self.value() for i in range(self.u32())]
+        raise ValueError(f"unknown value tag {tag} in .pgpath file")
+
+    def adapterKind(self) -> tuple[CommandType, list[SerializedImageState]]:
+        type = self.enum()
+        return type, [SerializedImageState(*[self.value() for j in range(7)]) for i in range(self.u32())]
+
+"""
+Writes a .pgpath file to a binary stream one section at a time
+"""
+class PGPathWriter:
+
+    def __init__(self, file: BinaryIO):
+        self.file = file
+        self.file.write(MAGIC + _VERSION.pack(VERSION))
+
+    def writeSection(self, id: SectionID, payload: bytes):
+        self.file.write(_SECTION.pack(id, len(payload), zlib.crc32(payload)))
+        self.file.write(payload)
+
+    def writeProject(self, state: SerializedProjectState):
+
+        commands = _preorder(state.commands)
+        definitionIDs = list(dict.fromkeys(c.definitionID for c in commands if isinstance(c, SerializedCommandState) and c.definitionID is not None))
+
+        writer = _Writer()
+        writer.string(state.data.projectName.get())
+        self.writeSection(SectionID.DATA, writer.getPayload())
+
+        writer = _Writer()
+        writer.u32(len(definitionIDs))
+        for definitionID in definitionIDs:
+            writer.string(definitionID)
+        self.writeSection(SectionID.DEFINITIONS, writer.getPayload())
+
+        pathList = list(state.path.pathList)
+        nodes = [e for e in pathList if isinstance(e, SerializedPathNodeState)]
+        segments = [e for e in pathList if isinstance(e, SerializedPathSegmentState)]
+
+        # id(adapter state) -> index, in order of first use
+        adapters: dict[int, int] = {}
+        kinds: dict[tuple, int] = {} # adapter kind -> index
+        adapterKinds = []
+        for adapter in _getAdapters(nodes, segments, commands):
+            if id(adapter) not in adapters:
+                adapters[id(adapter)] = len(adapters)
+                adapterKinds.append(kinds.setdefault(_getAdapterKind(adapter), len(kinds)))
+
+        writer = _Writer()
+        writer.u32(len(kinds))
+        for kind in kinds:
+            writer.adapterKind(kind)
+        writer.indices(adapterKinds)
+        self.writeSection(SectionID.ADAPTERS, writer.getPayload())
+
+        self.writeSection(SectionID.NODES, _encodeNodes(nodes, adapters))
+        self.writeSection(SectionID.SEGMENTS, _encodeSegments(segments, adapters))
+        self.writeSection(SectionID.PATH, _encodePath(state.path, commands))
+        self.writeSection(SectionID.COMMANDS, _encodeCommands(commands, definitionIDs, adapters))
+
+        writer = _Writer()
+        writer.elementIDs([element.elementID for element in pathList])
+        writer.elementIDs([command.elementID for command in commands])
+        self.writeSection(SectionID.ELEMENT_IDS, writer.getPayload())
+
+# Adapters only store their type and icons, and most adapters of a type have the same icons,
+# so each distinct (type, icons) is only stored once
+def _getAdapterKind(adapter: AdapterState) -> tuple:
+    return adapter.type, tuple((image.id, image.imageOnID, image.tooltipOn, image.imageOffID, image.tooltipOff,
+                                image.imageOnHoveredID, image.hoveredBrightenAmount) for image in adapter.iconImageStates)
+
+def _getAdapters(nodes: list[SerializedPathNodeState], segments: list[SerializedPathSegmentState],
+                 commands: list[SerializedRecursiveState]) -> Iterator[AdapterState]:
+    for node in nodes:
+        yield node.adapter
+    for segment in segments:
+        for shape in segment.states.values():
+            yield shape.adapter
+    for command in commands:
+        if isinstance(command, SerializedCommandState):
+            yield command.adapter
+
+def _preorder(root: SerializedRecursiveState) -> list[SerializedRecursiveState]:
+    states = []
+    stack = [root]
+    while len(stack) > 0:
+        state = stack.pop()
+        states.append(state)
+        stack.extend(reversed(state.children))
+    return states
+
+def _encodeNodes(nodes: list[SerializedPathNodeState], adapters: dict[int, int]) -> bytes:
+    writer = _Writer()
+    writer.u32(len(nodes))
+    writer.numbers([coordinate for node in nodes for coordinate in node.position])
+    writer.buffer += bytes(2 if node.turnEnabled is None else int(node.turnEnabled) for node in nodes)
+    writer.indices([adapters[id(node.adapter)] for node in nodes])
+    return writer.getPayload()
+
+def _encodeSegments(segments: list[SerializedPathSegmentState], adapters: dict[int, int]) -> bytes:
+
+    perpDistances = []
+    controlOffsets = []
+    for segment in segments:
+        arc = segment.states.get(SegmentType.ARC)
+        perpDistances.append(arc.perpDistance if isinstance(arc, SerializedArcState) else None)
+
+        bezier = segment.states.get(SegmentType.BEZIER)
+        for offset in ([bezier.controlOffset1, bezier.controlOffset2] if isinstance(bezier, SerializedBezierState) else [None, None]):
+            controlOffsets += [None, None] if offset is None else list(offset)
+
+    writer = _Writer()
+    writer.u32(len(segments))
+    writer.numbers(perpDistances)
+    writer.numbers(controlOffsets)
+    for segment in segments:
+        writer.enum(segment.direction)
+        writer.enum(segment.current)
+        writer.u32(len(segment.states))
+        for type, shape in segment.states.items():
+            writer.enum(type)
+            writer.u32(adapters[id(shape.adapter)])
+    return writer.getPayload()
+
+def _encodePath(path: SerializedPathState, commands: list[SerializedRecursiveState]) -> bytes:
+
+    pathIndices = {id(element): i for i, element in enumerate(path.pathList)}
+    commandIndices = {id(command): i for i, command in enumerate(commands)}
+
+    def indexOf(indices: dict[int, int], state: object) -> int:
+        if id(state) not in indices:
+            raise ValueError(f"{type(state).__name__} is referenced but not part of the project")
+        return indices[id(state)]
+
+    writer = _Writer()
+    writer.buffer += _U32.pack(len(pathIndices)) + bytes(
+        _ElementKind.NODE if isinstance(e, SerializedPathNodeState) else _ElementKind.SEGMENT for e in path.pathList)
+
+    writer.indices([indexOf(pathIndices, e) for e in path.selected])
+
+    writer.u32(len(path.constraints.sConstraints))
+    for constraint in path.constraints.sConstraints:
+        line = constraint.line
+        writer.floats([*line.p1, *line.p2, line.theta])
+        writer.indices([indexOf(pathIndices, node) for node in constraint.nodes])
+
+    # older saves can still link deleted nodes and segments, which are dropped
+    linker = path.linker
+    for links, keyIndices, valueIndices in [
+        (linker.nodeToCommand, pathIndices, commandIndices),
+        (linker.segmentToCommand, pathIndices, commandIndices),
+        (linker.commandToPath, commandIndices, pathIndices)
+    ]:
+        links = {key: value for key, value in links.items() if id(key) in keyIndices and id(value) in valueIndices}
+        writer.indices([keyIndices[id(key)] for key in links])
+        writer.indices([valueIndices[id(value)] for value in links.values()])
+
+    return writer.getPayload()
+
+def _encodeCommands(commands: list[SerializedRecursiveState], definitionIDs: list[str], adapters: dict[int, int]) -> bytes:
+
+    definitionIndices = {definitionID: i for i, definitionID in enumerate(definitionIDs)}
+
+    writer = _Writer()
+    writer.u32(len(commands))
+    for state in commands:
+        if isinstance(state, SerializedCommandState):
+            writer.u8(_CommandKind.COMMAND)
+            writer.u32(len(state.children))
+            writer.value(state.uiState.expanded)
+            writer.u32(adapters[id(state.adapter)])
+            writer.value(state.templateText)
+            writer.u32(len(state.paramHashmap))
+            for key, value in state.paramHashmap.items():
+                writer.value(key)
+                writer.value(value)
+            writer.u32(_NO_INDEX if state.definitionID is None else definitionIndices[state.definitionID])
+            writer.value(state.waitState)
+        elif isinstance(state, SerializedSectionState):
+            writer.u8(_CommandKind.SECTION)
+            writer.u32(len(state.children))
+            writer.string(state.sectionName)
+        elif isinstance(state, SerializedFullState):
+            writer.u8(_CommandKind.FULL)
+            writer.u32(len(state.children))
+        else:
+            raise ValueError(f"cannot store {type(state).__name__} in a .pgpath file")
+    return writer.getPayload()
+
+"""
+Reads a .pgpath file from a seekable binary stream. Only the section headers are read
+when opened. Each section is read and decoded the first time it is needed
+"""
+class PGPathReader:
+
+    def __init__(self, file: BinaryIO):
+
+        self.file = file
+
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError("not a binary .pgpath file")
+        self.version = _VERSION.unpack(file.read(_VERSION.size))[0]
+        if self.version > VERSION:
+            raise ValueError(f".pgpath file version {self.version} is newer than the supported version {VERSION}")
+
+        # section id -> (offset of payload, length, crc32)
+        self.sections: dict[int, tuple[int, int, int]] = {}
+        while True:
+            header = file.read(_SECTION.size)
+            if len(header) < _SECTION.size:
+                break
+            id, length, crc = _SECTION.unpack(header)
+            self.sections[id] = (file.tell(), length, crc)
+            file.seek(length, io.SEEK_CUR)
+
+        self._decoded: dict[SectionID, Any] = {}
+
+    def hasSection(self, id: SectionID) -> bool:
+        return id in self.sections
+
+    def _read(self, id: SectionID) -> _Reader:
+
+        if id not in self.sections:
+            raise ValueError(f".pgpath file has no {id.name} section")
+
+        offset, length, crc = self.sections[id]
+        self.file.seek(offset)
+        payload = self.file.read(length)
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            raise ValueError(f".pgpath file has a corrupted {id.name} section")
+        return _Reader(payload)
+
+    # decode the section once, and return the same result after
+    def _decode(self, id: SectionID, Fdecode):
+        if id not in self._decoded:
+            self._decoded[id] = Fdecode(self._read(id))
+        return self._decoded[id]
+
+    def readProjectData(self) -> ProjectDataModel:
+        data = ProjectDataModel()
+        data.projectName = Variable(self._read(SectionID.DATA).string())
+        return data
+
+    def readDefinitionIDs(self) -> list[str]:
+        return self._decode(SectionID.DEFINITIONS, lambda reader: [reader.string() for i in range(reader.u32())])
+
+    def _readAdapters(self) -> list[AdapterState]:
+        return self._decode(SectionID.ADAPTERS, _decodeAdapters)
+
+    # (path element IDs, command IDs), or None if the file has no IDs
+    def _readElementIDs(self) -> tuple[list[int | None], list[int | None]] | None:
+        if not self.hasSection(SectionID.ELEMENT_IDS):
+            return None
+        return self._decode(SectionID.ELEMENT_IDS, lambda reader: (reader.elementIDs(), reader.elementIDs()))
+
+    # every command state in preorder. The first is the SerializedFullState
+    def _readCommandList(self) -> list[SerializedRecursiveState]:
+        definitionIDs = self.readDefinitionIDs()
+        adapters = self._readAdapters()
+        elementIDs = self._readElementIDs()
+        return self._decode(SectionID.COMMANDS, lambda reader: _setElementIDs(
+            _decodeCommands(reader, definitionIDs, adapters), None if elementIDs is None else elementIDs[1]))
+
+    def readCommands(self) -> SerializedRecursiveState:
+        return self._readCommandList()[0]
+
+    def readPath(self) -> SerializedPathState:
+        commands = self._readCommandList()
+        adapters = self._readAdapters()
+        nodes = self._decode(SectionID.NODES, lambda reader: _decodeNodes(reader, adapters))
+        segments = self._decode(SectionID.SEGMENTS, lambda reader: _decodeSegments(reader, adapters))
+        elementIDs = self._readElementIDs()
+        path = self._decode(SectionID.PATH, lambda reader: _decodePath(reader, nodes, segments, commands))
+        if elementIDs is not None:
+            _setElementIDs(path.pathList, elementIDs[0])
+        return path
+
+    def readState(self) -> SerializedProjectState:
+        return SerializedProjectState(self.readProjectData(), self.readCommands(), self.readPath())
+
+def _setElementIDs(states: list, elementIDs: list[int | None] | None) -> list:
+    if elementIDs is not None and len(elementIDs) == len(states):
+        for state, elementID in zip(states, elementIDs):
+            state.elementID = elementID
+    return states
+
+def _decodeAdapters(reader: _Reader) -> list[AdapterState]:
+    kinds = [reader.adapterKind() for i in range(reader.u32())]
+    # the image states are never modified, so adapters of the same kind share them
+    return [ADAPTER_STATES[type](type, list(images)) for type, images in (kinds[i] for i in reader.indices())]
+
+def _decodeNodes(reader: _Reader, adapters: list[AdapterState]) -> list[SerializedPathNodeState]:
+    count = reader.u32()
+    positions = reader.numbers()
+    turnEnabled = reader.data[reader.offset : reader.offset + count]
+    reader.offset += count
+    adapterIndices = reader.indices()
+
+    nodes = []
+    for i in range(count):
+        position = (positions[2*i], positions[2*i+1])
+        turn = None if turnEnabled[i] == 2 else bool(turnEnabled[i])
+        nodes.append(SerializedPathNodeState(position, adapters[adapterIndices[i]], turn))
+    return nodes
+
+def _decodeSegments(reader: _Reader, adapters: list[AdapterState]) -> list[SerializedPathSegmentState]:
+    count = reader.u32()
+    perpDistances = reader.numbers()
+    controlOffsets = reader.numbers()
+
+    def controlOffset(i: int) -> tuple | None:
+        x, y = controlOffsets[2*i], controlOffsets[2*i+1]
+        return None if x is None else (x, y)
+
+    segments = []
+    for i in range(count):
+        direction = reader.enum()
+        current = reader.enum()
+        states = {}
+        for j in range(reader.u32()):
+            type = reader.enum()
+            adapter = adapters[reader.u32()]
+            if type == SegmentType.ARC:
+                states[type] = SerializedArcState(adapter, perpDistances[i])
+            elif type == SegmentType.BEZIER:
+                states[type] = SerializedBezierState(adapter, controlOffset(2*i), controlOffset(2*i+1))
+            else:
+                states[type] = SerializedStraightState(adapter)
+        segments.append(SerializedPathSegmentState(direction, states, current))
+    return segments
+
+def _decodePath(reader: _Reader, nodes: list[SerializedPathNodeState], segments: list[SerializedPathSegmentState],
+                commands: list[SerializedRecursiveState]) -> SerializedPathState:
+
+    count = reader.u32()
+    nodeIter, segmentIter = iter(nodes), iter(segments)
+    pathList: list[SerializedPathElementState] = []
+    for kind in reader.data[reader.offset : reader.offset + count]:
+        pathList.append(next(nodeIter) if kind == _ElementKind.NODE else next(segmentIter))
+    reader.offset += count
+
+    selected = [pathList[i] for i in reader.indices()]
+
+    constraints = []
+    for i in range(reader.u32()):
+        x1, y1, x2, y2, theta = reader.floats()
+        line = Line((x1, y1), theta = theta)
+        line.p2 = (x2, y2)
+        constraints.append(SerializedConstraintState(line, [pathList[j] for j in reader.indices()]))
+
+    links = []
+    for keys, values in [(pathList, commands), (pathList, commands), (commands, pathList)]:
+        links.append({keys[k]: values[v] for k, v in zip(reader.indices(), reader.indices())})
+
+    return SerializedPathState(pathList, SerializedLinkerState(*links), SerializedConstraintsState(constraints), selected)
+
+def _decodeCommands(reader: _Reader, definitionIDs: list[str], adapters: list[AdapterState]) -> list[SerializedRecursiveState]:
+
+    commands: list[SerializedRecursiveState] = []
+    parents: list[list] = [] # [state, number of children still to read] for each open ancestor
+
+    for i in range(reader.u32()):
+        kind = reader.u8()
+        numChildren = reader.u32()
+        if kind == _CommandKind.COMMAND:
+            uiState = CommandUIState(expanded = reader.value())
+            adapter = adapters[reader.u32()]
+            templateText = reader.value()
+            params = {}
+            for j in range(reader.u32()):
+                key = reader.value()
+                params[key] = reader.value()
+            definitionIndex = reader.u32()
+            definitionID = None if definitionIndex == _NO_INDEX else definitionIDs[definitionIndex]
+            state = SerializedCommandState(uiState, adapter, templateText, params, definitionID, reader.value())
+        elif kind == _CommandKind.SECTION:
+            state = SerializedSectionState(reader.string())
+        elif kind == _CommandKind.FULL:
+            state = SerializedFullState()
+        else:
+            raise ValueError(f"unknown command kind {kind} in .pgpath file")
+
+        if len(parents) > 0:
+            parents[-1][0].addChild(state)
+            parents[-1][1] -= 1
+        commands.append(state)
+        parents.append([state, numChildren])
+        while len(parents) > 0 and parents[-1][1] == 0:
+            parents.pop()
+
+    return commands
+
+def writeProject(file: BinaryIO, state: SerializedProjectState):
+    PGPathWriter(file).writeProject(state)
+
+def dumpsProject(state: SerializedProjectState) -> bytes:
+    file = io.BytesIO()
+    writeProject(file, state)
+    return file.getvalue()
+
+# whether the file is an old .pgpath file that is a pickled SerializedProjectState
+def isPickled(file: BinaryIO) -> bool:
+    start = file.tell()
+    isPickle = file.read(1) == b"\x80"
+    file.seek(start)
+    return isPickle
+
+# classes that migrate() may unpickle: the states and values of the schema, and the builtins
+# that pickle uses to rebuild them. Anything else in an old file is refused
+_PICKLE_CLASSES: dict[tuple[str, str], type] = {(cls.__module__, cls.__qualname__): cls for cls in [
+    SerializedProjectState, ProjectDataModel, Variable,
+    SerializedPathState, SerializedPathElementState, SerializedPathNodeState, SerializedPathSegmentState,
+    SerializedStraightState, SerializedArcState, SerializedBezierState,
+    SerializedConstraintsState, SerializedConstraintState, SerializedLinkerState, Line,
+    SerializedRecursiveState, SerializedFullState, SerializedSectionState, SerializedCommandState,
+    CommandUIState, SerializedImageState, AdapterState, *ADAPTER_STATES.values(), *ENUM_TYPES
+]}
+_PICKLE_CLASSES.update({("builtins", cls.__name__): cls for cls in [object, set, frozenset, complex]})
+_PICKLE_CLASSES[("copyreg", "_reconstructor")] = copyreg._reconstructor
+
+class _SchemaUnpickler(pickle.Unpickler):
+
+    def find_class(self, module: str, name: str):
+        if (module, name) not in _PICKLE_CLASSES:
+            raise pickle.UnpicklingError(f"{module}.{name} is not part of the .pgpath schema")
+        return _PICKLE_CLASSES[(module, name)]
+
+# load a binary .pgpath file. Old pickled files must be converted with migrate() first
+def loadProject(path: str) -> SerializedProjectState:
+    with open(path, "rb") as f:
+        if isPickled(f):
+            raise ValueError(f"{path} is an old pickled .pgpath file. Convert it with: python -m serialization.pgpath_format {path}")
+        return PGPathReader(f).readState()
+
+# convert an old pickled .pgpath file to the binary format in place.
+# Returns False if it already was in the binary format
+def migrate(path: str) -> bool:
+
+    with open(path, "rb") as f:
+        if not isPickled(f):
+            return False
+        state = _SchemaUnpickler(f).load()
+    if not isinstance(state, SerializedProjectState):
+        raise ValueError(f"{path} does not contain a pickled project")
+
+    file, tempPath = tempfile.mkstemp(dir = os.path.dirname(path) or ".", prefix = ".pgpath-", suffix = ".tmp")
+    try:
+        with os.fdopen(file, "wb") as f:
+            writeProject(f, state)
+        os.replace(tempPath, path)
+    finally:
+        if os.path.exists(tempPath):
+            os.remove(tempPath)
+    return True
+
+if __name__ == "__main__":
+    for path in sys.argv[1:]:
+        print(path, "migrated" if migrate(path) else "already binary")
@@ -1,5 +1,6 @@
 # all classes that implement this must store only serializable data
 from typing import Generic, TypeVar
+import random
 
 from utility.pretty_printer import PrettyPrinter
 
@@ -15,4 +16,10 @@ class Serializable(Generic[T]):
 
     @staticmethod
     def deserialize(state: SerializedState | T) -> 'Serializable':
-        raise NotImplementedError("Must implement this method")
\ No newline at end of file
+        raise NotImplementedError("Must implement this method")
+
+# Element IDs identify a path element or command across its serialized states, so loading
+# a state can tell which existing models it still describes. Never 0, which files use for no ID
+_elementIDRandom = random.Random()
+def newElementID() -> int:
+    return _elementIDRandom.getrandbits(63) or 1
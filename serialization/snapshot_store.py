@@ -0,0 +1,143 @@
+from typing import Callable
+import hashlib, io, pickle
+
+"""
+Stores snapshots of serialized states as bytes, with structural sharing between snapshots.
+Every object in a snapshot for which isShared(object) is true is pickled on its own,
+and stored once by the hash of its contents. A snapshot then only adds the shared objects
+that changed since earlier snapshots, plus a small root that references them.
+
+Loading a snapshot always creates new objects, so stored snapshots are never modified by
+whatever the caller does with the loaded state. Objects referenced from several places
+within one snapshot are still the same object after loading.
+"""
+
+# (content hash, ordinal). The ordinal tells apart distinct objects with the same contents
+ChunkID = tuple[bytes, int]
+
+class Snapshot:
+
+    def __init__(self, root: bytes, chunks: set[bytes]):
+        self.root = root # the pickled state, with shared objects replaced by ChunkIDs
+        self.chunks = chunks # hashes of every chunk the snapshot references
+
+class _Pickler(pickle.Pickler):
+
+    def __init__(self, file, FpersistentID: Callable[[object], ChunkID | None]):
+        super().__init__(file, protocol = pickle.HIGHEST_PROTOCOL)
+        self.FpersistentID = FpersistentID
+
+    def persistent_id(self, obj):
+        return self.FpersistentID(obj)
+
+class _Unpickler(pickle.Unpickler):
+
+    def __init__(self, file, FpersistentLoad: Callable[[ChunkID], object]):
+        super().__init__(file)
+        self.FpersistentLoad = FpersistentLoad
+
+    def persistent_load(self, chunkID: ChunkID):
+        return self.FpersistentLoad(chunkID)
+
+class SnapshotStore:
+
+    def __init__(self, isShared: Callable[[object], bool]):
+
+        self.isShared = isShared
+
+        self._chunks: dict[bytes, bytes] = {} # content hash -> pickled object
+        self._refcounts: dict[bytes, int] = {} # content hash -> number of snapshots using it
+
+        # total size of all stored chunks and snapshot roots
+        self.nbytes = 0
+
+    # store the state, returning a Snapshot that can be passed to get() and release()
+    def put(self, state: object) -> Snapshot:
+
+        chunkIDs: dict[int, ChunkID] = {} # id(object) -> ChunkID, for objects in this snapshot
+        ordinals: dict[bytes, int] = {}
+        chunks: set[bytes] = set()
+
+        def dumps(obj: object) -> bytes:
+            file = io.BytesIO()
+            _Pickler(file, lambda child: None if child is obj else getChunkID(child)).dump(obj)
+            return file.getvalue()
+
+        # pickle shared objects bottom-up, so that a chunk only changes if its own contents
+        # or the identity of the chunks it references changed
+        def getChunkID(obj: object) -> ChunkID | None:
+
+            if not self.isShared(obj):
+                return None
+            if id(obj) in chunkIDs:
+                return chunkIDs[id(obj)]
+
+            data = dumps(obj)
+            digest = hashlib.blake2b(data, digest_size = 16).digest()
+
+            ordinal = ordinals.get(digest, 0)
+            ordinals[digest] = ordinal + 1
+            chunkIDs[id(obj)] = (digest, ordinal)
+
+            if digest not in self._chunks:
+                self._chunks[digest] = data
+                self._refcounts[digest] = 0
+                self.nbytes += len(data)
+            chunks.add(digest)
+
+            return chunkIDs[id(obj)]
+
+        file = io.BytesIO()
+        _Pickler(file, getChunkID).dump(state)
+        snapshot = Snapshot(file.getvalue(), chunks)
+
+        for digest in chunks:
+            self._refcounts[digest] += 1
+        self.nbytes += len(snapshot.root)
+
+        return snapshot
+
+    # pickled data of a chunk referenced by a stored snapshot
+    def getChunk(self, digest: bytes) -> bytes:
+        return self._chunks[digest]
+
+    # store a snapshot from its root and the data of its chunks, ie. one written to disk earlier.
+    # chunks must contain every digest in digests, and may contain others
+    def restore(self, root: bytes, digests: set[bytes], chunks: dict[bytes, bytes]) -> Snapshot:
+
+        for digest in digests:
+            if digest not in self._chunks:
+                self._chunks[digest] = chunks[digest]
+                self._refcounts[digest] = 0
+                self.nbytes += len(chunks[digest])
+            self._refcounts[digest] += 1
+        self.nbytes += len(root)
+
+        return Snapshot(root, set(digests))
+
+    # return a new copy of the state stored in the snapshot
+    def get(self, snapshot: Snapshot) -> object:
+
+        loaded: dict[ChunkID, object] = {}
+
+        def loads(data: bytes) -> object:
+            return _Unpickler(io.BytesIO(data), getChunk).load()
+
+        def getChunk(chunkID: ChunkID) -> object:
+            if chunkID not in loaded:
+                loaded[chunkID] = loads(self._chunks[chunkID[0]])
+            return loaded[chunkID]
+
+        return loads(snapshot.root)
+
+    # free the snapshot, and any chunks no other snapshot references
+    def release(self, snapshot: Snapshot):
+
+        for digest in snapshot.chunks:
+            self._refcounts[digest] -= 1
+            if self._refcounts[digest] == 0:
+                self.nbytes -= len(self._chunks[digest])
+                del self._chunks[digest]
+                del self._refcounts[digest]
+
+        self.nbytes -= len(snapshot.root)
@@ -0,0 +1,101 @@
+from dataclasses import dataclass
+import atexit, os, tempfile, threading, time
+
+"""
+Writes saves to disk on a background thread, so that the UI never waits on disk I/O.
+Only the most recent save is kept pending. Saves requested while another one is waiting,
+or within debounceSeconds of each other, are coalesced into a single write.
+Each write goes to a temporary file that then replaces the save file, so the save file
+is never left half-written. Any pending save is written before the program exits.
+"""
+
+@dataclass
+class AutosaveStats:
+    requested: int = 0 # number of calls to save()
+    written: int = 0 # number of writes to disk
+    coalesced: int = 0 # saves replaced by a newer one before being written
+    failed: int = 0
+    bytesWritten: int = 0 # total over all writes
+    lastBytes: int = 0
+    lastLatency: float = 0 # seconds taken by the last write
+
+class AutosaveService:
+
+    def __init__(self, path: str, debounceSeconds: float = 0.25):
+
+        self.path = path
+        self.debounceSeconds = debounceSeconds
+
+        self.stats = AutosaveStats()
+
+        self._pending: bytes = None
+        self._stopping = False
+        self._condition = threading.Condition()
+
+        self._thread = threading.Thread(target = self._run, name = "autosave", daemon = True)
+        self._thread.start()
+
+        atexit.register(self.stop)
+
+    # queue the data to be written to the save file. Returns immediately
+    def save(self, data: bytes):
+        with self._condition:
+            if self._pending is not None:
+                self.stats.coalesced += 1
+            self._pending = data
+            self.stats.requested += 1
+            self._condition.notify()
+
+    # write any pending save and stop the worker thread
+    def stop(self):
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+
+            with self._condition:
+                while self._pending is None and not self._stopping:
+                    self._condition.wait()
+                if self._pending is None:
+                    return
+
+            # wait for more saves to arrive, unless exiting
+            if not self._stopping:
+                time.sleep(self.debounceSeconds)
+
+            with self._condition:
+                data = self._pending
+                self._pending = None
+
+            self._write(data)
+
+    def _write(self, data: bytes):
+
+        start = time.perf_counter()
+        directory = os.path.dirname(self.path) or "."
+
+        file, tempPath = tempfile.mkstemp(dir = directory, prefix = ".autosave-", suffix = ".tmp")
+        try:
+            with os.fdopen(file, "wb") as f:
+
+                # mkstemp() makes the file private, so keep the permissions a normal save would have
+                os.fchmod(f.fileno(), os.stat(self.path).st_mode if os.path.exists(self.path) else 0o644)
+
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tempPath, self.path)
+        except OSError as e:
+            self.stats.failed += 1
+            print("autosave failed:", e)
+            if os.path.exists(tempPath):
+                os.remove(tempPath)
+            return
+
+        self.stats.written += 1
+        self.stats.lastBytes = len(data)
+        self.stats.bytesWritten += len(data)
+        self.stats.lastLatency = time.perf_counter() - start
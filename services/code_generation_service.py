@@ -1,21 +1,99 @@
 from __future__ import annotations
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
+from adapter.path_adapter import PathAttributeID
 from utility.misc_functions import getEnumFromName
 if TYPE_CHECKING:
-    from adapter.path_adapter import PathAdapter, PathAttributeID
+    from adapter.path_adapter import PathAdapter
+    from command_creation.command_definition import CommandDefinition
     from entities.root_container.panel_container.command_block.parameter_state import ParameterState
 
 
+# a $VARIABLE$ in a template, with the adapter attribute and parameter it refers to resolved ahead of time
+@dataclass
+class TemplateSlot:
+    name: str
+    attribute: PathAttributeID | None # None if not the name of a PathAttributeID
+    elementID: str | None # id of the parameter with this name in the definition, if any
+
+"""
+A code template parsed once into literal text and $VARIABLE$ slots, so that rendering
+is a single pass that joins strings. Compiled templates are cached by CommandDefinition
+and CommandModel, and recompiled when their template text or definition changes.
+
+The template is split at every '$'. A slot is the text between two consecutive '$'.
+When a slot has no value, its opening '$' is kept as text and its closing '$' is tried
+as the opening '$' of the next slot, same as the original left-to-right scan.
+Substituted values are never scanned for '$' themselves.
+"""
+
+class CompiledTemplate:
+
+    def __init__(self, templateText: str, definition: CommandDefinition = None):
+
+        self.templateText = templateText
+        self.definition = definition
+
+        # literals[i] is the text after the i-th '$'. literals[0] is the text before any '$'
+        self.literals: list[str] = templateText.split('$')
+
+        # slots[i] is the candidate variable between the i-th and (i+1)-th '$'
+        # slots with the same name are shared, so each name is only looked up once
+        self.slots: list[TemplateSlot] = []
+        slotsByName: dict[str, TemplateSlot] = {}
+        for name in self.literals[1:-1]:
+            if name not in slotsByName:
+                element = None if definition is None else definition.getElementDefinitionByName(name)
+                slotsByName[name] = TemplateSlot(
+                    name,
+                    getEnumFromName(PathAttributeID, name),
+                    None if element is None else element.id
+                )
+            self.slots.append(slotsByName[name])
+
+    # whether this was compiled from the given text and definition, and can be reused for them
+    def matches(self, templateText: str, definition: CommandDefinition) -> bool:
+        return self.templateText == templateText and self.definition is definition
+
+    # FgetValue returns the string to substitute for a slot, or None to leave it as is
+    def render(self, FgetValue) -> str:
+
+        literals = self.literals
+        slots = self.slots
+        numDollars = len(literals) - 1
+
+        code = [literals[0]]
+        i = 0 # index of the '$' that may open a slot
+        while i < numDollars:
+
+            if i < len(slots):
+                value = FgetValue(slots[i])
+                if value is not None:
+                    code.append(value)
+                    code.append(literals[i + 2])
+                    i += 2
+                    continue
+
+            code.append('$')
+            code.append(literals[i + 1])
+            i += 1
+
+        return "".join(code)
+
+
 class CodeGenerationService:
 
     def __init__(self,
-                codeTemplate: str,
+                codeTemplate: str | CompiledTemplate,
                 adapter: PathAdapter,
                 parameters: ParameterState,
                 testingOnly: bool = False
     ):
-        
+
+        if isinstance(codeTemplate, str):
+            codeTemplate = CompiledTemplate(codeTemplate)
+
         self.codeTemplate = codeTemplate
         self.adapter = adapter
         self.parameters = parameters
@@ -24,7 +102,7 @@ class CodeGenerationService:
     # given a variableName, presumbly found under $variableName$,
     # search for a match in both adapter and parameters
     def getVariableValue(self, variableName: str) -> str | None:
-        
+
         matchingEnum = getEnumFromName(PathAttributeID, variableName)
         if matchingEnum is not None:
             # check if it's in adapter
@@ -36,10 +114,32 @@ class CodeGenerationService:
         value = self.parameters.getValueByName(variableName)
         if value is not None:
             return str(value)
-        
+
         # if not found, return None
         return None
-    
+
+    # same as getVariableValue(), but with the attribute and parameter already looked up
+    def getSlotValue(self, slot: TemplateSlot) -> str | None:
+
+        if slot.attribute is not None:
+            # check if it's in adapter
+            value = self.adapter.getValue(slot.attribute)
+            if value is not None:
+                return str(value)
+
+        # check if it's in parameters
+        if slot.elementID is not None:
+            value = self.parameters.getValueByID(slot.elementID)
+        elif self.codeTemplate.definition is None:
+            value = self.parameters.getValueByName(slot.name)
+        else:
+            value = None # the definition has no parameter with this name
+        if value is not None:
+            return str(value)
+
+        # if not found, return None
+        return None
+
     def getVariableValueDummy(self, variableName: str) -> str | None:
         if variableName == "ONE":
             return "1"
@@ -50,33 +150,10 @@ class CodeGenerationService:
         else:
             return None
 
-    # find all instances of $VARIABLE$ and attempt to replace with values
+    # replace all instances of $VARIABLE$ with their values, where there is one
     def generateCode(self) -> str:
 
-        code = self.codeTemplate
-        # find all instances of $VARIABLE$
-        start = 0
-        while True:
-            start = code.find('$', start)
-            if start == -1:
-                break
-            end = code.find('$', start + 1)
-            if end == -1:
-                break
-            
-            variableName = code[start + 1:end]
-
-            if self.testingOnly:
-                variableValue = self.getVariableValueDummy(variableName)
-            else:
-                variableValue = self.getVariableValue(variableName)
-            
-            if variableValue is not None:
-                code = code[:start] + variableValue + code[end + 1:]
-            else:
-                # if variableValue is None, we try the next substring starting with $,
-                # which was the previous end $
-                start = end
-
-        return code
-    
\ No newline at end of file
+        if self.testingOnly:
+            return self.codeTemplate.render(lambda slot: self.getVariableValueDummy(slot.name))
+        else:
+            return self.codeTemplate.render(self.getSlotValue)
@@ -0,0 +1,46 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+import typing
+
+from models.command_models.full_model import FullCommandsModel
+from models.path_models.path_model import PathModel
+from serialization.pgpath_format import loadProject
+from services.program_code_generation_service import ProgramCodeGenerationService
+if TYPE_CHECKING:
+    from models.project_model import SerializedProjectState
+
+"""
+Loads .pgpath files and generates code for them without a window. The path and commands
+are rebuilt from the save the same way ProjectModel._rebuildSerializedState() does, except
+that no entities are created, so no display is needed.
+"""
+
+class HeadlessProject:
+
+    def __init__(self, state: SerializedProjectState):
+
+        # convert all adapters back to deserialized states
+        state.commands.makeNullAdapterDeserialized()
+        for element in state.path.pathList:
+            element.makeAdapterDeserialized()
+
+        self.projectData = state.data
+
+        # the commands are never rebuilt, so they have no UI
+        self.commandsModel = typing.cast(FullCommandsModel, FullCommandsModel.deserialize(state.commands))
+
+        # without a field entity, path elements do not generate UI
+        self.pathModel = PathModel.deserialize(state.path, None)
+        self.pathModel.initCommandsModel(self.commandsModel)
+
+        # recalculate path cached data, which fills in the adapter values used by the code templates
+        self.pathModel.recalculateAll()
+
+    @staticmethod
+    def load(path: str) -> HeadlessProject:
+        return HeadlessProject(loadProject(path))
+
+    # generated code for every visible command, in command order.
+    # Commands inside tasks are indented under the task
+    def generateCode(self, indent: str = "    ") -> str:
+        return ProgramCodeGenerationService(self.commandsModel, indent).generate()
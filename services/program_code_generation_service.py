@@ -0,0 +1,88 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+import bisect
+
+from models.command_models.command_model import CommandModel
+if TYPE_CHECKING:
+    from models.command_models.abstract_model import AbstractModel
+    from models.command_models.full_model import FullCommandsModel
+
+"""
+Generates the code for the whole program, from every visible command in order.
+Each CommandModel keeps its generated code until its adapter values, parameters or template
+change, so regenerating after a small edit like dragging a node only renders the commands
+that were affected. The lines of every command are cached here too, and lineRanges maps each
+command to the lines it generated, ie. for highlighting a command in a code preview.
+The app does not show the whole program yet, so this is only used by the headless tool.
+"""
+
+class ProgramCodeGenerationService:
+
+    def __init__(self, commandsModel: FullCommandsModel, indent: str = "    "):
+
+        self.commandsModel = commandsModel
+        self.indent = indent # commands inside tasks are indented by this per level
+
+        # command -> (generated code, depth, indented lines) from the last generate()
+        self._lines: dict[CommandModel, tuple[str, int, list[str]]] = {}
+
+        # command -> range of line numbers of its code in the last generated program
+        self.lineRanges: dict[CommandModel, range] = {}
+
+        # first line of each command that generated any lines, and the command, in program order
+        self._lineStarts: list[int] = []
+        self._lineCommands: list[CommandModel] = []
+
+        self.numRendered = 0 # number of commands with new code in the last generate()
+
+    def generate(self) -> str:
+
+        previousLines = self._lines
+        self._lines = {}
+        self.lineRanges = {}
+        self._lineStarts = []
+        self._lineCommands = []
+        self.numRendered = 0
+
+        program: list[str] = []
+
+        def generateChildren(model: AbstractModel, depth: int):
+            for child in model.children:
+
+                if not child.show:
+                    continue
+
+                if not isinstance(child, CommandModel):
+                    generateChildren(child, depth)
+                    continue
+
+                code = child.getGeneratedCode()
+
+                # the command returns the same string object until it renders again.
+                # Only split and indent again if the code or depth changed
+                cached = previousLines.get(child)
+                if cached is None or cached[0] is not code:
+                    self.numRendered += 1
+                if cached is None or cached[0] is not code or cached[1] != depth:
+                    cached = (code, depth, [self.indent * depth + line for line in code.splitlines()])
+                self._lines[child] = cached
+
+                start = len(program)
+                program.extend(cached[2])
+                self.lineRanges[child] = range(start, len(program))
+                if len(program) > start:
+                    self._lineStarts.append(start)
+                    self._lineCommands.append(child)
+
+                generateChildren(child, depth + 1)
+
+        generateChildren(self.commandsModel, 0)
+        return "\n".join(program) + "\n"
+
+    # the command that generated the given line of the last generated program, if any
+    def getCommandAtLine(self, line: int) -> CommandModel | None:
+        i = bisect.bisect_right(self._lineStarts, line) - 1
+        if i < 0:
+            return None
+        command = self._lineCommands[i]
+        return command if line in self.lineRanges[command] else None
@@ -1,6 +1,4 @@
 import numpy as np
-from scipy.integrate import quad
-from scipy.optimize import root_scalar, brentq
 from utility.math_functions import distanceTuples
 
 def cubic_bezier_point(t, p0, p1, p2, p3):
@@ -11,46 +9,34 @@ def cubic_bezier_derivative(t, p0, p1, p2, p3):
     t_inv = 1 - t
     return -3 * (t_inv ** 2) * p0 + 3 * (t_inv ** 2) * p1 - 6 * t_inv * t * p1 + 6 * t_inv * t * p2 - 3 * (t ** 2) * p2 + 3 * (t ** 2) * p3
 
-def arc_length_integrand(t, p0, p1, p2, p3):
-    derivative = cubic_bezier_derivative(t, p0, p1, p2, p3)
-    return np.linalg.norm(derivative)
+# evaluate the curve at every value in the array ts at once. Returns an (N,2) array
+def cubic_bezier_points(ts, p0, p1, p2, p3):
+    return cubic_bezier_point(np.asarray(ts, dtype = float)[:, np.newaxis], p0, p1, p2, p3)
 
-def arc_length(t, p0, p1, p2, p3):
-    return quad(arc_length_integrand, 0, t, args=(p0, p1, p2, p3))[0]
-
-def find_t_for_arc_length(target_arc_length, p0, p1, p2, p3):
-    def target_function(t):
-        return arc_length(t, p0, p1, p2, p3) - target_arc_length
-
-    try:
-        result = brentq(target_function, 0, 1)
-    except ValueError:
-        result = 1.0
-
-    return result
+# number of values of t the curve is sampled at to approximate arc length
+ARC_LENGTH_SAMPLES = 1000
 
+# Points spaced segment_length apart along the curve, followed by the end of the curve.
+# Arc length is approximated by sampling the curve densely, and inverted with interpolation
 def normalized_points_cubic_bezier(segment_length, p0, p1, p2, p3):
 
     end = p3
     p0, p1, p2, p3 = map(np.array, [p0, p1, p2, p3])
 
-    points = [p0]
-    t = 0
-
-    while True:
-        current_arc_length = arc_length(t, p0, p1, p2, p3)
-        target_arc_length = current_arc_length + segment_length
-        t = find_t_for_arc_length(target_arc_length, p0, p1, p2, p3)
+    # cumulative arc length at each sampled t
+    tSamples = np.linspace(0, 1, ARC_LENGTH_SAMPLES)
+    samples = cubic_bezier_points(tSamples, p0, p1, p2, p3)
+    arcLengths = np.concatenate(([0], np.cumsum(np.linalg.norm(np.diff(samples, axis = 0), axis = 1))))
 
-        if t >= 1:
-            points.append(end)
-            return points
-
-        point = cubic_bezier_point(t, p0, p1, p2, p3)
-        points.append(point.tolist())
+    # find t for each multiple of segment_length shorter than the curve. Always includes the start
+    targetArcLengths = np.arange(0, max(arcLengths[-1], segment_length), segment_length)
+    ts = np.interp(targetArcLengths, arcLengths, tSamples)
 
+    points = cubic_bezier_points(ts, p0, p1, p2, p3).tolist()
+    points.append(end)
+    return points
     
-# Evenly-spaced values of t. Segments may not be equidistant
+# Evenly-spaced values of t. Segments may not be equidistant. Returns an (N,2) array
 def fast_points_cubic_bezier(RESOLUTION, p0, p1, p2, p3):
 
     # use approximate distance to calculate how many points to calculate
@@ -60,14 +46,7 @@ def fast_points_cubic_bezier(RESOLUTION, p0, p1, p2, p3):
     N = int(approximateDistance * RESOLUTION) # number of points
 
     if N < 2:
-        return [p0, p3]
+        return np.array([p0, p3], dtype = float)
 
     p0, p1, p2, p3 = map(np.array, [p0, p1, p2, p3])
-
-    points = []
-    for i in range(N):
-        t = i / (N-1)
-        point = cubic_bezier_point(t, p0, p1, p2, p3)
-        points.append(point.tolist())
-
-    return points
\ No newline at end of file
+    return cubic_bezier_points(np.linspace(0, 1, N), p0, p1, p2, p3)
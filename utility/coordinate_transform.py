@@ -1,4 +1,5 @@
 from enum import Enum
+import numpy as np
 from typing import TypeVar, Generic
 
 """
@@ -96,4 +97,21 @@ class CoordinateTransform(Generic[T]):
             x = self.scale_x_B_to_A * oldPoint[0]
             y = self.scale_y_B_to_A * oldPoint[1]
             
-        return (x, y)
\ No newline at end of file
+        return (x, y)
+
+    # the scale and offset arrays such that newPoint = oldPoint * scale + offset
+    def getAffine(self, oldSystem: T) -> tuple[np.ndarray, np.ndarray]:
+        if oldSystem == self.systemAType:
+            return np.array([self.scale_x_A_to_B, self.scale_y_A_to_B]), np.array([self.offset_x_A_to_B, self.offset_y_A_to_B])
+        else:
+            return np.array([self.scale_x_B_to_A, self.scale_y_B_to_A]), np.array([self.offset_x_B_to_A, self.offset_y_B_to_A])
+
+    # convert an (N,2) array of points from the given system to the other system
+    def convertArrayFrom(self, oldSystem: T, oldPoints: np.ndarray) -> np.ndarray:
+        scale, offset = self.getAffine(oldSystem)
+        return np.asarray(oldPoints, dtype = float) * scale + offset
+
+    # convert an (N,2) array of vectors through scaling without offsets
+    def scaleArrayFrom(self, oldSystem: T, oldVectors: np.ndarray) -> np.ndarray:
+        scale, offset = self.getAffine(oldSystem)
+        return np.asarray(oldVectors, dtype = float) * scale
@@ -1,4 +1,5 @@
-import math
+import math, weakref
+import numpy as np
 
 """
 A motion profile class that generates a smooth motion trajectory between a start value and an end value.
@@ -7,57 +8,152 @@ it reaches a maximum speed, and then starts ramping down at the same acceleratio
 The speed is continuously adjusted to ensure that the maximum speed is not exceeded, and the distance remaining is
 calculated to ensure that the value does not overshoot the end value. The `tick()` method returns the current value
 after each update.
+
+The state of every MotionProfile is kept in a shared MotionProfileStore, and a MotionProfile is a
+handle to its slot there. EntityManager.tick() calls MotionProfileStore.step() once per tick, which
+computes the next value of every profile that is not done in one vectorized operation. The value
+only changes once the owner calls tick(), which then just applies it. So get() and isDone() return
+the same values as before until then, and owners that check isDone() before ticking still get their
+last tick. Profiles that the store did not step, like ones used outside the window, step themselves in tick().
 """
 
+class MotionProfileStore:
+
+    _INSTANCE = None
+
+    def getInstance() -> 'MotionProfileStore':
+        if MotionProfileStore._INSTANCE is None:
+            MotionProfileStore._INSTANCE = MotionProfileStore()
+        return MotionProfileStore._INSTANCE
+
+    def __init__(self, capacity: int = 64):
+
+        self.current = np.zeros(capacity)
+        self.end = np.zeros(capacity)
+        self.speed = np.zeros(capacity)
+        self.threshold = np.zeros(capacity)
+        self.previous = np.full(capacity, np.nan) # nan until first ticked, so wasChange() is True
+        self.next = np.zeros(capacity) # value after the next tick(), if stepped
+
+        # whether step() computed next since its profile last called tick()
+        self.stepped = np.zeros(capacity, dtype = bool)
+        self.inUse = np.zeros(capacity, dtype = bool)
+
+        self._freeSlots: list[int] = []
+        self._size = 0 # slots at and after this were never used
+
+    def _grow(self):
+        capacity = len(self.current) * 2
+        for name in ["current", "end", "speed", "threshold", "previous", "next", "stepped", "inUse"]:
+            array = getattr(self, name)
+            grown = np.full(capacity, np.nan) if name == "previous" else np.zeros(capacity, dtype = array.dtype)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+
+    def allocate(self, value: float, speed: float, threshold: float) -> int:
+
+        if len(self._freeSlots) > 0:
+            slot = self._freeSlots.pop()
+        else:
+            if self._size == len(self.current):
+                self._grow()
+            slot = self._size
+            self._size += 1
+
+        self.current[slot] = value
+        self.end[slot] = value
+        self.speed[slot] = speed
+        self.threshold[slot] = threshold
+        self.previous[slot] = np.nan
+        self.stepped[slot] = False
+        self.inUse[slot] = True
+        return slot
+
+    # called when the MotionProfile owning the slot is garbage collected
+    def release(self, slot: int):
+        self.inUse[slot] = False
+        self._freeSlots.append(slot)
+
+    # compute the value after the next tick() of every profile that is not done.
+    # Profiles not ticked since the last step() get the same value again
+    def step(self):
+
+        n = self._size
+        current = self.current[:n]
+        remaining = self.end[:n] - current
+
+        moving = self.inUse[:n] & (np.abs(remaining) >= self.threshold[:n])
+        self.stepped[:n] = moving
+        self.next[:n][moving] = current[moving] + remaining[moving] * self.speed[:n][moving]
+
+    # number of profiles that are not done
+    def countMoving(self) -> int:
+        n = self._size
+        remaining = np.abs(self.end[:n] - self.current[:n])
+        return int(np.count_nonzero(self.inUse[:n] & (remaining >= self.threshold[:n])))
+
+
 class MotionProfile:
-    def __init__(self, endValue, speed, threshold = 0.001):
-        self._speed = speed
-        self._currentValue = endValue
-        self._threshold = threshold
+    def __init__(self, endValue, speed, threshold = 0.001, store: MotionProfileStore = None):
 
-        self._previous = None
+        self._store = MotionProfileStore.getInstance() if store is None else store
+        self._slot = self._store.allocate(endValue, speed, threshold)
+        weakref.finalize(self, self._store.release, self._slot)
 
         self.setEndValue(endValue)
 
     def setEndValue(self, endValue):
+        # kept as given, so that get() returns the same type once done
         self._endValue = endValue
+        self._store.end[self._slot] = endValue
+        self._store.stepped[self._slot] = False # stepped towards the old end value
 
     def getEndValue(self) -> float:
         return self._endValue
 
     def forceToEndValue(self):
-        self._currentValue = self._endValue
-    
+        self._store.current[self._slot] = self._endValue
+        self._store.stepped[self._slot] = False
+
+    def _getDistanceRemaining(self) -> float:
+        return self._store.end[self._slot] - self._store.current[self._slot]
+
     def get(self) -> float:
-        distanceRemaining = self._endValue - self._currentValue
-        if abs(distanceRemaining) < self._threshold:
+        if abs(self._getDistanceRemaining()) < self._store.threshold[self._slot]:
             return self._endValue
         else:
-            return self._currentValue
+            return float(self._store.current[self._slot])
 
     def isDone(self) -> bool:
-        distanceRemaining = self._endValue - self._currentValue
-        if abs(distanceRemaining) < self._threshold:
-            self._currentValue = self._endValue
+        if abs(self._getDistanceRemaining()) < self._store.threshold[self._slot]:
+            self._store.current[self._slot] = self._endValue
             return True
         else:
             return False
 
     def tick(self) -> float:
 
-        self._previous = self._currentValue
+        store, slot = self._store, self._slot
+
+        store.previous[slot] = store.current[slot]
+
+        # already stepped by MotionProfileStore.step()
+        if store.stepped[slot]:
+            store.stepped[slot] = False
+            store.current[slot] = store.next[slot]
+            return float(store.current[slot])
 
         # Calculate the distance remaining
-        distanceRemaining = self._endValue - self._currentValue
+        distanceRemaining = self._getDistanceRemaining()
 
         # If we're already at the end value, return it
-        if abs(distanceRemaining) < self._threshold:
-            self._currentValue = self._endValue
-            return self._currentValue
-        
-        self._currentValue += (self._endValue - self._currentValue) * self._speed
-
-        return self._currentValue
-    
+        if abs(distanceRemaining) < store.threshold[slot]:
+            store.current[slot] = self._endValue
+            return self._endValue
+
+        store.current[slot] += distanceRemaining * store.speed[slot]
+
+        return float(store.current[slot])
+
     def wasChange(self) -> bool:
-        return self._previous != self._currentValue
\ No newline at end of file
+        return self._store.previous[self._slot] != self._store.current[self._slot]
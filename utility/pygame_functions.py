@@ -1,5 +1,6 @@
 import pygame, pygame.gfxdraw, math
 import utility.math_functions as math_functions
+from utility.text_surface_cache import TextSurfaceCache
 
 def shade(color: tuple, scalar: float):
     return math_functions.intTuple(math_functions.clampTuple(math_functions.scaleTuple(color, scalar), 0, 255))
@@ -48,9 +49,12 @@ def drawLine(screen: pygame.Surface, color: tuple, x1: int, y1: int, x2: int, y2
     if borderColor is not None:
         pygame.gfxdraw.aapolygon(screen, (UL, UR, BR, BL), borderColor)
     
+# the returned surface may be shared through TextSurfaceCache, so do not modify it
 def getText(font: pygame.font.Font, string: str, color: tuple, opacity: float = 1) -> pygame.Surface:
-    text = font.render(string, True, color)
-    text.set_alpha(opacity * 255)
+    text = TextSurfaceCache.getInstance().render(font, string, color)
+    if opacity != 1:
+        text = text.copy()
+        text.set_alpha(opacity * 255)
     return text
 
 # align = 0 -> align left/top
@@ -0,0 +1,87 @@
+from collections import OrderedDict
+import pygame
+
+"""
+Caches rendered text surfaces, so that text drawn every frame with the same font, string
+and color is only rendered once.
+
+Surfaces are keyed on the font, the string, the color and whether they are antialiased.
+FontManager makes a separate pygame Font for every font size, so the font also stands for
+the size. Once the cached surfaces take up more than MAX_BYTES of pixels, the least
+recently used ones are removed.
+
+Cached surfaces are shared between everything that draws the same text, so they must not
+be modified. Copy a surface before changing it, for example with set_alpha().
+"""
+
+class TextSurfaceCache:
+
+    _INSTANCE = None
+
+    MAX_BYTES = 16 * 1024 * 1024
+
+    def getInstance() -> 'TextSurfaceCache':
+        if TextSurfaceCache._INSTANCE is None:
+            TextSurfaceCache._INSTANCE = TextSurfaceCache()
+
+        return TextSurfaceCache._INSTANCE
+
+    def __init__(self, maxBytes: int = MAX_BYTES):
+
+        self.maxBytes = maxBytes
+
+        # most recently used last
+        self._surfaces: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font: pygame.font.Font, string: str, color: tuple, antialias: bool = True) -> pygame.Surface:
+
+        key = (font, string, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(string, antialias, color)
+
+        size = self._getBytes(surface)
+        if size > self.maxBytes: # would evict everything else
+            return surface
+
+        self._surfaces[key] = surface
+        self._bytes += size
+        while self._bytes > self.maxBytes:
+            key, evicted = self._surfaces.popitem(last = False)
+            self._bytes -= self._getBytes(evicted)
+            self.evictions += 1
+
+        return surface
+
+    def _getBytes(self, surface: pygame.Surface) -> int:
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def getByteCount(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    # fraction of render() calls that were cached, from 0 to 1
+    def getHitRate(self) -> float:
+        total = self.hits + self.misses
+        return 0 if total == 0 else self.hits / total
+
+    def resetStats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def clear(self):
+        self._surfaces.clear()
+        self._bytes = 0